@@ -0,0 +1,143 @@
+"""
+All-Play Standings
+Every team's record if it had played every other team every week: a team's weekly score
+is ranked against all other scores that week, so the record does not depend on the
+schedule. The gap between actual wins and the all-play expected wins is the luck metric.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from matchup_table import MatchupTable, WINNER_TIE
+from playoff_calculator import REGULAR_WEEK_TYPES
+
+
+def score_matrix(table: MatchupTable, year: int, max_week: Optional[int] = None):
+    """
+    Regular season scores for one season as a (weeks x teams) matrix, NaN where a team
+    did not play. Returns (matrix, weeks, team ids, rows used).
+    """
+    regular_codes = [code for code, wt in enumerate(table.week_types) if wt in REGULAR_WEEK_TYPES]
+    mask = ((table.year == year) & np.isin(table.week_type, regular_codes)
+            & (table.team1 >= 0) & (table.team2 >= 0))
+    if max_week is not None:
+        mask &= table.week <= max_week
+    rows = np.flatnonzero(mask)
+
+    weeks, week_index = np.unique(table.week[rows], return_inverse=True)
+    team_ids, team_index = np.unique(np.concatenate((table.team1[rows], table.team2[rows])), return_inverse=True)
+    matrix = np.full((len(weeks), len(team_ids)), np.nan)
+    matrix[week_index, team_index[:len(rows)]] = table.score1[rows]
+    matrix[week_index, team_index[len(rows):]] = table.score2[rows]
+    return matrix, weeks, team_ids, rows
+
+
+def all_play_records(matrix: np.ndarray):
+    """
+    All-play wins, losses and ties per cell of a (weeks x teams) score matrix, from one
+    argsort per week: a score beats every score sorted before its run of equal scores
+    and loses to every score after it. NaN cells (did not play) get zeros.
+    """
+    n_weeks, n_teams = matrix.shape
+    order = np.argsort(matrix, axis=1, kind='stable')  # NaN sorts last
+    ordered = np.take_along_axis(matrix, order, axis=1)
+    played = (~np.isnan(matrix)).sum(axis=1, keepdims=True)
+
+    positions = np.broadcast_to(np.arange(n_teams), (n_weeks, n_teams))
+    run_start = np.ones((n_weeks, n_teams), dtype=bool)
+    run_start[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    run_end = np.ones((n_weeks, n_teams), dtype=bool)
+    run_end[:, :-1] = run_start[:, 1:]
+    first = np.maximum.accumulate(np.where(run_start, positions, 0), axis=1)
+    last = np.minimum.accumulate(np.where(run_end, positions, n_teams)[:, ::-1], axis=1)[:, ::-1]
+
+    valid = positions < played
+    sorted_wins = np.where(valid, first, 0)
+    sorted_ties = np.where(valid, last - first, 0)
+    sorted_losses = np.where(valid, played - 1 - last, 0)
+
+    wins = np.empty_like(sorted_wins)
+    ties = np.empty_like(sorted_ties)
+    losses = np.empty_like(sorted_losses)
+    np.put_along_axis(wins, order, sorted_wins, axis=1)
+    np.put_along_axis(ties, order, sorted_ties, axis=1)
+    np.put_along_axis(losses, order, sorted_losses, axis=1)
+    return wins, losses, ties
+
+
+def _season_all_play(table: MatchupTable, year: int, max_week: Optional[int] = None) -> Dict[int, Dict]:
+    """{team id: totals} for one season"""
+    matrix, weeks, team_ids, rows = score_matrix(table, year, max_week)
+    if not len(rows):
+        return {}
+    wins, losses, ties = all_play_records(matrix)
+
+    # Expected wins: each week's all-play win share is the chance of beating a random opponent
+    opponents = np.maximum((~np.isnan(matrix)).sum(axis=1, keepdims=True) - 1, 1)
+    expected = ((wins + 0.5 * ties) / opponents).sum(axis=0)
+
+    team1, team2, winner = table.team1[rows], table.team2[rows], table.winner[rows]
+    n = len(table.teams)
+    actual = (np.bincount(winner[winner >= 0], minlength=n)
+              + 0.5 * (np.bincount(team1[winner == WINNER_TIE], minlength=n)
+                       + np.bincount(team2[winner == WINNER_TIE], minlength=n)))
+
+    return {int(team_id): {
+        'all_play_wins': int(wins[:, i].sum()),
+        'all_play_losses': int(losses[:, i].sum()),
+        'all_play_ties': int(ties[:, i].sum()),
+        'weeks': int((~np.isnan(matrix[:, i])).sum()),
+        'expected_wins': float(expected[i]),
+        'actual_wins': float(actual[team_id])
+    } for i, team_id in enumerate(team_ids.tolist())}
+
+
+def _finish(table: MatchupTable, totals: Dict[int, Dict]) -> List[Dict]:
+    results = []
+    for team_id, t in totals.items():
+        games = t['all_play_wins'] + t['all_play_losses'] + t['all_play_ties']
+        results.append({
+            'team': table.team_name(team_id),
+            'all_play_wins': t['all_play_wins'],
+            'all_play_losses': t['all_play_losses'],
+            'all_play_ties': t['all_play_ties'],
+            'all_play_pct': round((t['all_play_wins'] + 0.5 * t['all_play_ties']) / games * 100, 2) if games else 0,
+            'weeks': t['weeks'],
+            'actual_wins': t['actual_wins'],
+            'expected_wins': round(t['expected_wins'], 2),
+            'luck': round(t['actual_wins'] - t['expected_wins'], 2)
+        })
+    results.sort(key=lambda x: x['all_play_pct'], reverse=True)
+    return results
+
+
+def calculate_all_play(table: MatchupTable, weeks_played: Optional[Dict[int, int]] = None) -> Dict:
+    """
+    All-play standings per season and all-time.
+
+    Args:
+        table: All matchups
+        weeks_played: Optional {year: last regular season week to count}, e.g. to leave out
+            a week still in progress
+
+    Returns:
+        {'seasons': {year: [team rows]}, 'all_time': [team rows]}, where each row has the
+        all-play W/L/T and pct, actual and expected wins, and luck (actual - expected)
+    """
+    weeks_played = weeks_played or {}
+    seasons = {}
+    all_time: Dict[int, Dict] = {}
+    for year in np.unique(table.year).tolist():
+        season = _season_all_play(table, year, weeks_played.get(year))
+        if not season:
+            continue
+        seasons[year] = _finish(table, season)
+        for team_id, t in season.items():
+            total = all_time.setdefault(team_id, dict.fromkeys(t, 0))
+            for key, value in t.items():
+                total[key] += value
+
+    return {
+        'seasons': seasons,
+        'all_time': _finish(table, all_time)
+    }
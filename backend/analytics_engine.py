@@ -0,0 +1,827 @@
+"""
+Analytics Engine
+Computes the fun_stats outputs (rivalries, streaks, blowouts, bad beats, weekly awards,
+consistency, clutch, trophy case, points trends) plus per-team score moments and
+season tables in a single pass over the matchups.
+
+Each metric is an Accumulator: the engine normalizes every matchup once and feeds the
+resulting Game to every accumulator, then asks each one for its result. Results match
+the corresponding fun_stats functions exactly. New metrics plug in by subclassing
+Accumulator and passing an instance to the engine.
+"""
+import bisect
+import threading
+from collections import defaultdict, namedtuple
+from typing import Dict, Iterable, List, Optional
+
+from team_mapper import normalize_team_name as default_normalize_team_name
+
+# One matchup with team names (and winner) already normalized
+Game = namedtuple('Game', ['year', 'week', 'week_type', 'team1', 'team2', 'score1', 'score2', 'winner'])
+
+
+class TopK:
+    """
+    Keeps the k smallest items by sort key. Items with equal keys keep insertion order,
+    so the result equals sorted(all_items, key=...)[:k] with Python's stable sort.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._entries = []  # (key, seq, item), sorted
+        self._seq = 0
+
+    def add(self, key, item):
+        entry = (key, self._seq, item)
+        self._seq += 1
+        if len(self._entries) >= self.k and entry[:2] > self._entries[-1][:2]:
+            return
+        # seq is unique, so items themselves are never compared
+        bisect.insort(self._entries, entry)
+        if len(self._entries) > self.k:
+            self._entries.pop()
+
+    def items(self) -> List:
+        return [item for _, _, item in self._entries]
+
+
+class Accumulator:
+    """
+    Base class for a metric computed by AnalyticsEngine.
+
+    add() is called once per game in matchup order; result() builds the output from the
+    accumulated state (it must return fresh objects, since callers decorate them).
+    context carries optional inputs that are not matchups (e.g. standings).
+    """
+
+    name = ''
+
+    def add(self, game: Game):
+        raise NotImplementedError
+
+    def result(self, context: Dict):
+        raise NotImplementedError
+
+
+def _is_tie(winner: str) -> bool:
+    return winner.lower() == 'tie'
+
+
+class StreakState:
+    """
+    Running streak state for one team, fed (year, won, tie) in chronological order.
+    Tracks the same quantities the fun_stats streak loops compute:
+        longest()      all-time longest win/loss streak (a tie resets without counting)
+        longest_win()  longest win streak (a tie ends it)
+        season()       the run at the end of `season_year`'s games
+    """
+
+    __slots__ = ('season_year', 'current_streak', 'current_type', 'max_streak', 'max_type',
+                 'max_win_streak', 'season_streak', 'season_type')
+
+    def __init__(self, season_year: Optional[int] = None):
+        self.season_year = season_year
+        self.current_streak = 0
+        self.current_type = None
+        self.max_streak = 0
+        self.max_type = None
+        self.max_win_streak = 0
+        self.season_streak = 0
+        self.season_type = None
+
+    def push(self, year: int, won: bool, tie: bool):
+        in_season = year == self.season_year
+        if tie:
+            if self.current_type == 'win' and self.current_streak > self.max_win_streak:
+                self.max_win_streak = self.current_streak
+            self.current_streak = 0
+            self.current_type = None
+            if in_season:
+                self.season_streak = 0
+                self.season_type = None
+            return
+
+        result = 'win' if won else 'loss'
+        if in_season:
+            if self.season_type == result:
+                self.season_streak += 1
+            else:
+                self.season_type = result
+                self.season_streak = 1
+
+        if self.current_type is None:
+            self.current_type = result
+            self.current_streak = 1
+        elif self.current_type == result:
+            self.current_streak += 1
+        else:
+            if self.current_streak > self.max_streak:
+                self.max_streak = self.current_streak
+                self.max_type = self.current_type
+            if self.current_type == 'win' and self.current_streak > self.max_win_streak:
+                self.max_win_streak = self.current_streak
+            self.current_type = result
+            self.current_streak = 1
+
+    def longest(self):
+        if self.current_streak > self.max_streak:
+            return self.current_streak, self.current_type
+        return self.max_streak, self.max_type
+
+    def longest_win(self) -> int:
+        if self.current_type == 'win' and self.current_streak > self.max_win_streak:
+            return self.current_streak
+        return self.max_win_streak
+
+    def season(self):
+        return self.season_streak, self.season_type
+
+
+class _TeamResults:
+    """
+    One team's results keyed by (year, week), with its StreakState kept current while
+    games arrive in chronological order. A game that arrives out of order (or replaces
+    an existing week) marks the team dirty, and its state is rebuilt from the sorted
+    games the next time it is read.
+    """
+
+    __slots__ = ('games', 'last_key', 'dirty', 'state')
+
+    def __init__(self, season_year: Optional[int] = None):
+        self.games = {}  # {(year, week): (won, tie)}
+        self.last_key = None
+        self.dirty = False
+        self.state = StreakState(season_year)
+
+    def add(self, key: tuple, won: bool, tie: bool):
+        if self.last_key is not None and key <= self.last_key:
+            self.dirty = True
+        else:
+            self.state.push(key[0], won, tie)
+            self.last_key = key
+        self.games[key] = (won, tie)
+
+    def streaks(self) -> StreakState:
+        if self.dirty:
+            state = StreakState(self.state.season_year)
+            for key in sorted(self.games):
+                won, tie = self.games[key]
+                state.push(key[0], won, tie)
+            self.state = state
+            self.last_key = max(self.games)
+            self.dirty = False
+        return self.state
+
+
+# ----------------------------------------------------------------------
+# Accumulators
+# ----------------------------------------------------------------------
+
+class RivalriesAccumulator(Accumulator):
+    """fun_stats.calculate_rivalries"""
+
+    name = 'rivalries'
+
+    def __init__(self, min_games: int = 3, limit: int = 20):
+        self.min_games = min_games
+        self.limit = limit
+        self.pairs = {}
+
+    def add(self, game: Game):
+        t1, t2 = game.team1, game.team2
+        if not t1 or not t2 or t1 == t2:
+            return
+
+        key = (t1, t2) if t1 <= t2 else (t2, t1)
+        data = self.pairs.get(key)
+        if data is None:
+            data = self.pairs[key] = {
+                'team1': t1,
+                'team2': t2,
+                'games_played': 0,
+                'team1_wins': 0,
+                'team2_wins': 0,
+                'ties': 0,
+                'recent_games': []
+            }
+
+        data['games_played'] += 1
+        # Wins are credited by the side each team was listed on in that game
+        if game.winner == t1:
+            data['team1_wins'] += 1
+        elif game.winner == t2:
+            data['team2_wins'] += 1
+        else:
+            data['ties'] += 1
+
+        data['recent_games'].append({
+            'year': game.year,
+            'week': game.week,
+            'margin': abs(game.score1 - game.score2),
+            'winner': game.winner
+        })
+        if len(data['recent_games']) > 5:
+            data['recent_games'] = sorted(
+                data['recent_games'],
+                key=lambda x: (x['year'], x['week']),
+                reverse=True
+            )[:5]
+
+    def result(self, context: Dict) -> List[Dict]:
+        rivalries = []
+        for data in self.pairs.values():
+            if data['games_played'] < self.min_games:
+                continue
+
+            margins = [g['margin'] for g in data['recent_games']]
+            avg_margin = sum(margins) / len(margins) if margins else 0
+
+            win_diff = abs(data['team1_wins'] - data['team2_wins'])
+            closeness = 1.0 - (win_diff / data['games_played']) if data['games_played'] > 0 else 0
+            recency_bonus = min(len(data['recent_games']), 5) / 5.0
+            rivalry_score = data['games_played'] * closeness * (1 + recency_bonus * 0.5)
+
+            rivalries.append({
+                'team1': data['team1'],
+                'team2': data['team2'],
+                'games_played': data['games_played'],
+                'team1_wins': data['team1_wins'],
+                'team2_wins': data['team2_wins'],
+                'ties': data['ties'],
+                'win_differential': win_diff,
+                'avg_margin': round(avg_margin, 2),
+                'rivalry_score': round(rivalry_score, 2),
+                'recent_games': list(data['recent_games'])
+            })
+
+        rivalries.sort(key=lambda x: x['rivalry_score'], reverse=True)
+        return rivalries[:self.limit]
+
+
+class StreaksAccumulator(Accumulator):
+    """fun_stats.calculate_streaks. Current streaks are within current_year (None: no live season)."""
+
+    name = 'streaks'
+
+    def __init__(self, current_year: Optional[int], limit: int = 20):
+        self.current_year = current_year
+        self.limit = limit
+        self.teams = {}  # {team: _TeamResults}
+
+    def _team(self, team: str) -> _TeamResults:
+        results = self.teams.get(team)
+        if results is None:
+            results = self.teams[team] = _TeamResults(self.current_year)
+        return results
+
+    def add(self, game: Game):
+        t1, t2 = game.team1, game.team2
+        if not t1 or not t2:
+            return
+        key = (game.year, game.week)
+        tie = _is_tie(game.winner)
+        self._team(t1).add(key, game.winner == t1, tie)
+        self._team(t2).add(key, game.winner == t2, tie)
+
+    def result(self, context: Dict) -> Dict:
+        current_streaks = []
+        all_time_streaks = []
+
+        for team, results in self.teams.items():
+            state = results.streaks()
+
+            current_streak, current_type = state.season()
+            if current_streak > 0:
+                current_streaks.append({
+                    'team': team,
+                    'streak': current_streak,
+                    'type': current_type,
+                    'current': True
+                })
+
+            max_streak, max_type = state.longest()
+            if max_streak > 0:
+                all_time_streaks.append({
+                    'team': team,
+                    'streak': max_streak,
+                    'type': max_type,
+                    'current': False
+                })
+
+        current_streaks.sort(key=lambda x: x['streak'], reverse=True)
+        all_time_streaks.sort(key=lambda x: x['streak'], reverse=True)
+
+        return {
+            'current': current_streaks[:self.limit],
+            'all_time': all_time_streaks[:self.limit]
+        }
+
+
+class BlowoutsAccumulator(Accumulator):
+    """fun_stats.calculate_blowouts"""
+
+    name = 'blowouts'
+
+    def __init__(self, limit: int = 50):
+        self.top = TopK(limit)
+
+    def add(self, game: Game):
+        t1, t2 = game.team1, game.team2
+        if not t1 or not t2 or _is_tie(game.winner):
+            return
+
+        team1_won = game.winner == t1
+        margin = abs(game.score1 - game.score2)
+        self.top.add((-margin,), {
+            'year': game.year,
+            'week': game.week,
+            'week_type': game.week_type,
+            'winner': t1 if team1_won else t2,
+            'loser': t2 if team1_won else t1,
+            'winner_score': game.score1 if team1_won else game.score2,
+            'loser_score': game.score2 if team1_won else game.score1,
+            'margin': margin
+        })
+
+    def result(self, context: Dict) -> List[Dict]:
+        return [dict(b) for b in self.top.items()]
+
+
+class BadBeatsAccumulator(Accumulator):
+    """fun_stats.calculate_bad_beats"""
+
+    name = 'bad_beats'
+
+    def __init__(self, high_score: float = 130, low_score: float = 90, limit: int = 30):
+        self.high_score = high_score
+        self.low_score = low_score
+        self.high_score_losses = TopK(limit)
+        self.low_score_wins = TopK(limit)
+
+    def _beat(self, beat_type, game, team, opponent, team_score, opponent_score, margin):
+        return {
+            'type': beat_type,
+            'year': game.year,
+            'week': game.week,
+            'week_type': game.week_type,
+            'team': team,
+            'opponent': opponent,
+            'team_score': team_score,
+            'opponent_score': opponent_score,
+            'margin': margin
+        }
+
+    def add(self, game: Game):
+        t1, t2 = game.team1, game.team2
+        if not t1 or not t2 or _is_tie(game.winner):
+            return
+        s1, s2, winner = game.score1, game.score2, game.winner
+
+        # High score losses: highest team score first, then smallest losing margin
+        if s1 >= self.high_score and winner == t2:
+            self.high_score_losses.add((-s1, s2 - s1), self._beat('high_score_loss', game, t1, t2, s1, s2, s2 - s1))
+        if s2 >= self.high_score and winner == t1:
+            self.high_score_losses.add((-s2, s1 - s2), self._beat('high_score_loss', game, t2, t1, s2, s1, s1 - s2))
+
+        # Low score wins: lowest team score first
+        if s1 < self.low_score and winner == t1:
+            self.low_score_wins.add((s1,), self._beat('low_score_win', game, t1, t2, s1, s2, s1 - s2))
+        if s2 < self.low_score and winner == t2:
+            self.low_score_wins.add((s2,), self._beat('low_score_win', game, t2, t1, s2, s1, s2 - s1))
+
+    def result(self, context: Dict) -> Dict:
+        return {
+            'high_score_losses': [dict(b) for b in self.high_score_losses.items()],
+            'low_score_wins': [dict(b) for b in self.low_score_wins.items()]
+        }
+
+
+class WeeklyAwardsAccumulator(Accumulator):
+    """fun_stats.calculate_weekly_awards"""
+
+    name = 'weekly_awards'
+
+    def __init__(self, limit: int = 30):
+        self.limit = limit
+        self.weeks = {}  # {(year, week): week state}
+
+    def add(self, game: Game):
+        t1, t2 = game.team1, game.team2
+        if not t1 or not t2:
+            return
+        s1, s2, winner = game.score1, game.score2, game.winner
+
+        data = self.weeks.get((game.year, game.week))
+        if data is None:
+            data = self.weeks[(game.year, game.week)] = {
+                'games': [],
+                'highest_score': 0,
+                'lowest_winning_score': float('inf'),
+                'biggest_margin': 0
+            }
+
+        data['games'].append((t1, t2, s1, s2, winner))
+        data['highest_score'] = max(data['highest_score'], s1, s2)
+        if winner == t1:
+            data['lowest_winning_score'] = min(data['lowest_winning_score'], s1)
+        elif winner == t2:
+            data['lowest_winning_score'] = min(data['lowest_winning_score'], s2)
+        data['biggest_margin'] = max(data['biggest_margin'], abs(s1 - s2))
+
+    def result(self, context: Dict) -> Dict:
+        highest_scores = []
+        lowest_winning_scores = []
+        biggest_margins = []
+
+        for (year, week), data in self.weeks.items():
+            highest = data['highest_score']
+            for t1, t2, s1, s2, winner in data['games']:
+                if s1 == highest:
+                    highest_scores.append({
+                        'year': year, 'week': week,
+                        'team': t1, 'score': s1,
+                        'opponent': t2, 'opponent_score': s2
+                    })
+                elif s2 == highest:
+                    highest_scores.append({
+                        'year': year, 'week': week,
+                        'team': t2, 'score': s2,
+                        'opponent': t1, 'opponent_score': s1
+                    })
+
+            lowest = data['lowest_winning_score']
+            if lowest != float('inf'):
+                for t1, t2, s1, s2, winner in data['games']:
+                    if (winner == t1 and s1 == lowest) or (winner == t2 and s2 == lowest):
+                        lowest_winning_scores.append({
+                            'year': year, 'week': week,
+                            'team': winner, 'score': lowest,
+                            'opponent': t2 if winner == t1 else t1,
+                            'opponent_score': s2 if winner == t1 else s1
+                        })
+                        break
+
+            for t1, t2, s1, s2, winner in data['games']:
+                margin = abs(s1 - s2)
+                if margin == data['biggest_margin']:
+                    biggest_margins.append({
+                        'year': year, 'week': week,
+                        'winner': t1 if s1 > s2 else t2,
+                        'loser': t2 if s1 > s2 else t1,
+                        'winner_score': max(s1, s2),
+                        'loser_score': min(s1, s2),
+                        'margin': margin
+                    })
+                    break
+
+        highest_scores.sort(key=lambda x: x['score'], reverse=True)
+        lowest_winning_scores.sort(key=lambda x: x['score'])
+        biggest_margins.sort(key=lambda x: x['margin'], reverse=True)
+
+        return {
+            'highest_scores': highest_scores[:self.limit],
+            'lowest_winning_scores': lowest_winning_scores[:self.limit],
+            'biggest_margins': biggest_margins[:self.limit]
+        }
+
+
+class ConsistencyAccumulator(Accumulator):
+    """fun_stats.calculate_consistency"""
+
+    name = 'consistency'
+
+    def __init__(self, min_games: int = 5):
+        self.min_games = min_games
+        self.team_scores = {}  # {team: [score, ...]} in game order
+
+    def add(self, game: Game):
+        if game.team1:
+            self.team_scores.setdefault(game.team1, []).append(game.score1)
+        if game.team2:
+            self.team_scores.setdefault(game.team2, []).append(game.score2)
+
+    def result(self, context: Dict) -> List[Dict]:
+        consistency_scores = []
+        for team, scores in self.team_scores.items():
+            if len(scores) < self.min_games:
+                continue
+
+            # Two-pass mean/variance, identical to fun_stats
+            avg = sum(scores) / len(scores)
+            variance = sum((x - avg) ** 2 for x in scores) / len(scores)
+            std_dev = variance ** 0.5
+            coefficient_of_variation = (std_dev / avg * 100) if avg > 0 else 0
+
+            consistency_scores.append({
+                'team': team,
+                'avg_score': round(avg, 2),
+                'std_dev': round(std_dev, 2),
+                'coefficient_of_variation': round(coefficient_of_variation, 2),
+                'games_played': len(scores),
+                'min_score': min(scores),
+                'max_score': max(scores),
+                'range': max(scores) - min(scores)
+            })
+
+        consistency_scores.sort(key=lambda x: x['coefficient_of_variation'])
+        return consistency_scores
+
+
+class ClutchAccumulator(Accumulator):
+    """fun_stats.calculate_clutch_performance"""
+
+    name = 'clutch'
+
+    def __init__(self, close_margin: float = 10, min_close_games: int = 5):
+        self.close_margin = close_margin
+        self.min_close_games = min_close_games
+        self.all_games = defaultdict(lambda: {'wins': 0, 'losses': 0, 'ties': 0})
+        self.close_games = defaultdict(lambda: {'wins': 0, 'losses': 0, 'ties': 0, 'total': 0})
+
+    def add(self, game: Game):
+        t1, t2, winner = game.team1, game.team2, game.winner
+        if not t1 or not t2:
+            return
+
+        # Winner is recorded first, which fixes the team order of the result
+        if winner == t1:
+            self.all_games[t1]['wins'] += 1
+            self.all_games[t2]['losses'] += 1
+        elif winner == t2:
+            self.all_games[t2]['wins'] += 1
+            self.all_games[t1]['losses'] += 1
+        else:
+            self.all_games[t1]['ties'] += 1
+            self.all_games[t2]['ties'] += 1
+
+        if abs(game.score1 - game.score2) < self.close_margin:
+            self.close_games[t1]['total'] += 1
+            self.close_games[t2]['total'] += 1
+            if winner == t1:
+                self.close_games[t1]['wins'] += 1
+                self.close_games[t2]['losses'] += 1
+            elif winner == t2:
+                self.close_games[t2]['wins'] += 1
+                self.close_games[t1]['losses'] += 1
+            else:
+                self.close_games[t1]['ties'] += 1
+                self.close_games[t2]['ties'] += 1
+
+    def result(self, context: Dict) -> List[Dict]:
+        clutch_scores = []
+        for team, all_g in self.all_games.items():
+            close = self.close_games.get(team, {'wins': 0, 'losses': 0, 'ties': 0, 'total': 0})
+            if close['total'] < self.min_close_games:
+                continue
+
+            all_total = all_g['wins'] + all_g['losses'] + all_g['ties']
+            close_win_pct = ((close['wins'] + close['ties'] * 0.5) / close['total'] * 100) if close['total'] > 0 else 0
+            all_win_pct = ((all_g['wins'] + all_g['ties'] * 0.5) / all_total * 100) if all_total > 0 else 0
+            clutch_factor = close_win_pct - all_win_pct
+
+            clutch_scores.append({
+                'team': team,
+                'close_games': close['total'],
+                'close_wins': close['wins'],
+                'close_losses': close['losses'],
+                'close_ties': close['ties'],
+                'close_win_pct': round(close_win_pct, 1),
+                'all_win_pct': round(all_win_pct, 1),
+                'clutch_factor': round(clutch_factor, 1)
+            })
+
+        clutch_scores.sort(key=lambda x: x['clutch_factor'], reverse=True)
+        return clutch_scores
+
+
+class TrophyCaseAccumulator(Accumulator):
+    """
+    fun_stats.calculate_trophy_case. The standings-based trophies come from
+    context['standings'] (regular) and context['final_standings'], counting seasons up
+    to max_year (None: every season).
+    """
+
+    name = 'trophy_case'
+
+    def __init__(self, max_year: Optional[int]):
+        self.max_year = max_year
+        self.teams = {}  # {team: highest weekly score} in first-appearance order
+        self.team_results = {}  # {team: _TeamResults}
+
+    def add(self, game: Game):
+        for team, score in ((game.team1, game.score1), (game.team2, game.score2)):
+            best = self.teams.get(team)
+            if best is None:
+                best = self.teams[team] = {'score': 0, 'year': 0, 'week': 0}
+            if score > best['score']:
+                self.teams[team] = {'score': score, 'year': game.year, 'week': game.week}
+
+        key = (game.year, game.week)
+        tie = _is_tie(game.winner)
+        for team in (game.team1, game.team2):
+            if team:
+                results = self.team_results.get(team)
+                if results is None:
+                    results = self.team_results[team] = _TeamResults()
+                results.add(key, game.winner == team, tie)
+
+    def result(self, context: Dict) -> Dict:
+        final_standings = context.get('final_standings') or []
+        regular_standings = context.get('standings') or []
+        normalize = context.get('normalize_team_name', default_normalize_team_name)
+
+        trophies = defaultdict(lambda: {
+            'championships': [],
+            'playoff_appearances': [],
+            'spoons': [],
+            'highest_weekly_score': {'score': 0, 'year': 0, 'week': 0},
+            'perfect_seasons': [],
+            'longest_win_streak': 0,
+            'scoring_titles': []
+        })
+
+        for standing in final_standings:
+            if self.max_year is not None and standing.get('year', 0) > self.max_year:
+                continue
+            team = normalize(standing.get('team_name', ''))
+            year = standing.get('year', 0)
+            place = standing.get('place', 0)
+            if place == 1:
+                trophies[team]['championships'].append(year)
+            if place <= 4:
+                trophies[team]['playoff_appearances'].append(year)
+            if place == 12:
+                trophies[team]['spoons'].append(year)
+
+        for team, best in self.teams.items():
+            trophies[team]['highest_weekly_score'] = dict(best)
+
+        for team, results in self.team_results.items():
+            max_streak = results.streaks().longest_win()
+            if max_streak > trophies[team]['longest_win_streak']:
+                trophies[team]['longest_win_streak'] = max_streak
+
+        season_points = defaultdict(dict)
+        for standing in regular_standings:
+            if self.max_year is not None and standing.get('year', 0) > self.max_year:
+                continue
+            team = normalize(standing.get('team_name', ''))
+            year = standing.get('year', 0)
+            if standing.get('losses', 0) == 0 and standing.get('wins', 0) >= 10:
+                trophies[team]['perfect_seasons'].append(year)
+        for standing in regular_standings:
+            if self.max_year is not None and standing.get('year', 0) > self.max_year:
+                continue
+            season_points[standing.get('year', 0)][normalize(standing.get('team_name', ''))] = standing.get('points_for', 0)
+
+        for year, teams in season_points.items():
+            if teams:
+                max_points = max(teams.values())
+                for team, points in teams.items():
+                    if points == max_points:
+                        trophies[team]['scoring_titles'].append(year)
+
+        formatted_trophies = {}
+        for team, data in trophies.items():
+            formatted_trophies[team] = {
+                'championships': sorted(data['championships'], reverse=True),
+                'playoff_appearances': sorted(data['playoff_appearances'], reverse=True),
+                'spoons': sorted(data['spoons'], reverse=True),
+                'highest_weekly_score': data['highest_weekly_score'],
+                'perfect_seasons': sorted(data['perfect_seasons'], reverse=True),
+                'longest_win_streak': data['longest_win_streak'],
+                'scoring_titles': sorted(data['scoring_titles'], reverse=True)
+            }
+        return formatted_trophies
+
+
+class PointsTrendsAccumulator(Accumulator):
+    """fun_stats.calculate_points_trends, over seasons up to max_year (None: every season)"""
+
+    name = 'points_trends'
+
+    def __init__(self, max_year: Optional[int]):
+        self.max_year = max_year
+        self.team_yearly_scores = {}  # {team: {year: [score, ...]}}
+
+    def add(self, game: Game):
+        if self.max_year is not None and game.year > self.max_year:
+            return
+        if game.team1:
+            self.team_yearly_scores.setdefault(game.team1, {}).setdefault(game.year, []).append(game.score1)
+        if game.team2:
+            self.team_yearly_scores.setdefault(game.team2, {}).setdefault(game.year, []).append(game.score2)
+
+    def result(self, context: Dict) -> Dict:
+        trends = {}
+        for team, yearly_scores in self.team_yearly_scores.items():
+            yearly_avgs = []
+            for year in sorted(yearly_scores):
+                scores = yearly_scores[year]
+                if scores:
+                    yearly_avgs.append({
+                        'year': year,
+                        'avg_score': round(sum(scores) / len(scores), 2),
+                        'games': len(scores),
+                        'total_points': sum(scores)
+                    })
+
+            if len(yearly_avgs) >= 3:
+                recent_avg = sum([y['avg_score'] for y in yearly_avgs[-3:]]) / 3
+                older_avg = sum([y['avg_score'] for y in yearly_avgs[:3]]) / 3 if len(yearly_avgs) >= 6 else yearly_avgs[0]['avg_score']
+                trend_direction = 'improving' if recent_avg > older_avg else 'declining' if recent_avg < older_avg else 'stable'
+            else:
+                trend_direction = 'stable'
+
+            trends[team] = {
+                'yearly_averages': yearly_avgs,
+                'trend': trend_direction,
+                'current_avg': yearly_avgs[-1]['avg_score'] if yearly_avgs else 0,
+                'overall_avg': round(sum([y['avg_score'] for y in yearly_avgs]) / len(yearly_avgs), 2) if yearly_avgs else 0
+            }
+        return trends
+
+
+def default_accumulators(current_year: Optional[int]) -> List[Accumulator]:
+    """
+    The accumulators behind the fun_stats endpoints. current_year is the live season:
+    current streaks are within it, and trophies and trends stop before it (None when
+    there is no data, so no season is live).
+    """
+    last_completed = current_year - 1 if current_year is not None else None
+    return [
+        RivalriesAccumulator(),
+        StreaksAccumulator(current_year=current_year),
+        BlowoutsAccumulator(),
+        BadBeatsAccumulator(),
+        WeeklyAwardsAccumulator(),
+        ConsistencyAccumulator(),
+        ClutchAccumulator(),
+        TrophyCaseAccumulator(max_year=last_completed),
+        PointsTrendsAccumulator(max_year=last_completed),
+    ]
+
+
+class AnalyticsEngine:
+    """
+    Feeds every matchup (normalized once) to a set of accumulators in one pass.
+    More matchups (e.g. a newly ingested week) can be added at any time; accumulators
+    only process the new games, and results equal a fresh engine fed everything.
+
+    current_year is the live season (None when there is none). It is required, and only
+    the default accumulators use it.
+
+    Usage:
+        engine = AnalyticsEngine(current_year=live_season)
+        engine.add_matchups(matchups)
+        engine.result('blowouts')
+        engine.results(standings=regular, final_standings=final)
+    """
+
+    def __init__(self, accumulators: Optional[List[Accumulator]] = None,
+                 normalize_team_name=None, *, current_year: Optional[int]):
+        self.normalize_team_name = normalize_team_name or default_normalize_team_name
+        self.current_year = current_year
+        self.accumulators = {acc.name: acc for acc in (accumulators or default_accumulators(current_year))}
+        self.games_added = 0
+        self._names = {}  # raw name -> normalized name
+        self._lock = threading.RLock()
+
+    def _normalize(self, name: str) -> str:
+        normalized = self._names.get(name)
+        if normalized is None:
+            normalized = self._names[name] = self.normalize_team_name(name)
+        return normalized
+
+    def to_game(self, matchup: Dict) -> Game:
+        """Normalize a load_from_csv-style matchup dict into a Game"""
+        return Game(
+            matchup.get('year', 0),
+            matchup.get('week', 0),
+            matchup.get('week_type', 'regular'),
+            self._normalize(matchup.get('team1_name', '')),
+            self._normalize(matchup.get('team2_name', '')),
+            matchup.get('team1_score', 0),
+            matchup.get('team2_score', 0),
+            self._normalize(matchup.get('winner', ''))
+        )
+
+    def add_matchups(self, matchups: Iterable[Dict]):
+        """Scan matchups once, feeding each game to every accumulator"""
+        accumulators = list(self.accumulators.values())
+        with self._lock:
+            for matchup in matchups:
+                game = self.to_game(matchup)
+                for accumulator in accumulators:
+                    accumulator.add(game)
+                self.games_added += 1
+
+    def result(self, name: str, **context):
+        """Get one metric's result (fresh objects, safe to decorate)"""
+        context.setdefault('normalize_team_name', self.normalize_team_name)
+        with self._lock:
+            return self.accumulators[name].result(context)
+
+    def results(self, **context) -> Dict:
+        """Get every metric's result"""
+        return {name: self.result(name, **context) for name in self.accumulators}
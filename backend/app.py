@@ -3,7 +3,10 @@ Flask API server for NFL Fantasy Dashboard
 """
 from flask import Flask, jsonify, request
 from flask_cors import CORS
+import gzip
+import hashlib
 import json
+import math
 import os
 import sys
 from datetime import datetime
@@ -15,6 +18,10 @@ if backend_dir not in sys.path:
 
 from scraper import scrape_league_data
 from data_manager import DataManager
+from data_store import get_matchup_store, get_standings_store
+from response_cache import ResponseCache
+from season_partitions import SeasonStore
+from snapshot import SharedSnapshot
 
 # Get the project root directory (parent of backend/)
 if os.path.basename(os.getcwd()) == 'backend':
@@ -57,9 +64,32 @@ else:
 # Initialize data manager with project root path
 data_manager = DataManager(data_dir=os.path.join(project_root, 'data'))
 
+# Shared in-memory matchups (parsed once, reloaded when matchups.csv changes)
+matchup_store = get_matchup_store(os.path.join(data_manager.data_dir, 'matchups.csv'))
+# Shared standings index keyed by (standings_type, year) and team, names already normalized
+standings_store = get_standings_store(os.path.join(data_manager.data_dir, 'standings.csv'))
+# Per-season aggregates: closed seasons frozen under data/cache/seasons, the live season in memory
+season_store = SeasonStore(matchup_store, standings_store, os.path.join(data_manager.data_dir, 'cache', 'seasons'))
+# Compiled snapshot (data/cache/snapshot.bin), memory-mapped so worker processes share one copy
+# of the columns; the stores are seeded from it at boot and whenever an import publishes a new one
+shared_snapshot = SharedSnapshot(data_manager.data_dir, matchup_store, standings_store, season_store)
+shared_snapshot.check()
+# Serialized GET responses, invalidated by any change to the CSVs or the league data
+response_cache = ResponseCache(lambda: (
+    matchup_store.get_generation(),
+    standings_store.get_generation(),
+    data_manager.generation
+))
+
 LEAGUE_ID = "987449"  # The Greatest League
 
 
+@app.before_request
+def remap_snapshot():
+    """Pick up a snapshot published by an import in any worker before serving the request"""
+    shared_snapshot.check()
+
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -67,28 +97,25 @@ def health():
 
 
 @app.route('/api/standings', methods=['GET'])
+@response_cache.cached
 def get_standings():
-    """Get current league standings (2025 season) - uses regular season"""
+    """Get current league standings (live season) - uses regular season"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
-        
         # Get data directory path
         data_dir = data_manager.data_dir
-        csv_file = os.path.join(data_dir, 'standings.csv')
-        # Use regular season standings for current season stats
-        all_standings = load_standings_from_csv(csv_file, 'regular')
-        
-        # Filter for 2025 season only
-        standings_2025 = [s for s in all_standings if s['year'] == 2025]
+        # Use regular season standings for current season stats (live season only)
+        year = season_store.live_season()
+        current_standings = standings_store.get_standings('regular', year)
         
         # Get team logos
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
+        
+        logos = resolve_logos([s['team_name'] for s in current_standings], data_dir)
         
         # Normalize team names and format for frontend
         formatted_standings = []
-        for s in standings_2025:
-            team_name = normalize_team_name(s['team_name'])
+        for s in current_standings:
+            team_name = s['team_name']
             formatted_standings.append({
                 'id': f"{s['year']}_{s['place']}",
                 'name': team_name,
@@ -98,7 +125,7 @@ def get_standings():
                 'points_for': s.get('points_for', 0.0),
                 'points_against': s.get('points_against', 0.0),
                 'place': s['place'],
-                'logo': s.get('team_logo') or get_team_logo_url(team_name, data_dir)
+                'logo': s.get('team_logo') or logos[team_name]
             })
         
         # Sort by place
@@ -107,56 +134,104 @@ def get_standings():
         return jsonify({
             'success': True,
             'data': formatted_standings,
-            'year': 2025
+            'year': year
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/playoff-scenarios', methods=['GET'])
+@response_cache.cached
 def get_playoff_scenarios():
     """Get playoff scenarios for current season"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
-        from historical_scraper import load_from_csv
-        from playoff_calculator import calculate_playoff_scenarios
+        from playoff_calculator import build_season_state, calculate_playoff_scenarios
         
-        # Get data directory path
-        data_dir = data_manager.data_dir
+        # Live season standings and the regular season matchups still to be played
+        year = season_store.live_season()
+        state = build_season_state(
+            matchup_store.get_matchups(),
+            standings_store.get_standings('regular', year),
+            year
+        )
         
-        # Get 2025 standings
-        csv_file = os.path.join(data_dir, 'standings.csv')
-        all_standings = load_standings_from_csv(csv_file, 'regular')
-        standings_2025 = [s for s in all_standings if s['year'] == 2025]
+        # Calculate scenarios
+        scenarios = calculate_playoff_scenarios(state['standings'], state['remaining_matchups'])
         
-        # Format standings for calculator
-        formatted_standings = []
-        for s in standings_2025:
-            formatted_standings.append({
-                'team': normalize_team_name(s['team_name']),
-                'wins': s.get('wins', 0),
-                'losses': s.get('losses', 0),
-                'points_for': s.get('points_for', 0.0)
-            })
+        return jsonify({
+            'success': True,
+            'data': scenarios
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/playoff-odds', methods=['GET'])
+@response_cache.cached
+def get_playoff_odds():
+    """Monte Carlo playoff, championship and spoon odds for the current season"""
+    try:
+        from playoff_calculator import build_season_state, simulate_playoff_odds
+        
+        sims = min(max(request.args.get('sims', type=int, default=100000), 1), 1000000)
+        # Fixed default seed, so the cached odds are the same ones a fresh run would give
+        seed = request.args.get('seed', type=int, default=0)
+        processes = request.args.get('processes', type=int)
+        
+        year = season_store.live_season()
+        state = build_season_state(
+            matchup_store.get_matchups(),
+            standings_store.get_standings('regular', year),
+            year
+        )
+        odds = simulate_playoff_odds(
+            state['standings'],
+            state['remaining_matchups'],
+            state['score_samples'],
+            n_sims=sims,
+            seed=seed,
+            processes=processes
+        )
+        odds['year'] = year
+        odds['completed_weeks'] = state['completed_weeks']
         
-        # Get Week 15 matchups
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file)
-        week15_matchups = [m for m in all_matchups if m.get('year') == 2025 and m.get('week') == 15]
+        return jsonify({
+            'success': True,
+            'data': odds
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/playoff-odds-history', methods=['GET'])
+@response_cache.cached
+def get_playoff_odds_history():
+    """Week-by-week playoff, championship and spoon odds for a season (year=all for every season)"""
+    try:
+        from fun_stats import calculate_playoff_probability_over_time
         
-        # Calculate scenarios
-        scenarios = calculate_playoff_scenarios(formatted_standings, week15_matchups)
+        live = season_store.live_season()
+        year_arg = request.args.get('year', 'all' if live is None else str(live))
+        years = None if year_arg == 'all' else [int(year_arg)]
+        
+        histories = calculate_playoff_probability_over_time(
+            standings_store.get_standings('regular'),
+            matchup_store.get_matchups(),
+            years=years,
+            processes=request.args.get('processes', type=int),
+            cache_dir=os.path.join(data_manager.data_dir, 'cache')
+        )
         
         return jsonify({
             'success': True,
-            'data': scenarios
+            'data': histories if years is None else histories.get(years[0], {})
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/head-to-head', methods=['GET'])
+@response_cache.cached
 def get_head_to_head():
     """Get all-time head-to-head statistics"""
     try:
@@ -176,6 +251,7 @@ def get_head_to_head():
 
 
 @app.route('/api/team-stats', methods=['GET'])
+@response_cache.cached
 def get_team_stats():
     """Get comprehensive stats for a team"""
     try:
@@ -192,6 +268,7 @@ def get_team_stats():
 
 
 @app.route('/api/matchups', methods=['GET'])
+@response_cache.cached
 def get_matchups():
     """Get weekly matchups"""
     try:
@@ -203,6 +280,7 @@ def get_matchups():
 
 
 @app.route('/api/transactions', methods=['GET'])
+@response_cache.cached
 def get_transactions():
     """Get recent transactions"""
     try:
@@ -213,32 +291,67 @@ def get_transactions():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def _refresh_job(job):
+    """Refresh current standings and scrape new weeks of the current season (runs on the job runner)"""
+    from import_historical import import_current_season, sync_csv_to_data_manager
+    from page_cache import current_season
+    
+    # Refresh current standings
+    new_data = scrape_league_data(LEAGUE_ID)
+    data_manager.update_data(new_data)
+    
+    # Import only new weeks for current season
+    rows = import_current_season(LEAGUE_ID, year=current_season(), max_week=17, force=False, progress=job)
+    
+    # Sync CSV to data manager
+    sync_csv_to_data_manager()
+    
+    # Make sure the next request sees the new weeks
+    matchup_store.invalidate()
+    return f'Data refreshed successfully ({rows} new matchups, only new weeks scraped)'
+
+
+def _submit_job(kind: str, func, *args, **kwargs):
+    """Queue a background job: 202 with the job, or 409 with the league's job already in progress"""
+    from jobs import JobConflict, get_job_runner
+    
+    try:
+        job = get_job_runner().submit(kind, LEAGUE_ID, func, *args, **kwargs)
+    except JobConflict as e:
+        return jsonify({'success': False, 'error': str(e), 'job': e.job.to_dict()}), 409
+    return jsonify({'success': True, 'job': job.to_dict()}), 202
+
+
 @app.route('/api/refresh', methods=['POST'])
 def refresh_data():
-    """Manually trigger data refresh from NFL.com - only scrapes new weeks"""
+    """Start a data refresh from NFL.com (only scrapes new weeks); poll /api/jobs/<id> for progress"""
     try:
-        # Refresh current standings
-        new_data = scrape_league_data(LEAGUE_ID)
-        data_manager.update_data(new_data)
-        
-        # Import only new weeks for current season
-        from import_historical import import_current_season
-        import_current_season(LEAGUE_ID, year=2025, max_week=17, force=False)
-        
-        # Sync CSV to data manager
-        from import_historical import sync_csv_to_data_manager
-        sync_csv_to_data_manager()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Data refreshed successfully (only new weeks scraped)',
-            'updated_at': data_manager.get_last_update()
-        })
+        return _submit_job('refresh', _refresh_job)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """List recent background jobs"""
+    from jobs import get_job_runner
+    
+    return jsonify({'success': True, 'data': [job.to_dict() for job in get_job_runner().list()]})
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status and progress of a background job (weeks done, rows written, errors, ETA)"""
+    from jobs import get_job_runner
+    
+    job = get_job_runner().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job {job_id}'}), 404
+    return jsonify({'success': True, 'data': job.to_dict()})
+
+
 @app.route('/api/league-info', methods=['GET'])
+@response_cache.cached
 def get_league_info():
     """Get general league information"""
     try:
@@ -249,6 +362,7 @@ def get_league_info():
 
 
 @app.route('/api/teams', methods=['GET'])
+@response_cache.cached
 def get_teams():
     """Get list of all unique team names (canonical/current names)"""
     try:
@@ -280,42 +394,62 @@ def get_teams():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def _import_historical_job(job, start_year: int, end_year: int):
+    """Scrape historical seasons into matchups.csv (runs on the job runner)"""
+    from import_historical import import_historical_data
+    
+    rows = import_historical_data(LEAGUE_ID, start_year, end_year, progress=job)
+    matchup_store.invalidate()
+    return f'Historical data imported successfully for years {start_year}-{end_year} ({rows} new matchups)'
+
+
 @app.route('/api/import-historical', methods=['POST'])
 def import_historical():
-    """Import historical data from 2012-2024"""
+    """Start a historical import (2012 through last season by default); poll /api/jobs/<id> for progress"""
     try:
-        from import_historical import import_historical_data
+        from page_cache import current_season
         
-        # This is a long-running operation, so we'll run it in the background
-        # For now, just trigger it synchronously (could be improved with threading)
-        start_year = request.json.get('start_year', 2012) if request.json else 2012
-        end_year = request.json.get('end_year', 2024) if request.json else 2024
+        body = request.get_json(silent=True) or {}
+        start_year = int(body.get('start_year', 2012))
+        end_year = int(body.get('end_year', current_season() - 1))
+        if start_year > end_year:
+            return jsonify({'success': False, 'error': 'start_year must not be after end_year'}), 400
         
-        import_historical_data(LEAGUE_ID, start_year, end_year)
-        
-        return jsonify({
-            'success': True,
-            'message': f'Historical data imported successfully for years {start_year}-{end_year}'
-        })
+        return _submit_job('import-historical', _import_historical_job, start_year, end_year)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/seasons', methods=['GET'])
+@response_cache.cached
+def get_seasons():
+    """Every season and whether it is closed (frozen), or one season's aggregates with year=YYYY"""
+    try:
+        year = request.args.get('year', type=int)
+        if year is not None:
+            partition = season_store.get_partition(year)
+            if partition is None:
+                return jsonify({'success': False, 'error': f'No data for {year}'}), 404
+            return jsonify({'success': True, 'data': partition})
+        
+        seasons = [{
+            'year': p['year'],
+            'closed': p['closed'],
+            'games': p['games'],
+            'teams': p['teams']
+        } for p in season_store.get_partitions()]
+        return jsonify({'success': True, 'data': seasons, 'live_season': season_store.live_season()})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/historical-standings', methods=['GET'])
+@response_cache.cached
 def get_historical_standings():
     """Get historical standings data"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
-        
-        # Get data directory path
-        data_dir = data_manager.data_dir
-        csv_file = os.path.join(data_dir, 'standings.csv')
-        standings = load_standings_from_csv(csv_file)
-        
-        # Normalize team names
-        for s in standings:
-            s['team_name'] = normalize_team_name(s['team_name'])
+        # Team names are already normalized by the store
+        standings = standings_store.get_standings('regular')
         
         return jsonify({'success': True, 'data': standings})
     except Exception as e:
@@ -323,21 +457,21 @@ def get_historical_standings():
 
 
 @app.route('/api/historical-stats', methods=['GET'])
+@response_cache.cached
 def get_historical_stats():
     """Get aggregated historical statistics (Super Bowls, Playoffs, Spoons) - uses final standings"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
         from collections import defaultdict
         
         # Get data directory path
+        from season_partitions import merge_standings
+        
         data_dir = data_manager.data_dir
-        csv_file = os.path.join(data_dir, 'standings.csv')
-        # Use final standings for championships and spoons
-        standings = load_standings_from_csv(csv_file, 'final')
+        # Use final standings of completed seasons for championships and spoons (the live season isn't over)
+        standings = merge_standings(season_store.get_partitions(include_live=False), 'final')
         
         # Get team logos
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         # Normalize team names and aggregate with years
         super_bowls = defaultdict(lambda: {'count': 0, 'years': []})  # 1st place
@@ -345,34 +479,33 @@ def get_historical_stats():
         spoons = defaultdict(lambda: {'count': 0, 'years': []})       # 12th place (last place)
         
         for s in standings:
-            team_name = normalize_team_name(s['team_name'])
+            team_name = s['team_name']
             place = s['place']
             year = s['year']
             
-            # Only count 2012-2024 (exclude 2025 as season isn't over)
-            if year <= 2024:
-                if place == 1:
-                    super_bowls[team_name]['count'] += 1
-                    super_bowls[team_name]['years'].append(year)
-                    playoffs[team_name]['count'] += 1
-                    playoffs[team_name]['years'].append(year)
-                elif place <= 4:
-                    playoffs[team_name]['count'] += 1
-                    playoffs[team_name]['years'].append(year)
-                elif place == 12:  # Last place (Spoon)
-                    spoons[team_name]['count'] += 1
-                    spoons[team_name]['years'].append(year)
+            if place == 1:
+                super_bowls[team_name]['count'] += 1
+                super_bowls[team_name]['years'].append(year)
+                playoffs[team_name]['count'] += 1
+                playoffs[team_name]['years'].append(year)
+            elif place <= 4:
+                playoffs[team_name]['count'] += 1
+                playoffs[team_name]['years'].append(year)
+            elif place == 12:  # Last place (Spoon)
+                spoons[team_name]['count'] += 1
+                spoons[team_name]['years'].append(year)
         
         # Sort years for each team and add logos
+        logos = resolve_logos(set(super_bowls) | set(playoffs) | set(spoons), data_dir)
         for team_name in super_bowls.keys():
             super_bowls[team_name]['years'].sort()
-            super_bowls[team_name]['logo'] = get_team_logo_url(team_name, data_dir)
+            super_bowls[team_name]['logo'] = logos[team_name]
         for team_name in playoffs.keys():
             playoffs[team_name]['years'].sort()
-            playoffs[team_name]['logo'] = get_team_logo_url(team_name, data_dir)
+            playoffs[team_name]['logo'] = logos[team_name]
         for team_name in spoons.keys():
             spoons[team_name]['years'].sort()
-            spoons[team_name]['logo'] = get_team_logo_url(team_name, data_dir)
+            spoons[team_name]['logo'] = logos[team_name]
         
         return jsonify({
             'success': True,
@@ -387,18 +520,17 @@ def get_historical_stats():
 
 
 @app.route('/api/team-stats-all-time', methods=['GET'])
+@response_cache.cached
 def get_team_stats_all_time():
     """Get all-time aggregated team statistics (points scored, win %, points against) - uses regular season"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
         from collections import defaultdict
+        from season_partitions import merge_standings
         
         # Get data directory path
         data_dir = data_manager.data_dir
-        csv_file = os.path.join(data_dir, 'standings.csv')
-        # Use regular season standings for stats (points, win %)
-        standings = load_standings_from_csv(csv_file, 'regular')
+        # Use regular season standings of completed seasons for stats (points, win %)
+        standings = merge_standings(season_store.get_partitions(include_live=False), 'regular')
         
         # Aggregate stats by team (normalized names)
         team_stats = defaultdict(lambda: {
@@ -411,21 +543,16 @@ def get_team_stats_all_time():
         })
         
         for s in standings:
-            team_name = normalize_team_name(s['team_name'])
-            year = s['year']
-            
-            # Only count completed seasons (2012-2024)
-            if year <= 2024:
-                stats = team_stats[team_name]
-                stats['total_points_for'] += s.get('points_for', 0.0)
-                stats['total_points_against'] += s.get('points_against', 0.0)
-                stats['total_wins'] += s.get('wins', 0)
-                stats['total_losses'] += s.get('losses', 0)
-                stats['total_ties'] += s.get('ties', 0)
-                stats['seasons'] += 1
+            stats = team_stats[s['team_name']]
+            stats['total_points_for'] += s.get('points_for', 0.0)
+            stats['total_points_against'] += s.get('points_against', 0.0)
+            stats['total_wins'] += s.get('wins', 0)
+            stats['total_losses'] += s.get('losses', 0)
+            stats['total_ties'] += s.get('ties', 0)
+            stats['seasons'] += 1
         
         # Get team logos
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         # Calculate all-time win percentage and prepare data
         result = {
@@ -434,12 +561,13 @@ def get_team_stats_all_time():
             'most_points_against': []
         }
         
+        logos = resolve_logos(team_stats.keys(), data_dir)
         for team_name, stats in team_stats.items():
             total_games = stats['total_wins'] + stats['total_losses'] + stats['total_ties']
             # Calculate win percentage as a percentage (0-100)
             win_pct = (stats['total_wins'] / total_games * 100) if total_games > 0 else 0.0
             
-            team_logo = get_team_logo_url(team_name, data_dir)
+            team_logo = logos[team_name]
             
             result['most_points_scored'].append({
                 'team': team_name,
@@ -479,29 +607,26 @@ def get_team_stats_all_time():
 
 
 @app.route('/api/scoring-titles', methods=['GET'])
+@response_cache.cached
 def get_scoring_titles():
     """Get scoring titles (highest points for in each season) - uses regular season"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
         from collections import defaultdict
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         # Get data directory path
         data_dir = data_manager.data_dir
-        csv_file = os.path.join(data_dir, 'standings.csv')
         # Use regular season standings (has points_for data)
-        standings = load_standings_from_csv(csv_file, 'regular')
-        
-        # Find highest points_for for each year (2012-2024 only, exclude 2025)
+        # Find highest points_for for each completed season
         scoring_titles = defaultdict(lambda: {'count': 0, 'years': []})
         
-        for year in range(2012, 2025):  # 2012-2024 only
-            year_standings = [s for s in standings if s['year'] == year]
+        for partition in season_store.get_partitions(include_live=False):
+            year = partition['year']
+            year_standings = partition['standings']['regular']
             if year_standings:
                 # Find team with highest points_for
                 max_points_team = max(year_standings, key=lambda x: x.get('points_for', 0.0))
-                team_name = normalize_team_name(max_points_team['team_name'])
+                team_name = max_points_team['team_name']
                 points = max_points_team.get('points_for', 0.0)
                 
                 scoring_titles[team_name]['count'] += 1
@@ -512,9 +637,10 @@ def get_scoring_titles():
         
         # Sort years for each team and add logos
         result = []
+        logos = resolve_logos(scoring_titles.keys(), data_dir)
         for team_name, data in scoring_titles.items():
             data['years'].sort(key=lambda x: x['year'])
-            data['logo'] = get_team_logo_url(team_name, data_dir)
+            data['logo'] = logos[team_name]
             result.append({
                 'team': team_name,
                 'count': data['count'],
@@ -534,39 +660,31 @@ def get_scoring_titles():
 
 
 @app.route('/api/win-pct-by-year', methods=['GET'])
+@response_cache.cached
 def get_win_pct_by_year():
     """Get win percentage by year for each team - uses regular season"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
         from collections import defaultdict
+        from season_partitions import merge_standings
         
-        # Get data directory path
-        data_dir = data_manager.data_dir
-        csv_file = os.path.join(data_dir, 'standings.csv')
-        # Use regular season standings
-        standings = load_standings_from_csv(csv_file, 'regular')
+        # Use regular season standings of completed seasons
+        standings = merge_standings(season_store.get_partitions(include_live=False), 'regular')
         
         # Group by year, then by team
         by_year = defaultdict(lambda: {})
         
         for s in standings:
-            team_name = normalize_team_name(s['team_name'])
-            year = s['year']
+            wins = s.get('wins', 0)
+            losses = s.get('losses', 0)
+            ties = s.get('ties', 0)
+            total_games = wins + losses + ties
             
-            # Only count completed seasons (2012-2024)
-            if year <= 2024:
-                wins = s.get('wins', 0)
-                losses = s.get('losses', 0)
-                ties = s.get('ties', 0)
-                total_games = wins + losses + ties
-                
-                if total_games > 0:
-                    win_pct = ((wins + ties * 0.5) / total_games) * 100
-                else:
-                    win_pct = 0.0
-                
-                by_year[year][team_name] = round(win_pct, 2)
+            if total_games > 0:
+                win_pct = ((wins + ties * 0.5) / total_games) * 100
+            else:
+                win_pct = 0.0
+            
+            by_year[s['year']][s['team_name']] = round(win_pct, 2)
         
         # Get all unique teams
         all_teams = set()
@@ -590,29 +708,32 @@ def get_win_pct_by_year():
 
 
 @app.route('/api/hall-of-fame', methods=['GET'])
+@response_cache.cached
 def get_hall_of_fame():
     """Get Hall of Fame inductees"""
     try:
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         from collections import defaultdict
         
         data_dir = data_manager.data_dir
         
+        logos = resolve_logos(['Pels', "Maggi's Mighty Ducks", 'Killer Cam'], data_dir)
+        
         # Hardcoded Hall of Fame inductees with blurbs
         hall_of_fame = [
             {
                 'team': 'Pels',
-                'logo': get_team_logo_url('Pels', data_dir),
+                'logo': logos['Pels'],
                 'blurb': 'The Palm Beach Pelicans have established themselves as a dynasty in The Greatest League. With multiple championships and consistent excellence, Pels has proven that beach vibes and fantasy dominance go hand in hand. Their strategic brilliance and unwavering consistency have earned them a permanent place among the league\'s elite.'
             },
             {
                 'team': "Maggi's Mighty Ducks",
-                'logo': get_team_logo_url("Maggi's Mighty Ducks", data_dir),
+                'logo': logos["Maggi's Mighty Ducks"],
                 'blurb': 'Quack, quack, champions! Maggi\'s Mighty Ducks have soared to incredible heights, capturing multiple Super Bowl titles and establishing themselves as one of the most successful franchises in league history. Their fearless approach and clutch performances in the biggest moments have cemented their legacy as true legends of The Greatest League.'
             },
             {
                 'team': 'Killer Cam',
-                'logo': get_team_logo_url('Killer Cam', data_dir),
+                'logo': logos['Killer Cam'],
                 'blurb': 'The Killer Cam franchise has been a force to be reckoned with since day one. With championship pedigree and a reputation for making bold moves, Killer Cam has consistently been at the top of the league standings. Their killer instinct and championship DNA have rightfully earned them a spot in the Hall of Fame.'
             }
         ]
@@ -626,38 +747,38 @@ def get_hall_of_fame():
 
 
 @app.route('/api/hall-of-shame', methods=['GET'])
+@response_cache.cached
 def get_hall_of_shame():
     """Get Hall of Shame teams (3+ years in league, no championships)"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         from collections import defaultdict
         
+        from season_partitions import merge_standings
+        
         data_dir = data_manager.data_dir
-        csv_file = os.path.join(data_dir, 'standings.csv')
         
-        # Load final standings to check championships
-        final_standings = load_standings_from_csv(csv_file, 'final')
+        # Final standings of completed seasons to check championships
+        closed_seasons = set(season_store.closed_seasons())
+        final_standings = merge_standings(season_store.get_partitions(include_live=False), 'final')
         
         # Track teams: years active and championships
         team_data = defaultdict(lambda: {'years': set(), 'championships': 0, 'first_year': 9999, 'last_year': 0})
         
         for s in final_standings:
-            team_name = normalize_team_name(s['team_name'])
+            team_name = s['team_name']
             year = s['year']
             place = s['place']
             
-            # Only count 2012-2024 (exclude 2025)
-            if year <= 2024:
-                team_data[team_name]['years'].add(year)
-                team_data[team_name]['first_year'] = min(team_data[team_name]['first_year'], year)
-                team_data[team_name]['last_year'] = max(team_data[team_name]['last_year'], year)
-                if place == 1:  # Championship
-                    team_data[team_name]['championships'] += 1
+            team_data[team_name]['years'].add(year)
+            team_data[team_name]['first_year'] = min(team_data[team_name]['first_year'], year)
+            team_data[team_name]['last_year'] = max(team_data[team_name]['last_year'], year)
+            if place == 1:  # Championship
+                team_data[team_name]['championships'] += 1
         
         # Find teams with 3+ years and 0 championships
         hall_of_shame = []
+        logos = resolve_logos(team_data.keys(), data_dir)
         for team_name, data in team_data.items():
             years_active = len(data['years'])
             if years_active >= 3 and data['championships'] == 0:
@@ -666,8 +787,8 @@ def get_hall_of_shame():
                 total_years = years_active
                 
                 # Get some stats for the blurb
-                regular_standings = load_standings_from_csv(csv_file, 'regular')
-                team_regular = [s for s in regular_standings if normalize_team_name(s['team_name']) == team_name and s['year'] <= 2024]
+                team_regular = [s for s in standings_store.get_team_standings(team_name, 'regular')
+                                if s['year'] in closed_seasons]
                 
                 avg_win_pct = 0
                 if team_regular:
@@ -684,7 +805,7 @@ def get_hall_of_shame():
                 
                 hall_of_shame.append({
                     'team': team_name,
-                    'logo': get_team_logo_url(team_name, data_dir),
+                    'logo': logos[team_name],
                     'years_active': total_years,
                     'years_range': years_str,
                     'blurb': blurb
@@ -702,27 +823,22 @@ def get_hall_of_shame():
 
 
 @app.route('/api/all-time-wins', methods=['GET'])
+@response_cache.cached
 def get_all_time_wins():
     """Get all-time total wins for each team - includes regular season and playoff wins"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         from collections import defaultdict
+        from season_partitions import merge_playoff_records, merge_standings
         
         # Get data directory path
         data_dir = data_manager.data_dir
-        csv_file = os.path.join(data_dir, 'standings.csv')
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        
-        # Use regular season standings for regular season wins
-        standings = load_standings_from_csv(csv_file, 'regular')
         
-        # Load matchups for playoff wins
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
+        # Completed seasons only: regular season standings and playoff records
+        closed = season_store.get_partitions(include_live=False)
+        standings = merge_standings(closed, 'regular')
         
-        # Aggregate regular season wins by team (2012-2024 only)
+        # Aggregate regular season wins by team
         team_wins = defaultdict(lambda: {
             'regular_wins': 0, 
             'regular_losses': 0, 
@@ -734,59 +850,21 @@ def get_all_time_wins():
         
         # Count regular season wins from standings
         for s in standings:
-            team_name = normalize_team_name(s['team_name'])
-            year = s['year']
-            
-            # Only count completed seasons (2012-2024)
-            if year <= 2024:
-                team_wins[team_name]['regular_wins'] += s.get('wins', 0)
-                team_wins[team_name]['regular_losses'] += s.get('losses', 0)
-                team_wins[team_name]['regular_ties'] += s.get('ties', 0)
-                team_wins[team_name]['years'].add(year)
-        
-        # Count playoff wins from matchups (2012-2024 only)
-        # Logic: A playoff win is when there are only 4 or 2 matchups for the week and the team wins in that week
-        # Use schedule data to count matchups per week, not week_type
-        
-        # First, count matchups per week to identify playoff weeks (4 or 2 matchups)
-        week_matchup_counts = defaultdict(lambda: defaultdict(int))
-        for matchup in all_matchups:
-            year = matchup.get('year', 0)
-            week = matchup.get('week', 0)
-            if 2012 <= year <= 2024:
-                week_matchup_counts[year][week] += 1
-        
-        # Now count playoff wins - only in weeks with 4 or 2 matchups
-        for matchup in all_matchups:
-            year = matchup.get('year', 0)
-            week = matchup.get('week', 0)
-            
-            # Only count completed seasons (2012-2024)
-            if year <= 2024:
-                # Check if this week has 4 or 2 matchups (playoff/superbowl week)
-                matchup_count = week_matchup_counts.get(year, {}).get(week, 0)
-                
-                if matchup_count == 4 or matchup_count == 2:
-                    team1 = normalize_team_name(matchup.get('team1_name', ''))
-                    team2 = normalize_team_name(matchup.get('team2_name', ''))
-                    winner = normalize_team_name(matchup.get('winner', ''))
-                    
-                    if team1 and team2:
-                        # Only count wins for teams that actually won their matchup
-                        # Both playoff (4 matchups) and superbowl (2 matchups) wins count as playoff wins
-                        if winner == team1:
-                            team_wins[team1]['playoff_wins'] += 1
-                            team_wins[team2]['playoff_losses'] += 1
-                        elif winner == team2:
-                            team_wins[team2]['playoff_wins'] += 1
-                            team_wins[team1]['playoff_losses'] += 1
-                        # Ties are rare in playoffs, but handle if needed
-                        elif winner == 'Tie' or winner == 'tie':
-                            # For ties, we could count as 0.5 wins each, but typically playoffs don't have ties
-                            pass
+            team_name = s['team_name']
+            team_wins[team_name]['regular_wins'] += s.get('wins', 0)
+            team_wins[team_name]['regular_losses'] += s.get('losses', 0)
+            team_wins[team_name]['regular_ties'] += s.get('ties', 0)
+            team_wins[team_name]['years'].add(s['year'])
+        
+        # Playoff wins: wins in weeks with only 4 or 2 matchups (playoff/superbowl weeks), counted
+        # per season when it was frozen (see season_partitions)
+        for team_name, record in merge_playoff_records(closed).items():
+            team_wins[team_name]['playoff_wins'] += record['wins']
+            team_wins[team_name]['playoff_losses'] += record['losses']
         
         # Convert to list and add logos
         result = []
+        logos = resolve_logos(team_wins.keys(), data_dir)
         for team_name, data in team_wins.items():
             total_wins = data['regular_wins'] + data['playoff_wins']
             total_losses = data['regular_losses'] + data['playoff_losses']
@@ -804,7 +882,7 @@ def get_all_time_wins():
                 'total_ties': total_ties,
                 'total_games': total_games,
                 'years_active': len(data['years']),
-                'logo': get_team_logo_url(team_name, data_dir)
+                'logo': logos[team_name]
             })
         
         # Sort by total wins (descending)
@@ -823,39 +901,26 @@ def get_all_time_wins():
 
 
 @app.route('/api/league-stats', methods=['GET'])
+@response_cache.cached
 def get_league_stats():
     """Get league-wide statistics and averages, plus individual team stats"""
     try:
-        from standings_scraper import load_standings_from_csv
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         from collections import defaultdict
+        from season_partitions import merge_standings, merge_winning_scores
         
         # Get data directory path
         data_dir = data_manager.data_dir
-        standings_file = os.path.join(data_dir, 'standings.csv')
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        
-        # Load regular season standings (2012-2024 for historical, 2025 for current)
-        all_standings = load_standings_from_csv(standings_file, 'regular')
-        
-        # Load matchups for winning scores
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
         
-        # Calculate league averages from historical data (2012-2024)
-        historical_standings = [s for s in all_standings if s['year'] <= 2024]
-        current_standings = [s for s in all_standings if s['year'] == 2025]
+        # Completed seasons for the historical averages, the live season for current logos
+        closed = season_store.get_partitions(include_live=False)
+        historical_standings = merge_standings(closed)
+        current_standings = standings_store.get_standings('regular', season_store.live_season())
         
-        # Calculate average winning score (from matchups)
-        winning_scores = []
-        for matchup in all_matchups:
-            if matchup.get('year', 0) <= 2024:  # Historical data only
-                winner_score = max(matchup.get('team1_score', 0), matchup.get('team2_score', 0))
-                if winner_score > 0:
-                    winning_scores.append(winner_score)
-        
-        avg_winning_score = sum(winning_scores) / len(winning_scores) if winning_scores else 0
+        # Calculate average winning score (from matchups): [count, total] per completed season, merged
+        winning_scores = merge_winning_scores(closed)
+        count, total = winning_scores['league']
+        avg_winning_score = total / count if count else 0
         
         # Calculate average wins to make playoffs (teams in top 4)
         playoff_wins = []
@@ -891,25 +956,12 @@ def get_league_stats():
         
         # Calculate average points differential
         point_differentials = [s.get('points_for', 0) - s.get('points_against', 0) for s in historical_standings]
-        avg_point_differential = sum(point_differentials) / len(point_differentials) if point_differentials else 0
-        
-        # Calculate team-specific winning scores from matchups (historical 2012-2024)
-        team_winning_scores = defaultdict(list)
-        for matchup in all_matchups:
-            if matchup.get('year', 0) <= 2024:  # Historical data only
-                team1_name = normalize_team_name(matchup.get('team1_name', ''))
-                team2_name = normalize_team_name(matchup.get('team2_name', ''))
-                team1_score = matchup.get('team1_score', 0)
-                team2_score = matchup.get('team2_score', 0)
-                
-                # Determine winner and add their score
-                if team1_score > team2_score:
-                    team_winning_scores[team1_name].append(team1_score)
-                elif team2_score > team1_score:
-                    team_winning_scores[team2_name].append(team2_score)
-                # Ties don't count as wins, so we skip them
-        
-        # Calculate team-specific historical stats (2012-2024) for comparison
+        avg_point_differential = math.fsum(point_differentials) / len(point_differentials) if point_differentials else 0
+        
+        # Team-specific winning scores (ties don't count as wins): [count, total] per team
+        team_winning_scores = winning_scores['teams']
+        
+        # Calculate team-specific historical stats (completed seasons) for comparison
         team_historical_stats = defaultdict(lambda: {
             'total_points_for': 0.0,
             'total_points_against': 0.0,
@@ -922,7 +974,7 @@ def get_league_stats():
         })
         
         for s in historical_standings:
-            team_name = normalize_team_name(s['team_name'])
+            team_name = s['team_name']
             stats = team_historical_stats[team_name]
             stats['total_points_for'] += s.get('points_for', 0.0)
             stats['total_points_against'] += s.get('points_against', 0.0)
@@ -934,26 +986,28 @@ def get_league_stats():
             stats['points_against_list'].append(s.get('points_against', 0.0))
         
         # Get team logos from current standings
+        logos = resolve_logos(set(team_historical_stats) | {s['team_name'] for s in current_standings}, data_dir)
         team_logos = {}
         for s in current_standings:
-            team_name = normalize_team_name(s['team_name'])
-            team_logos[team_name] = s.get('team_logo') or get_team_logo_url(team_name, data_dir)
+            team_name = s['team_name']
+            team_logos[team_name] = s.get('team_logo') or logos[team_name]
         
-        # Calculate averages for each team (2012-2024)
+        # Calculate averages for each team (completed seasons)
         team_stats = {}
         for team_name, stats in team_historical_stats.items():
             total_games = stats['total_wins'] + stats['total_losses'] + stats['total_ties']
             
-            # Calculate averages
-            avg_points_for = stats['total_points_for'] / stats['seasons'] if stats['seasons'] > 0 else 0
-            avg_points_against = stats['total_points_against'] / stats['seasons'] if stats['seasons'] > 0 else 0
-            avg_win_pct = ((stats['total_wins'] + stats['total_ties'] * 0.5) / total_games * 100) if total_games > 0 else 0
-            avg_point_differential = avg_points_for - avg_points_against
+            # Calculate averages (team_ prefixed so the league averages above are not overwritten)
+            # fsum so the averages don't depend on the order the seasons were merged in
+            team_points_for = math.fsum(stats['points_for_list']) / stats['seasons'] if stats['seasons'] > 0 else 0
+            team_points_against = math.fsum(stats['points_against_list']) / stats['seasons'] if stats['seasons'] > 0 else 0
+            team_win_pct = ((stats['total_wins'] + stats['total_ties'] * 0.5) / total_games * 100) if total_games > 0 else 0
+            team_point_differential = team_points_for - team_points_against
             points_per_game = (stats['total_points_for'] / total_games) if total_games > 0 else 0
             
             # Calculate team's average winning score from historical matchups
-            team_wins = team_winning_scores.get(team_name, [])
-            avg_team_winning_score = sum(team_wins) / len(team_wins) if team_wins else 0
+            wins_count, wins_total = team_winning_scores.get(team_name, (0, 0.0))
+            avg_team_winning_score = wins_total / wins_count if wins_count else 0
             
             # Calculate average wins per season (for playoff comparison)
             avg_wins_per_season = stats['total_wins'] / stats['seasons'] if stats['seasons'] > 0 else 0
@@ -963,13 +1017,13 @@ def get_league_stats():
                 'wins': round(avg_wins_per_season, 1),  # Average wins per season
                 'losses': round(stats['total_losses'] / stats['seasons'], 1) if stats['seasons'] > 0 else 0,
                 'ties': round(stats['total_ties'] / stats['seasons'], 1) if stats['seasons'] > 0 else 0,
-                'points_for': round(avg_points_for, 2),
-                'points_against': round(avg_points_against, 2),
-                'win_pct': round(avg_win_pct, 2),
-                'point_differential': round(avg_point_differential, 2),
+                'points_for': round(team_points_for, 2),
+                'points_against': round(team_points_against, 2),
+                'win_pct': round(team_win_pct, 2),
+                'point_differential': round(team_point_differential, 2),
                 'avg_winning_score': round(avg_team_winning_score, 2),
                 'points_per_game': round(points_per_game, 2),
-                'logo': team_logos.get(team_name) or get_team_logo_url(team_name, data_dir)
+                'logo': team_logos.get(team_name) or logos[team_name]
             }
         
         # League averages
@@ -980,7 +1034,7 @@ def get_league_stats():
             'avg_points_against': round(avg_points_against, 2),
             'avg_win_pct': round(avg_win_pct, 2),
             'avg_points_per_game': round(avg_points_per_game, 2),
-            'avg_point_differential': round(avg_point_differential, 2)
+            'avg_point_differential': round(avg_point_differential, 2) + 0.0  # + 0.0 turns -0.0 into 0.0
         }
         
         return jsonify({
@@ -994,25 +1048,137 @@ def get_league_stats():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/all-play', methods=['GET'])
+@response_cache.cached
+def get_all_play():
+    """All-play standings (record vs every team every week) and luck, per season and all-time"""
+    try:
+        from all_play import calculate_all_play
+        from team_logos import resolve_logos
+        
+        # Only count the weeks already in the standings (skips a week still in progress)
+        all_play = calculate_all_play(matchup_store.get_table(), standings_store.get_weeks_played())
+        
+        year = request.args.get('year', type=int)
+        if year is not None:
+            all_play['seasons'] = {year: all_play['seasons'].get(year, [])}
+        
+        names = {row['team'] for rows in all_play['seasons'].values() for row in rows}
+        names.update(row['team'] for row in all_play['all_time'])
+        logos = resolve_logos(names, data_manager.data_dir)
+        for rows in list(all_play['seasons'].values()) + [all_play['all_time']]:
+            for row in rows:
+                row['logo'] = logos[row['team']]
+        
+        return jsonify({
+            'success': True,
+            'data': all_play
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/schedule-swap', methods=['GET'])
+@response_cache.cached
+def get_schedule_swap():
+    """Every team's record under every other team's schedule, for a season or all-time"""
+    try:
+        from schedule_swap import all_time_schedule_swaps, calculate_schedule_swaps
+        
+        grids = calculate_schedule_swaps(matchup_store.get_table(), standings_store.get_weeks_played())
+        
+        year_arg = request.args.get('year', 'all')
+        if year_arg == 'all':
+            data = all_time_schedule_swaps(grids)
+            data['years'] = sorted(grids)
+        else:
+            year = int(year_arg)
+            if year not in grids:
+                return jsonify({'success': False, 'error': f'No matchups for {year}'}), 404
+            data = grids[year]
+        
+        return jsonify({
+            'success': True,
+            'data': data
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def _elo_params_from_args():
+    """EloParams from query args (k, home_advantage, playoff_weight, season_regression, mov_scale)"""
+    from elo import EloParams
+
+    defaults = EloParams()
+    return EloParams(**{
+        name: request.args.get(name, type=float, default=getattr(defaults, name))
+        for name in EloParams._fields
+    })
+
+
+@app.route('/api/elo', methods=['GET'])
+@response_cache.cached
+def get_elo():
+    """Current Elo ratings and next week's win probabilities (team=NAME for one rating trajectory)"""
+    try:
+        from elo import get_elo_engine
+
+        params = _elo_params_from_args()
+        engine = get_elo_engine(params).update(matchup_store.get_table(), standings_store.get_weeks_played())
+
+        team = request.args.get('team')
+        if team:
+            data = {'team': team, 'trajectory': engine.trajectory(team)}
+        else:
+            data = {'ratings': engine.current_ratings(), 'upcoming': engine.upcoming()}
+        data['params'] = params._asdict()
+
+        return jsonify({
+            'success': True,
+            'data': data
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/elo/fit', methods=['GET'])
+@response_cache.cached
+def get_elo_fit():
+    """Grid-search the Elo hyperparameters by log loss of the pregame win probabilities"""
+    try:
+        from elo import fit_elo
+
+        fit = fit_elo(
+            matchup_store.get_table(),
+            standings_store.get_weeks_played(),
+            burn_in_seasons=request.args.get('burn_in', type=int, default=1),
+            processes=request.args.get('processes', type=int)
+        )
+        limit = request.args.get('limit', type=int, default=20)
+
+        return jsonify({
+            'success': True,
+            'data': {'best': fit['best'], 'results': fit['results'][:limit]}
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/rivalries', methods=['GET'])
+@response_cache.cached
 def get_rivalries():
     """Get top rivalries"""
     try:
-        from fun_stats import calculate_rivalries, generate_trash_talk
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        
-        rivalries = calculate_rivalries(all_matchups, normalize_team_name)
+        rivalries = matchup_store.get_analytics().result('rivalries')
         
         # Add logos
+        logos = resolve_logos({r[side] for r in rivalries for side in ('team1', 'team2')}, data_dir)
         for r in rivalries:
-            r['team1_logo'] = get_team_logo_url(r['team1'], data_dir)
-            r['team2_logo'] = get_team_logo_url(r['team2'], data_dir)
+            r['team1_logo'] = logos[r['team1']]
+            r['team2_logo'] = logos[r['team2']]
         
         return jsonify({'success': True, 'data': rivalries})
     except Exception as e:
@@ -1020,11 +1186,11 @@ def get_rivalries():
 
 
 @app.route('/api/trash-talk', methods=['GET'])
+@response_cache.cached
 def get_trash_talk():
     """Generate trash talk for two teams"""
     try:
-        from fun_stats import calculate_rivalries, generate_trash_talk
-        from historical_scraper import load_from_csv
+        from fun_stats import generate_trash_talk
         from team_mapper import normalize_team_name
         
         team1 = request.args.get('team1', '')
@@ -1033,11 +1199,7 @@ def get_trash_talk():
         if not team1 or not team2:
             return jsonify({'success': False, 'error': 'Both team1 and team2 parameters required'}), 400
         
-        data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        
-        rivalries = calculate_rivalries(all_matchups, normalize_team_name)
+        rivalries = matchup_store.get_analytics().result('rivalries')
         trash_talk = generate_trash_talk(team1, team2, rivalries, normalize_team_name)
         
         return jsonify({'success': True, 'data': trash_talk})
@@ -1046,29 +1208,21 @@ def get_trash_talk():
 
 
 @app.route('/api/streaks', methods=['GET'])
+@response_cache.cached
 def get_streaks():
     """Get current and all-time streaks"""
     try:
-        from fun_stats import calculate_streaks
-        from historical_scraper import load_from_csv
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        standings_file = os.path.join(data_dir, 'standings.csv')
-        
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        all_standings = load_standings_from_csv(standings_file, 'regular')
-        
-        streaks = calculate_streaks(all_matchups, all_standings, normalize_team_name)
+        streaks = matchup_store.get_analytics().result('streaks')
         
         # Add logos
+        logos = resolve_logos({s['team'] for s in streaks['current'] + streaks['all_time']}, data_dir)
         for s in streaks['current']:
-            s['logo'] = get_team_logo_url(s['team'], data_dir)
+            s['logo'] = logos[s['team']]
         for s in streaks['all_time']:
-            s['logo'] = get_team_logo_url(s['team'], data_dir)
+            s['logo'] = logos[s['team']]
         
         return jsonify({'success': True, 'data': streaks})
     except Exception as e:
@@ -1076,24 +1230,20 @@ def get_streaks():
 
 
 @app.route('/api/blowouts', methods=['GET'])
+@response_cache.cached
 def get_blowouts():
     """Get biggest blowouts"""
     try:
-        from fun_stats import calculate_blowouts
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        
-        blowouts = calculate_blowouts(all_matchups, normalize_team_name)
+        blowouts = matchup_store.get_analytics().result('blowouts')
         
         # Add logos
+        logos = resolve_logos({b[side] for b in blowouts for side in ('winner', 'loser')}, data_dir)
         for b in blowouts:
-            b['winner_logo'] = get_team_logo_url(b['winner'], data_dir)
-            b['loser_logo'] = get_team_logo_url(b['loser'], data_dir)
+            b['winner_logo'] = logos[b['winner']]
+            b['loser_logo'] = logos[b['loser']]
         
         return jsonify({'success': True, 'data': blowouts})
     except Exception as e:
@@ -1101,27 +1251,24 @@ def get_blowouts():
 
 
 @app.route('/api/bad-beats', methods=['GET'])
+@response_cache.cached
 def get_bad_beats():
     """Get bad beats (high score losses, low score wins)"""
     try:
-        from fun_stats import calculate_bad_beats
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        
-        bad_beats = calculate_bad_beats(all_matchups, normalize_team_name)
+        bad_beats = matchup_store.get_analytics().result('bad_beats')
         
         # Add logos
+        logos = resolve_logos({b[side] for b in bad_beats['high_score_losses'] + bad_beats['low_score_wins']
+                               for side in ('team', 'opponent')}, data_dir)
         for b in bad_beats['high_score_losses']:
-            b['team_logo'] = get_team_logo_url(b['team'], data_dir)
-            b['opponent_logo'] = get_team_logo_url(b['opponent'], data_dir)
+            b['team_logo'] = logos[b['team']]
+            b['opponent_logo'] = logos[b['opponent']]
         for b in bad_beats['low_score_wins']:
-            b['team_logo'] = get_team_logo_url(b['team'], data_dir)
-            b['opponent_logo'] = get_team_logo_url(b['opponent'], data_dir)
+            b['team_logo'] = logos[b['team']]
+            b['opponent_logo'] = logos[b['opponent']]
         
         return jsonify({'success': True, 'data': bad_beats})
     except Exception as e:
@@ -1129,30 +1276,30 @@ def get_bad_beats():
 
 
 @app.route('/api/weekly-awards', methods=['GET'])
+@response_cache.cached
 def get_weekly_awards():
     """Get weekly awards (highest scores, lowest winning scores, biggest margins)"""
     try:
-        from fun_stats import calculate_weekly_awards
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
+        from season_partitions import merge_awards
         
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        
-        awards = calculate_weekly_awards(all_matchups, normalize_team_name)
+        # Every season's award candidates (frozen for completed seasons), merged
+        awards = merge_awards(season_store.get_partitions())
         
         # Add logos
+        logos = resolve_logos({a[side] for key in ('highest_scores', 'lowest_winning_scores') for a in awards[key]
+                               for side in ('team', 'opponent')} |
+                              {a[side] for a in awards['biggest_margins'] for side in ('winner', 'loser')}, data_dir)
         for a in awards['highest_scores']:
-            a['team_logo'] = get_team_logo_url(a['team'], data_dir)
-            a['opponent_logo'] = get_team_logo_url(a['opponent'], data_dir)
+            a['team_logo'] = logos[a['team']]
+            a['opponent_logo'] = logos[a['opponent']]
         for a in awards['lowest_winning_scores']:
-            a['team_logo'] = get_team_logo_url(a['team'], data_dir)
-            a['opponent_logo'] = get_team_logo_url(a['opponent'], data_dir)
+            a['team_logo'] = logos[a['team']]
+            a['opponent_logo'] = logos[a['opponent']]
         for a in awards['biggest_margins']:
-            a['winner_logo'] = get_team_logo_url(a['winner'], data_dir)
-            a['loser_logo'] = get_team_logo_url(a['loser'], data_dir)
+            a['winner_logo'] = logos[a['winner']]
+            a['loser_logo'] = logos[a['loser']]
         
         return jsonify({'success': True, 'data': awards})
     except Exception as e:
@@ -1160,23 +1307,19 @@ def get_weekly_awards():
 
 
 @app.route('/api/consistency', methods=['GET'])
+@response_cache.cached
 def get_consistency():
     """Get consistency scores for all teams"""
     try:
-        from fun_stats import calculate_consistency
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        
-        consistency = calculate_consistency(all_matchups, normalize_team_name)
+        consistency = matchup_store.get_analytics().result('consistency')
         
         # Add logos
+        logos = resolve_logos({c['team'] for c in consistency}, data_dir)
         for c in consistency:
-            c['logo'] = get_team_logo_url(c['team'], data_dir)
+            c['logo'] = logos[c['team']]
         
         return jsonify({'success': True, 'data': consistency})
     except Exception as e:
@@ -1184,23 +1327,19 @@ def get_consistency():
 
 
 @app.route('/api/clutch', methods=['GET'])
+@response_cache.cached
 def get_clutch():
     """Get clutch performance stats"""
     try:
-        from fun_stats import calculate_clutch_performance
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        
-        clutch = calculate_clutch_performance(all_matchups, normalize_team_name)
+        clutch = matchup_store.get_analytics().result('clutch')
         
         # Add logos
+        logos = resolve_logos({c['team'] for c in clutch}, data_dir)
         for c in clutch:
-            c['logo'] = get_team_logo_url(c['team'], data_dir)
+            c['logo'] = logos[c['team']]
         
         return jsonify({'success': True, 'data': clutch})
     except Exception as e:
@@ -1208,27 +1347,33 @@ def get_clutch():
 
 
 @app.route('/api/team-dna', methods=['GET'])
+@response_cache.cached
 def get_team_dna():
     """Get team DNA/personality profiles"""
     try:
         from fun_stats import calculate_team_dna
-        from historical_scraper import load_from_csv
-        from standings_scraper import load_standings_from_csv
         from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
+        live = season_store.live_season()
+        if live is None:
+            return jsonify({'success': True, 'data': []})
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        standings_file = os.path.join(data_dir, 'standings.csv')
         
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        all_standings = load_standings_from_csv(standings_file, 'regular')
+        all_matchups = matchup_store.get_matchups()
+        all_standings = standings_store.get_standings('regular')
         
-        team_dna = calculate_team_dna(all_matchups, all_standings, normalize_team_name)
+        analytics = matchup_store.get_analytics()
+        team_dna = calculate_team_dna(all_matchups, all_standings, normalize_team_name,
+                                      final_standings=standings_store.get_standings('final'),
+                                      consistency=analytics.result('consistency'),
+                                      clutch=analytics.result('clutch'),
+                                      max_year=live - 1)
         
         # Add logos
+        logos = resolve_logos({dna['team'] for dna in team_dna}, data_dir)
         for dna in team_dna:
-            dna['logo'] = get_team_logo_url(dna['team'], data_dir)
+            dna['logo'] = logos[dna['team']]
         
         return jsonify({'success': True, 'data': team_dna})
     except Exception as e:
@@ -1236,30 +1381,26 @@ def get_team_dna():
 
 
 @app.route('/api/trophy-case', methods=['GET'])
+@response_cache.cached
 def get_trophy_case():
     """Get trophy case achievements for all teams"""
     try:
-        from fun_stats import calculate_trophy_case
-        from historical_scraper import load_from_csv
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        standings_file = os.path.join(data_dir, 'standings.csv')
-        
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        all_standings = load_standings_from_csv(standings_file, 'regular')
-        
-        trophies = calculate_trophy_case(all_matchups, all_standings, normalize_team_name)
+        trophies = matchup_store.get_analytics().result(
+            'trophy_case',
+            standings=standings_store.get_standings('regular'),
+            final_standings=standings_store.get_standings('final')
+        )
         
         # Add logos and format
+        logos = resolve_logos(trophies.keys(), data_dir)
         formatted_trophies = []
         for team, data in trophies.items():
             formatted_trophies.append({
                 'team': team,
-                'logo': get_team_logo_url(team, data_dir),
+                'logo': logos[team],
                 **data
             })
         
@@ -1269,24 +1410,20 @@ def get_trophy_case():
 
 
 @app.route('/api/points-trends', methods=['GET'])
+@response_cache.cached
 def get_points_trends():
     """Get points trends over time for all teams"""
     try:
-        from fun_stats import calculate_points_trends
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        
-        trends = calculate_points_trends(all_matchups, normalize_team_name)
+        trends = matchup_store.get_analytics().result('points_trends')
         
         # Add logos
+        logos = resolve_logos(trends.keys(), data_dir)
         for team, data in trends.items():
             data['team'] = team
-            data['logo'] = get_team_logo_url(team, data_dir)
+            data['logo'] = logos[team]
         
         return jsonify({'success': True, 'data': list(trends.values())})
     except Exception as e:
@@ -1294,27 +1431,26 @@ def get_points_trends():
 
 
 @app.route('/api/matchup-difficulty', methods=['GET'])
+@response_cache.cached
 def get_matchup_difficulty():
     """Get matchup difficulty / strength of schedule for current season"""
     try:
         from fun_stats import calculate_matchup_difficulty
-        from standings_scraper import load_standings_from_csv
-        from historical_scraper import load_from_csv
         from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
         data_dir = data_manager.data_dir
-        standings_file = os.path.join(data_dir, 'standings.csv')
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
         
-        all_standings = load_standings_from_csv(standings_file, 'regular')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
+        all_standings = standings_store.get_standings('regular')
+        all_matchups = matchup_store.get_matchups()
         
-        difficulty = calculate_matchup_difficulty(all_standings, all_matchups, normalize_team_name, 2025)
+        difficulty = calculate_matchup_difficulty(all_standings, all_matchups, normalize_team_name,
+                                                  season_store.live_season())
         
         # Add logos
+        logos = resolve_logos({d['team'] for d in difficulty}, data_dir)
         for d in difficulty:
-            d['logo'] = get_team_logo_url(d['team'], data_dir)
+            d['logo'] = logos[d['team']]
         
         return jsonify({'success': True, 'data': difficulty})
     except Exception as e:
@@ -1322,50 +1458,78 @@ def get_matchup_difficulty():
 
 
 @app.route('/api/weekly-recap', methods=['GET'])
+@response_cache.cached
 def get_weekly_recap():
     """Generate weekly recap for a specific week"""
     try:
         from fun_stats import generate_weekly_recap
-        from historical_scraper import load_from_csv
-        from standings_scraper import load_standings_from_csv
         from team_mapper import normalize_team_name
         
-        year = int(request.args.get('year', 2025))
+        year = request.args.get('year', type=int, default=season_store.live_season())
         week = int(request.args.get('week', 1))
+        if year is None:
+            return jsonify({'success': False, 'error': 'No seasons loaded; pass year'}), 400
         
-        data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        standings_file = os.path.join(data_dir, 'standings.csv')
-        
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
-        all_standings = load_standings_from_csv(standings_file, 'regular')
+        week_matchups = matchup_store.get_week_matchups(year, week)
+        all_standings = standings_store.get_standings('regular')
         
-        recap = generate_weekly_recap(all_matchups, all_standings, year, week, normalize_team_name)
+        recap = generate_weekly_recap(week_matchups, all_standings, year, week, normalize_team_name)
         
         return jsonify({'success': True, 'data': recap})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/game-log', methods=['GET'])
+@response_cache.cached
+def get_game_log():
+    """Every game a team played (team=NAME, any of its names), oldest first"""
+    try:
+        from team_mapper import normalize_team_name
+        
+        team = request.args.get('team')
+        if not team:
+            return jsonify({'success': False, 'error': 'team required'}), 400
+        
+        team_name = normalize_team_name(team)
+        games = []
+        for m in matchup_store.get_team_game_log(team):
+            is_team1 = normalize_team_name(m['team1_name']) == team_name
+            score, opponent_score = (m['team1_score'], m['team2_score']) if is_team1 else (m['team2_score'], m['team1_score'])
+            games.append({
+                'year': m['year'],
+                'week': m['week'],
+                'week_type': m['week_type'],
+                'opponent': normalize_team_name(m['team2_name'] if is_team1 else m['team1_name']),
+                'score': score,
+                'opponent_score': opponent_score,
+                'result': 'W' if score > opponent_score else 'L' if score < opponent_score else 'T'
+            })
+        
+        return jsonify({'success': True, 'data': {'team': team_name, 'games': games}})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/lowest-scoring-weeks', methods=['GET'])
+@response_cache.cached
 def get_lowest_scoring_weeks():
-    """Get top 10 lowest scoring weeks (2012-2024)"""
+    """Get top 10 lowest scoring weeks (completed seasons)"""
     try:
-        from fun_stats import calculate_lowest_scoring_weeks
-        from historical_scraper import load_from_csv
-        from team_mapper import normalize_team_name
-        from team_logos import get_team_logo_url
+        from team_logos import resolve_logos
         
-        data_dir = data_manager.data_dir
-        matchups_file = os.path.join(data_dir, 'matchups.csv')
-        all_matchups = load_from_csv(matchups_file) if os.path.exists(matchups_file) else []
+        live = season_store.live_season()
+        if live is None:
+            return jsonify({'success': True, 'data': []})
         
-        lowest_weeks = calculate_lowest_scoring_weeks(all_matchups, normalize_team_name)
+        data_dir = data_manager.data_dir
+        lowest_weeks = matchup_store.get_table().lowest_scoring_weeks(max_year=live - 1)
         
         # Add logos
+        logos = resolve_logos({week[side] for week in lowest_weeks for side in ('team', 'opponent')}, data_dir)
         for week in lowest_weeks:
-            week['team_logo'] = get_team_logo_url(week['team'], data_dir)
-            week['opponent_logo'] = get_team_logo_url(week['opponent'], data_dir)
+            week['team_logo'] = logos[week['team']]
+            week['opponent_logo'] = logos[week['opponent']]
         
         return jsonify({'success': True, 'data': lowest_weeks})
     except Exception as e:
@@ -1376,27 +1540,87 @@ def get_lowest_scoring_weeks():
 def get_what_if():
     """Calculate what-if scenarios"""
     try:
-        from historical_scraper import load_from_csv
-        from standings_scraper import load_standings_from_csv
-        from team_mapper import normalize_team_name
-        from collections import defaultdict
+        from what_if import edits_from_request
         
-        data = request.get_json()
-        scenario = data.get('scenario', {})
+        data = request.get_json(silent=True) or {}
+        try:
+            edits = edits_from_request(data)
+            result = matchup_store.get_what_if().what_if(edits, current_year=season_store.live_season())
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        # This is a placeholder - full implementation would require more complex logic
-        # For now, return a message explaining the feature
+        result['scenario'] = data.get('scenario')
         return jsonify({
             'success': True,
-            'data': {
-                'message': 'What-If scenarios require complex playoff calculation logic. This feature is coming soon!',
-                'scenario': scenario
-            }
+            'data': result
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+# Sections /api/batch can serve: the AdvancedStats and Almanac endpoints, which need no arguments
+BATCH_SECTIONS = (
+    'rivalries', 'streaks', 'points-trends', 'consistency', 'blowouts', 'bad-beats',
+    'weekly-awards', 'lowest-scoring-weeks', 'clutch', 'team-dna', 'trophy-case',
+    'team-stats-all-time', 'historical-stats', 'scoring-titles', 'win-pct-by-year', 'all-time-wins'
+)
+
+
+def _batch_sections():
+    """{name: undecorated view} for every BATCH_SECTIONS endpoint, by its /api/<name> path"""
+    sections = {}
+    for rule in app.url_map.iter_rules():
+        name = rule.rule[len('/api/'):]
+        if rule.rule.startswith('/api/') and name in BATCH_SECTIONS and 'GET' in rule.methods:
+            sections[name] = app.view_functions[rule.endpoint].__wrapped__
+    return sections
+
+
+@app.route('/api/batch', methods=['GET'])
+def get_batch():
+    """
+    Several endpoints in one response: include=rivalries,streaks,... (names from
+    BATCH_SECTIONS, served with their default arguments). Every section is computed against
+    one pinned matchup/standings snapshot; data maps each name to that endpoint's own
+    {'success', 'data'} body, and the response is gzipped when the client accepts it.
+    If any section fails, the response has that section's status (the worst one), success
+    false and the failed names in 'failed'.
+    """
+    sections = _batch_sections()
+    names = list(dict.fromkeys(name.strip() for name in request.args.get('include', '').split(',') if name.strip()))
+    unknown = [name for name in names if name not in sections]
+    if not names or unknown:
+        return jsonify({
+            'success': False,
+            'error': f"Unknown sections: {', '.join(unknown)}" if unknown else 'include is required',
+            'sections': sorted(sections)
+        }), 400
+    
+    try:
+        with matchup_store.pinned(), standings_store.pinned():
+            # Section bodies are already-serialized JSON (shared with each route's cache entry)
+            results = [(name,) + response_cache.body('/api/' + name, sections[name]) for name in names]
+        data = b'"data":{' + b','.join(json.dumps(name).encode() + b':' + body for name, _, body in results) + b'}'
+        
+        failed = [name for name, status, _ in results if status != 200]
+        if failed:
+            body = b'{"success":false,"failed":' + json.dumps(failed).encode() + b',' + data + b'}'
+            return app.response_class(body, status=max(status for _, status, _ in results),
+                                      mimetype='application/json')
+        body = b'{"success":true,' + data + b'}'
+        
+        compress = 'gzip' in request.accept_encodings
+        response = app.response_class(gzip.compress(body, 6) if compress else body, mimetype='application/json')
+        response.set_etag(hashlib.sha1(body).hexdigest() + ('-gzip' if compress else ''))
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Accept-Encoding')
+        if compress:
+            response.headers['Content-Encoding'] = 'gzip'
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 if __name__ == '__main__':
     # Ensure data directory exists
     os.makedirs('data', exist_ok=True)
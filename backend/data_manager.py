@@ -8,6 +8,8 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from collections import defaultdict
 
+from sqlite_store import get_league_database, sqlite_enabled
+
 
 class DataManager:
     def __init__(self, data_dir='data'):
@@ -27,12 +29,27 @@ class DataManager:
         self.historical_file = os.path.join(self.data_dir, 'historical_data.json')
         self.current_data = {}
         self.historical_data = {}
+        # Increases whenever current_data / historical_data are (re)loaded or updated
+        self.generation = 0
         
         # Ensure data directory exists
         os.makedirs(self.data_dir, exist_ok=True)
+        
+        # With DATA_BACKEND=sqlite the documents and transactions live in data/league.db
+        self.database = get_league_database(self.data_dir) if sqlite_enabled() else None
     
     def load_data(self):
-        """Load data from JSON files"""
+        """Load data from the database (SQLite backend) or JSON files"""
+        if self.database is not None:
+            # Falls back to the JSON files the first time, before anything was saved to the database
+            current = self.database.load_document('league_data')
+            historical = self.database.load_document('historical_data')
+            if current is not None and historical is not None:
+                self.current_data = current
+                self.historical_data = historical
+                self.generation += 1
+                return
+        
         if os.path.exists(self.data_file):
             try:
                 with open(self.data_file, 'r') as f:
@@ -79,10 +96,17 @@ class DataManager:
                 'matchups': [],
                 'teams': {}
             }
+        self.generation += 1
     
     def save_data(self):
-        """Save data to JSON files"""
+        """Save data to the database (SQLite backend) or JSON files"""
         try:
+            if self.database is not None:
+                self.database.save_document('league_data', self.current_data)
+                self.database.save_document('historical_data', self.historical_data)
+                self.database.save_transactions(self.current_data.get('transactions', []))
+                return
+            
             with open(self.data_file, 'w') as f:
                 json.dump(self.current_data, f, indent=2)
             
@@ -123,6 +147,7 @@ class DataManager:
                     team_data['total_ties'] += team.get('ties', 0)
                     team_data['total_points'] += team.get('points_for', 0)
         
+        self.generation += 1
         self.save_data()
     
     def _add_matchup_to_history(self, matchup: Dict):
@@ -144,8 +169,26 @@ class DataManager:
         # Filter out any invalid entries (like header rows)
         return [s for s in standings if s.get('name') and s.get('name') != 'Rank' and isinstance(s.get('wins'), int)]
     
+    def _get_head_to_head_matrix(self):
+        """Get the shared HeadToHeadMatrix for matchups.csv, or None if there is no CSV data"""
+        csv_file = os.path.join(self.data_dir, 'matchups.csv')
+        if not os.path.exists(csv_file):
+            return None
+        try:
+            from data_store import get_matchup_store
+            matrix = get_matchup_store(csv_file).get_head_to_head()
+        except Exception as e:
+            print(f"Error building head-to-head matrix: {e}, falling back to JSON")
+            return None
+        return matrix if len(matrix.table) else None
+    
     def get_head_to_head(self, team1: str, team2: str) -> Dict:
         """Get head-to-head record between two teams"""
+        # Answer from the precomputed matrix when the CSV is available (faster and more complete)
+        matrix = self._get_head_to_head_matrix()
+        if matrix is not None:
+            return matrix.record(team1, team2)
+        
         # Import team mapper
         try:
             from team_mapper import normalize_team_name
@@ -158,12 +201,8 @@ class DataManager:
         team1_normalized = normalize_team_name(team1)
         team2_normalized = normalize_team_name(team2)
         
-        # Load matchups from CSV first (faster and more complete)
-        matchups = self.get_matchups()
-        
         # Fallback to historical_data if CSV not available
-        if not matchups:
-            matchups = self.historical_data.get('matchups', [])
+        matchups = self.historical_data.get('matchups', [])
         
         team1_wins = 0
         team2_wins = 0
@@ -212,6 +251,10 @@ class DataManager:
             standings = self.get_standings()
             teams = [t.get('name') for t in standings if t.get('name')]
         
+        matrix = self._get_head_to_head_matrix()
+        if matrix is not None:
+            return matrix.all_records(teams)
+        
         h2h_matrix = {}
         
         for i, team1 in enumerate(teams):
@@ -293,12 +336,12 @@ class DataManager:
             def normalize_matchup(m):
                 return m
         
-        # Try to load from CSV first (faster)
+        # Try to load from CSV first (faster, shared in-memory copy)
         csv_file = os.path.join(self.data_dir, 'matchups.csv')
         if os.path.exists(csv_file):
             try:
-                from historical_scraper import load_from_csv
-                matchups = load_from_csv(csv_file)
+                from data_store import get_matchup_store
+                matchups = get_matchup_store(csv_file).get_matchups()
                 
                 # Normalize team names in all matchups
                 matchups = [normalize_matchup(m) for m in matchups]
@@ -328,6 +371,8 @@ class DataManager:
     
     def get_transactions(self, limit: int = 50) -> List[Dict]:
         """Get recent transactions"""
+        if self.database is not None:
+            return self.database.get_transactions(limit=limit)
         transactions = self.current_data.get('transactions', [])
         return transactions[:limit]
     
@@ -0,0 +1,536 @@
+"""
+Data Store
+Process-wide in-memory caches for the league CSV files (matchups and standings).
+Each store parses its file once and only reloads it when the file changes on disk
+(mtime/size) or after an explicit invalidate() (e.g. from /api/refresh). Rows appended
+to matchups.csv are applied incrementally. pinned() holds a store on one load for a block
+of reads that must agree with each other (e.g. /api/batch).
+
+With the SQLite backend on (DATA_BACKEND=sqlite, see sqlite_store) the stores read the
+same rows from data/league.db instead, and use its change counters in place of the file
+signatures.
+"""
+import csv
+import io
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from analytics_engine import AnalyticsEngine
+from head_to_head import HeadToHeadMatrix
+from historical_scraper import load_from_csv, parse_matchups_csv
+from matchup_table import MatchupTable
+from season_partitions import live_season
+from sqlite_store import get_league_database, sqlite_enabled
+from standings_scraper import load_standings_from_csv
+from team_mapper import normalize_team_name
+from what_if import WhatIfEngine
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class IncrementalMismatch(AssertionError):
+    """An incremental update differed from a full recompute (verification mode only)"""
+
+    def __init__(self, mismatches: List[str]):
+        super().__init__(f"Incremental update differed from full recompute: {', '.join(mismatches)}")
+        self.mismatches = mismatches
+
+
+class MatchupStore:
+    """
+    Shared, lazily reloaded view of matchups.csv.
+
+    get_matchups() returns the same list-of-dicts format as historical_scraper.load_from_csv,
+    so it can be passed straight to the fun_stats functions. The list is shared between
+    requests and must be treated as read-only.
+
+    get_table() returns the same data as a columnar MatchupTable (team names interned),
+    get_head_to_head() the all-pairs HeadToHeadMatrix over it, get_analytics() an
+    AnalyticsEngine fed with every matchup and get_what_if() a WhatIfEngine over the
+    table; all are built once per generation.
+
+    When the file only grew by appended rows (the importers append new games and only
+    rewrite the file when an existing row changed),
+    just the new rows are parsed and the table, head-to-head matrix and analytics that
+    are already built are updated with them instead of being rebuilt. With verification
+    on (verify=True or MATCHUP_STORE_VERIFY=1) every incremental update is checked
+    against a full recompute; if they differ the recomputed data is kept and the read
+    that picked up the update raises IncrementalMismatch.
+
+    `generation` increases every time the data changes, so other caches can key on it.
+
+    With a LeagueDatabase the rows come from its matchups table; rows it only appended
+    since the last load are applied incrementally the same way.
+    """
+
+    # Bytes from the end of the last load that must be unchanged for an append to be trusted
+    TAIL_BYTES = 4096
+
+    def __init__(self, csv_file: str, verify: Optional[bool] = None, database=None):
+        self.csv_file = csv_file
+        self.database = database
+        self.generation = 0
+        if verify is None:
+            verify = os.environ.get('MATCHUP_STORE_VERIFY', '') not in ('', '0')
+        self.verify = verify
+        self._lock = threading.RLock()
+        self._matchups: List[Dict] = []
+        self._table: Optional[MatchupTable] = None
+        self._head_to_head: Optional[HeadToHeadMatrix] = None
+        self._analytics: Optional[AnalyticsEngine] = None
+        self._what_if: Optional[WhatIfEngine] = None
+        self._signature = None
+        self._loaded = False
+        self._fieldnames: Optional[List[str]] = None
+        self._size = 0
+        self._tail = b''
+        self._inode = None
+        self._last_id = 0
+        self._pinned = threading.local()
+
+    def get_matchups(self) -> List[Dict]:
+        """Get all matchups, reloading the CSV only if it changed since the last load"""
+        self._refresh_if_changed()
+        return self._matchups
+
+    def get_table(self) -> MatchupTable:
+        """Get all matchups as a columnar MatchupTable"""
+        self._refresh_if_changed()
+        with self._lock:
+            if self._table is None:
+                self._table = MatchupTable.from_matchups(self._matchups)
+            return self._table
+
+    def get_head_to_head(self) -> HeadToHeadMatrix:
+        """Get the all-pairs head-to-head matrix for the current data"""
+        table = self.get_table()
+        with self._lock:
+            if self._head_to_head is None or self._head_to_head.table is not table:
+                self._head_to_head = HeadToHeadMatrix(table)
+            return self._head_to_head
+
+    def get_analytics(self) -> AnalyticsEngine:
+        """Get the fun_stats analytics for the current data (one pass over the matchups)"""
+        self._refresh_if_changed()
+        with self._lock:
+            if self._analytics is None:
+                self._analytics = self._build_analytics(self._matchups)
+            return self._analytics
+
+    def get_what_if(self) -> WhatIfEngine:
+        """Get the what-if engine for the current data"""
+        head_to_head = self.get_head_to_head()
+        with self._lock:
+            if self._what_if is None or self._what_if.table is not head_to_head.table:
+                self._what_if = WhatIfEngine(head_to_head.table, head_to_head)
+            return self._what_if
+
+    def get_week_matchups(self, year: int, week: int) -> List[Dict]:
+        """One week's matchups (an indexed query with the SQLite backend)"""
+        if self.database is not None:
+            return self.database.week_matchups(year, week)
+        return [m for m in self.get_matchups() if m['year'] == year and m['week'] == week]
+
+    def get_team_game_log(self, team_name: str) -> List[Dict]:
+        """Every matchup a team played under any of its names, chronologically (indexed with SQLite)"""
+        if self.database is not None:
+            return self.database.team_game_log(team_name)
+        team = normalize_team_name(team_name)
+        games = [m for m in self.get_matchups()
+                 if team and team in (normalize_team_name(m['team1_name']), normalize_team_name(m['team2_name']))]
+        return sorted(games, key=lambda m: (m['year'], m['week']))
+
+    def get_generation(self) -> int:
+        """Get the current data generation (checks the file for changes first)"""
+        self._refresh_if_changed()
+        return self.generation
+
+    def invalidate(self):
+        """Re-examine the file on the next access (appended rows are still applied incrementally)"""
+        with self._lock:
+            self._signature = None
+
+    @contextmanager
+    def pinned(self):
+        """
+        Serve this thread's reads from the current load for the duration of the block: the
+        files are checked once on entry and other threads cannot reload until it exits.
+        """
+        with self._lock:
+            self._refresh_if_changed()
+            self._pinned.depth = getattr(self._pinned, 'depth', 0) + 1
+            try:
+                yield self
+            finally:
+                self._pinned.depth -= 1
+
+    @staticmethod
+    def _build_analytics(matchups: List[Dict]) -> AnalyticsEngine:
+        # The latest season is the live one (current streaks; trophies and trends stop before it)
+        analytics = AnalyticsEngine(current_year=live_season(m.get('year', 0) for m in matchups))
+        analytics.add_matchups(matchups)
+        return analytics
+
+    def seed(self, matchups: List[Dict], table: MatchupTable, raw: bytes, stat: os.stat_result):
+        """
+        Adopt matchups compiled elsewhere (see snapshot) instead of parsing the file.
+
+        Args:
+            matchups: load_from_csv-style rows of the file
+            table: MatchupTable over the same rows
+            raw: The file's bytes the rows were checked against
+            stat: os.fstat of the file when raw was read
+        """
+        with self._lock:
+            self._set_matchups(matchups)
+            self._table = table
+            self._adopt_file(raw, stat)
+            self._loaded = True
+            self.generation += 1
+
+    def _source_signature(self):
+        if self.database is not None:
+            return self.database.matchups_signature()
+        return _file_signature(self.csv_file)
+
+    def _load_rows(self) -> List[Dict]:
+        """Every matchup, straight from the source (no caching)"""
+        if self.database is not None:
+            return self.database.load_matchups()
+        return load_from_csv(self.csv_file)
+
+    def _refresh_if_changed(self):
+        if getattr(self._pinned, 'depth', 0):
+            return
+        signature = self._source_signature()
+        if self._loaded and signature == self._signature:
+            return
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            signature = self._source_signature()
+            if self._loaded and signature == self._signature:
+                return
+
+            incremental = False
+            if self.database is not None:
+                # Same number of rewrites as the last load: the database only had rows appended
+                if self._loaded and self._signature[1] == signature[1]:
+                    new_matchups, self._last_id = self.database.load_matchups_after(self._last_id)
+                    self._apply_appended(new_matchups, b'', signature)
+                    incremental = True
+                else:
+                    matchups, self._last_id = self.database.load_matchups_after(0)
+                    self._set_matchups(matchups)
+                    self._signature = signature
+            else:
+                appended = self._read_appended() if self._loaded and signature else None
+                if appended is not None:
+                    self._apply_appended(*appended)
+                    incremental = True
+                else:
+                    self._load_full()
+            self._loaded = True
+            self.generation += 1
+
+            # After the generation bump, so a mismatch leaves the recomputed data in place
+            if incremental and self.verify:
+                mismatches = self.verify_incremental()
+                if mismatches:
+                    raise IncrementalMismatch(mismatches)
+
+    def _set_matchups(self, matchups: List[Dict]):
+        """Replace the loaded matchups, dropping everything built from the previous ones"""
+        self._matchups = matchups
+        self._table = None
+        self._head_to_head = None
+        self._analytics = None
+        self._what_if = None
+
+    def _load_full(self):
+        try:
+            with open(self.csv_file, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                raw = f.read(stat.st_size)
+        except OSError:
+            stat, raw = None, b''
+
+        self._set_matchups(parse_matchups_csv(io.StringIO(raw.decode('utf-8'), newline=None)))
+        self._adopt_file(raw, stat)
+
+    def _adopt_file(self, raw: bytes, stat: Optional[os.stat_result]):
+        """Remember the file content the matchups were loaded from, to detect appends to it later"""
+        header = raw.split(b'\n', 1)[0].decode('utf-8')
+        self._fieldnames = next(csv.reader(io.StringIO(header, newline=None)), None)
+        self._size = len(raw)
+        self._tail = raw[-self.TAIL_BYTES:]
+        self._inode = stat.st_ino if stat else None
+        self._signature = (stat.st_mtime_ns, len(raw)) if stat else None
+
+    def _read_appended(self):
+        """
+        If the file is the previously loaded content plus whole appended rows, return
+        (new matchups, raw bytes appended, signature); otherwise None.
+        """
+        if not self._fieldnames or not self._tail.endswith(b'\n'):
+            return None
+        try:
+            with open(self.csv_file, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                # A rewritten (replaced) file or one that did not grow is reloaded in full
+                if stat.st_ino != self._inode or stat.st_size <= self._size:
+                    return None
+                f.seek(self._size - len(self._tail))
+                if f.read(len(self._tail)) != self._tail:
+                    return None
+                added = f.read(stat.st_size - self._size)
+        except OSError:
+            return None
+
+        if not added.endswith(b'\n'):
+            # A write is still in progress; pick it up on the next access
+            return None
+        new_matchups = parse_matchups_csv(io.StringIO(added.decode('utf-8'), newline=None),
+                                          fieldnames=self._fieldnames)
+        return new_matchups, added, (stat.st_mtime_ns, stat.st_size)
+
+    def _apply_appended(self, new_matchups: List[Dict], added: bytes, signature: Tuple[int, int]):
+        """Update the loaded data and every derived structure with appended rows only"""
+        self._matchups = self._matchups + new_matchups
+        if self._table is not None:
+            table = self._table.extended(new_matchups)
+            if self._head_to_head is not None and self._head_to_head.table is self._table:
+                self._head_to_head = self._head_to_head.extended(table)
+            else:
+                self._head_to_head = None
+            self._table = table
+        if self._analytics is not None:
+            latest = live_season(m.get('year', 0) for m in new_matchups)
+            current_year = self._analytics.current_year
+            if latest is not None and (current_year is None or latest > current_year):
+                # A new season started: the previous one is now complete, so rebuild on next use
+                self._analytics = None
+            else:
+                self._analytics.add_matchups(new_matchups)
+
+        self._size += len(added)
+        self._tail = (self._tail + added)[-self.TAIL_BYTES:]
+        self._signature = signature
+
+    def verify_incremental(self) -> List[str]:
+        """
+        Compare the incrementally maintained data against a full recompute from the file.
+        Any structure that differs is replaced with the recomputed one.
+        Returns the names of the structures that differed.
+        """
+        with self._lock:
+            mismatches = []
+            full_matchups = self._load_rows()
+            if full_matchups != self._matchups:
+                mismatches.append('matchups')
+                self._matchups = full_matchups
+                self._table = self._head_to_head = self._analytics = self._what_if = None
+
+            if self._table is not None:
+                full_table = MatchupTable.from_matchups(self._matchups)
+                if not _tables_equal(self._table, full_table):
+                    mismatches.append('table')
+                    self._table = full_table
+                    self._head_to_head = None
+                if self._head_to_head is not None:
+                    full_h2h = HeadToHeadMatrix(self._table)
+                    if not _head_to_head_equal(self._head_to_head, full_h2h):
+                        mismatches.append('head_to_head')
+                        self._head_to_head = full_h2h
+
+            if self._analytics is not None:
+                full_analytics = self._build_analytics(self._matchups)
+                for name in full_analytics.accumulators:
+                    if self._analytics.result(name) != full_analytics.result(name):
+                        mismatches.append(f'analytics.{name}')
+                if any(m.startswith('analytics.') for m in mismatches):
+                    self._analytics = full_analytics
+            return mismatches
+
+
+def _tables_equal(a: MatchupTable, b: MatchupTable) -> bool:
+    columns = ('year', 'week', 'week_type', 'team1', 'team2', 'score1', 'score2', 'winner')
+    # Compare scores bitwise (array_equal would treat -0.0 and 0.0 as equal)
+    return (all(getattr(a, c).tobytes() == getattr(b, c).tobytes() for c in columns)
+            and a.teams.names == b.teams.names
+            and a.week_types == b.week_types
+            and a.scraped_at == b.scraped_at)
+
+
+def _head_to_head_equal(a: HeadToHeadMatrix, b: HeadToHeadMatrix) -> bool:
+    return (all(getattr(a, name).tobytes() == getattr(b, name).tobytes() for name in ('wins', 'ties', 'points'))
+            and a.games.keys() == b.games.keys()
+            and all(np.array_equal(a.games[pair], b.games[pair]) for pair in a.games))
+
+
+class StandingsStore:
+    """
+    Shared, lazily reloaded index over standings.csv and standings_final.csv.
+
+    Rows are loaded once with load_standings_from_csv, team names are normalized to their
+    canonical form, and the rows are indexed by (standings_type, year) and by
+    (standings_type, canonical team). Lookups return shared lists in file order, which
+    must be treated as read-only. With a LeagueDatabase the rows come from its standings table.
+    """
+
+    STANDINGS_TYPES = ('regular', 'final')
+
+    def __init__(self, csv_file: str, database=None):
+        # csv_file is the base path (standings.csv); final standings live in standings_final.csv
+        self.csv_file = csv_file
+        self.database = database
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._files = {
+            'regular': csv_file,
+            'final': csv_file.replace('.csv', '_final.csv')
+        }
+        self._rows: Dict[str, List[Dict]] = {}
+        self._by_year: Dict[Tuple[str, int], List[Dict]] = {}
+        self._by_team: Dict[Tuple[str, str], List[Dict]] = {}
+        self._signatures = None
+        self._loaded = False
+        self._pinned = threading.local()
+
+    def get_standings(self, standings_type: str = 'regular', year: Optional[int] = None) -> List[Dict]:
+        """Get standings rows (normalized team names), optionally for a single year"""
+        self._refresh_if_changed()
+        if year is None:
+            return self._rows.get(standings_type, [])
+        return self._by_year.get((standings_type, year), [])
+
+    def get_team_standings(self, team_name: str, standings_type: str = 'regular') -> List[Dict]:
+        """Get every season's standings row for a team (any historical name works)"""
+        self._refresh_if_changed()
+        return self._by_team.get((standings_type, normalize_team_name(team_name)), [])
+
+    def get_years(self, standings_type: str = 'regular') -> List[int]:
+        """Get the sorted list of years that have standings"""
+        self._refresh_if_changed()
+        return sorted({year for (s_type, year) in self._by_year if s_type == standings_type})
+
+    def get_weeks_played(self) -> Dict[int, int]:
+        """Get {year: regular season games played} - how many weeks each season's standings cover"""
+        weeks_played = {}
+        for row in self.get_standings('regular'):
+            games = row.get('wins', 0) + row.get('losses', 0) + row.get('ties', 0)
+            weeks_played[row['year']] = max(weeks_played.get(row['year'], 0), games)
+        return weeks_played
+
+    def get_generation(self) -> int:
+        """Get the current data generation (checks the files for changes first)"""
+        self._refresh_if_changed()
+        return self.generation
+
+    def invalidate(self):
+        """Force a reload on the next access"""
+        with self._lock:
+            self._loaded = False
+
+    @contextmanager
+    def pinned(self):
+        """
+        Serve this thread's reads from the current load for the duration of the block: the
+        files are checked once on entry and other threads cannot reload until it exits.
+        """
+        with self._lock:
+            self._refresh_if_changed()
+            self._pinned.depth = getattr(self._pinned, 'depth', 0) + 1
+            try:
+                yield self
+            finally:
+                self._pinned.depth -= 1
+
+    def _current_signatures(self):
+        if self.database is not None:
+            return self.database.standings_signature()
+        return tuple(_file_signature(self._files[s_type]) for s_type in self.STANDINGS_TYPES)
+
+    def _refresh_if_changed(self):
+        if getattr(self._pinned, 'depth', 0):
+            return
+        signatures = self._current_signatures()
+        if self._loaded and signatures == self._signatures:
+            return
+
+        with self._lock:
+            signatures = self._current_signatures()
+            if self._loaded and signatures == self._signatures:
+                return
+
+            rows_by_type = {}
+            for s_type in self.STANDINGS_TYPES:
+                if self.database is not None:
+                    rows_by_type[s_type] = self.database.load_standings(s_type)
+                else:
+                    # load_standings_from_csv derives the _final file from the base path itself
+                    rows_by_type[s_type] = load_standings_from_csv(self.csv_file, s_type)
+            self._index(rows_by_type, signatures)
+
+    def seed(self, rows_by_type: Dict[str, List[Dict]], signatures):
+        """
+        Adopt standings rows compiled elsewhere (see snapshot) instead of parsing the files.
+
+        Args:
+            rows_by_type: {standings_type: rows} as load_standings_from_csv returns them
+            signatures: The files' signatures (_file_signature) the rows were checked against
+        """
+        with self._lock:
+            self._index(rows_by_type, signatures)
+
+    def _index(self, rows_by_type: Dict[str, List[Dict]], signatures):
+        by_year = {}
+        by_team = {}
+        for s_type in self.STANDINGS_TYPES:
+            for row in rows_by_type.setdefault(s_type, []):
+                row['team_name'] = normalize_team_name(row['team_name'])
+                by_year.setdefault((s_type, row['year']), []).append(row)
+                by_team.setdefault((s_type, row['team_name']), []).append(row)
+
+        self._rows = rows_by_type
+        self._by_year = by_year
+        self._by_team = by_team
+        self._signatures = signatures
+        self._loaded = True
+        self.generation += 1
+
+
+_stores: Dict[Tuple[str, str], object] = {}
+_stores_lock = threading.Lock()
+
+
+def _get_store(store_class, csv_file: str):
+    key = (store_class.__name__, os.path.abspath(csv_file))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            database = get_league_database(os.path.dirname(key[1])) if sqlite_enabled() else None
+            store = store_class(key[1], database=database)
+            _stores[key] = store
+        return store
+
+
+def get_matchup_store(csv_file: str) -> MatchupStore:
+    """Get the process-wide MatchupStore for a matchups CSV file"""
+    return _get_store(MatchupStore, csv_file)
+
+
+def get_standings_store(csv_file: str) -> StandingsStore:
+    """Get the process-wide StandingsStore for a standings CSV file (base standings.csv path)"""
+    return _get_store(StandingsStore, csv_file)
@@ -0,0 +1,367 @@
+"""
+Elo Ratings
+Margin-of-victory Elo power ratings for every canonical franchise over the whole league
+history. Games are processed in (year, week) order; ratings and the rating history are
+kept in compact arrays, and weeks appended to matchups.csv are applied incrementally
+instead of replaying every season.
+"""
+import math
+import os
+import threading
+from collections import namedtuple
+from itertools import product
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from matchup_table import MatchupTable
+
+# k: base K factor
+# home_advantage: rating points added to team1 (the team listed first) in the expectation
+# playoff_weight: K multiplier for playoff games
+# season_regression: share of each rating's distance from the mean removed between seasons
+# mov_scale: fantasy points per "unit" of margin in the margin-of-victory multiplier
+EloParams = namedtuple('EloParams', ['k', 'home_advantage', 'playoff_weight', 'season_regression', 'mov_scale'],
+                       defaults=(24.0, 0.0, 1.5, 0.25, 10.0))
+
+INITIAL_RATING = 1500.0
+
+# Default grid for fit_elo
+DEFAULT_GRID = {
+    'k': [12.0, 18.0, 24.0, 32.0, 40.0],
+    'home_advantage': [0.0, 15.0],
+    'playoff_weight': [1.0, 1.5, 2.0],
+    'season_regression': [0.0, 0.25, 0.5],
+    'mov_scale': [5.0, 10.0, 20.0]
+}
+
+
+def win_probability(rating1: float, rating2: float, home_advantage: float = 0.0) -> float:
+    """Pregame probability that team1 beats team2"""
+    return 1.0 / (1.0 + 10 ** (-(rating1 + home_advantage - rating2) / 400.0))
+
+
+def _mov_multiplier(margin: float, winner_diff: float, mov_scale: float) -> float:
+    """Margin of victory multiplier, damped when the favourite wins (less autocorrelation)"""
+    return math.log(abs(margin) / mov_scale + 1.0) * (2.2 / (winner_diff * 0.001 + 2.2))
+
+
+def _run(games: Dict[str, np.ndarray], params: EloParams, ratings: np.ndarray, last_year: int,
+         history: Optional[List] = None) -> int:
+    """
+    Apply games (chronological arrays: year, team1, team2, score1, score2, playoff) to
+    ratings in place. Appends (team1 rating after, team2 rating after, team1 pregame
+    win probability) per game to history if given. Returns the last year seen.
+    """
+    years = games['year'].tolist()
+    team1, team2 = games['team1'].tolist(), games['team2'].tolist()
+    score1, score2 = games['score1'].tolist(), games['score2'].tolist()
+    playoff = games['playoff'].tolist()
+    k, home, playoff_weight, regression, mov_scale = params
+
+    for year, t1, t2, s1, s2, is_playoff in zip(years, team1, team2, score1, score2, playoff):
+        if year != last_year:
+            if last_year is not None and regression:
+                rated = ratings != INITIAL_RATING
+                ratings[rated] = INITIAL_RATING + (1.0 - regression) * (ratings[rated] - INITIAL_RATING)
+            last_year = year
+
+        r1, r2 = ratings[t1], ratings[t2]
+        expected = win_probability(r1, r2, home)
+        actual = 1.0 if s1 > s2 else 0.0 if s2 > s1 else 0.5
+        if actual == 0.5:
+            multiplier = 1.0
+        else:
+            winner_diff = (r1 + home - r2) if actual == 1.0 else (r2 - r1 - home)
+            multiplier = _mov_multiplier(s1 - s2, winner_diff, mov_scale)
+        change = k * (playoff_weight if is_playoff else 1.0) * multiplier * (actual - expected)
+        ratings[t1] = r1 + change
+        ratings[t2] = r2 - change
+        if history is not None:
+            history.append((ratings[t1], ratings[t2], expected))
+    return last_year
+
+
+class EloEngine:
+    """
+    Ratings for one set of EloParams, kept current with update().
+
+    Arrays (one entry per processed game, chronological): game_rows (table row),
+    game_years, game_weeks, game_team1/2, rating1/2 (ratings after the game) and
+    expected (team1's pregame win probability).
+    """
+
+    COLUMNS = ('game_rows', 'game_years', 'game_weeks', 'game_team1', 'game_team2', 'rating1', 'rating2', 'expected')
+
+    def __init__(self, params: Optional[EloParams] = None):
+        self.params = params or EloParams()
+        self.table: Optional[MatchupTable] = None
+        self.weeks_played: Dict[int, int] = {}
+        self.ratings = np.zeros(0)
+        self._last_year = None
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.ratings = np.full(0, INITIAL_RATING)
+        self._last_year = None
+        self.n_games = 0
+        for name in self.COLUMNS:
+            dtype = np.float64 if name in ('rating1', 'rating2', 'expected') else np.int32
+            setattr(self, '_' + name, np.zeros(64, dtype=dtype))
+
+    def __getattr__(self, name):
+        # game_rows, rating1, ... are views of the filled part of the backing arrays
+        if name in EloEngine.COLUMNS:
+            return self.__dict__['_' + name][:self.n_games]
+        raise AttributeError(name)
+
+    # ------------------------------------------------------------------
+    # Updating
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def played_rows(table: MatchupTable, weeks_played: Optional[Dict[int, int]] = None) -> np.ndarray:
+        """
+        Rows of games that have been played, in chronological order. A season's weeks past
+        weeks_played[year] and 0-0 placeholder games are not played yet.
+        """
+        played = (table.team1 >= 0) & (table.team2 >= 0) & (table.team1 != table.team2)
+        played &= (table.score1 != 0) | (table.score2 != 0)
+        for year, weeks in (weeks_played or {}).items():
+            played &= ~((table.year == year) & (table.week > weeks))
+        rows = np.flatnonzero(played)
+        return rows[np.lexsort((rows, table.week[rows], table.year[rows]))]
+
+    @staticmethod
+    def game_arrays(table: MatchupTable, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        playoff_codes = [code for code, wt in enumerate(table.week_types) if wt == 'playoff']
+        return {
+            'year': table.year[rows],
+            'team1': table.team1[rows],
+            'team2': table.team2[rows],
+            'score1': table.score1[rows],
+            'score2': table.score2[rows],
+            'playoff': np.isin(table.week_type[rows], playoff_codes)
+        }
+
+    def _is_prefix(self, table: MatchupTable, rows: np.ndarray) -> bool:
+        """Whether every processed game is unchanged and comes first in the new order"""
+        old = self.table
+        if old is None or len(table) < len(old) or len(rows) < self.n_games:
+            return False
+        if not np.array_equal(rows[:self.n_games], self.game_rows):
+            return False
+        n = len(old)
+        return all(np.array_equal(getattr(table, c)[:n], getattr(old, c)[:n])
+                   for c in ('year', 'week', 'week_type', 'team1', 'team2', 'score1', 'score2'))
+
+    def update(self, table: MatchupTable, weeks_played: Optional[Dict[int, int]] = None) -> 'EloEngine':
+        """
+        Bring the ratings up to date with the table. Newly played games that come after
+        every processed one (the usual appended week) are applied on top of the current
+        ratings; anything else (edited or back-dated games) replays the history.
+        """
+        with self._lock:
+            if table is self.table and (weeks_played or {}) == self.weeks_played:
+                return self
+            rows = self.played_rows(table, weeks_played)
+            if not self._is_prefix(table, rows):
+                self._reset()
+            new_rows = rows[self.n_games:]
+
+            if len(self.ratings) < len(table.teams):
+                grown = np.full(len(table.teams), INITIAL_RATING)
+                grown[:len(self.ratings)] = self.ratings
+                self.ratings = grown
+
+            history = []
+            self._last_year = _run(self.game_arrays(table, new_rows), self.params, self.ratings,
+                                   self._last_year, history)
+            self._append(table, new_rows, history)
+            self.table = table
+            self.weeks_played = dict(weeks_played or {})
+            return self
+
+    def _append(self, table: MatchupTable, rows: np.ndarray, history: List):
+        n_new = len(rows)
+        needed = self.n_games + n_new
+        if needed > len(self._game_rows):
+            capacity = max(needed, 2 * len(self._game_rows))
+            for name in self.COLUMNS:
+                old = self.__dict__['_' + name]
+                grown = np.zeros(capacity, dtype=old.dtype)
+                grown[:self.n_games] = old[:self.n_games]
+                setattr(self, '_' + name, grown)
+
+        end = needed
+        start = self.n_games
+        self._game_rows[start:end] = rows
+        self._game_years[start:end] = table.year[rows]
+        self._game_weeks[start:end] = table.week[rows]
+        self._game_team1[start:end] = table.team1[rows]
+        self._game_team2[start:end] = table.team2[rows]
+        if n_new:
+            rating1, rating2, expected = zip(*history)
+            self._rating1[start:end] = rating1
+            self._rating2[start:end] = rating2
+            self._expected[start:end] = expected
+        self.n_games = needed
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def current_ratings(self) -> List[Dict]:
+        """Every rated franchise, best first, with its change over its last week"""
+        with self._lock:
+            names = self.table.teams.names if self.table is not None else []
+            results = []
+            for team_id, name in enumerate(names):
+                trajectory = self._trajectory(team_id)
+                if not len(trajectory):
+                    continue
+                previous = trajectory[-2] if len(trajectory) > 1 else INITIAL_RATING
+                results.append({
+                    'team': name,
+                    'rating': round(float(self.ratings[team_id]), 1),
+                    'games': len(trajectory),
+                    'last_change': round(float(trajectory[-1] - previous), 1)
+                })
+            results.sort(key=lambda x: x['rating'], reverse=True)
+            for rank, row in enumerate(results, 1):
+                row['rank'] = rank
+            return results
+
+    def _trajectory(self, team_id: int) -> np.ndarray:
+        as1 = self.game_team1 == team_id
+        as2 = self.game_team2 == team_id
+        return np.where(as1, self.rating1, self.rating2)[as1 | as2]
+
+    def trajectory(self, team_name: str) -> List[Dict]:
+        """A franchise's rating after each of its games"""
+        with self._lock:
+            team_id = self.table.teams.get_id(team_name) if self.table is not None else -1
+            as1 = self.game_team1 == team_id
+            as2 = self.game_team2 == team_id
+            games = np.flatnonzero(as1 | as2)
+            ratings = np.where(as1, self.rating1, self.rating2)[games]
+            return [{
+                'year': int(year),
+                'week': int(week),
+                'rating': round(float(rating), 1)
+            } for year, week, rating in zip(self.game_years[games], self.game_weeks[games], ratings)]
+
+    def upcoming(self) -> List[Dict]:
+        """Pregame win probabilities for the next unplayed week of the latest season"""
+        with self._lock:
+            table = self.table
+            if table is None or not len(table):
+                return []
+            latest = int(table.year.max())
+            unplayed = np.setdiff1d(np.flatnonzero(table.year == latest), self.game_rows)
+            unplayed = unplayed[(table.team1[unplayed] >= 0) & (table.team2[unplayed] >= 0)]
+            if not len(unplayed):
+                return []
+            week = int(table.week[unplayed].min())
+            results = []
+            for row in unplayed[table.week[unplayed] == week].tolist():
+                t1, t2 = int(table.team1[row]), int(table.team2[row])
+                r1, r2 = float(self.ratings[t1]), float(self.ratings[t2])
+                probability = win_probability(r1, r2, self.params.home_advantage)
+                results.append({
+                    'year': latest,
+                    'week': week,
+                    'team1': table.team_name(t1),
+                    'team2': table.team_name(t2),
+                    'team1_rating': round(r1, 1),
+                    'team2_rating': round(r2, 1),
+                    'team1_win_prob': round(probability, 4),
+                    'team2_win_prob': round(1.0 - probability, 4)
+                })
+            return results
+
+
+# ----------------------------------------------------------------------
+# Shared engines
+# ----------------------------------------------------------------------
+
+# One engine per parameter set, so each stays incremental between requests
+MAX_ENGINES = 8
+_engines: Dict[EloParams, EloEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_elo_engine(params: Optional[EloParams] = None) -> EloEngine:
+    """Get the process-wide engine for a parameter set (call update() before reading it)"""
+    params = params or EloParams()
+    with _engines_lock:
+        engine = _engines.get(params)
+        if engine is None:
+            if len(_engines) >= MAX_ENGINES:
+                _engines.pop(next(k for k in _engines if k != EloParams()), None)
+            engine = _engines[params] = EloEngine(params)
+        return engine
+
+
+# ----------------------------------------------------------------------
+# Fitting
+# ----------------------------------------------------------------------
+
+def _score_params(args) -> Dict:
+    """Log loss and Brier score of one parameter set's pregame predictions (runs in workers too)"""
+    games, params, n_teams, first_scored_year = args
+    history = []
+    _run(games, params, np.full(n_teams, INITIAL_RATING), None, history)
+    expected = np.array([h[2] for h in history])
+    actual = np.where(games['score1'] > games['score2'], 1.0, np.where(games['score2'] > games['score1'], 0.0, 0.5))
+    scored = games['year'] >= first_scored_year
+    p = np.clip(expected[scored], 1e-9, 1 - 1e-9)
+    y = actual[scored]
+    return {
+        'params': params._asdict(),
+        'log_loss': float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))),
+        'brier': float(np.mean((p - y) ** 2)),
+        'games': int(scored.sum())
+    }
+
+
+def fit_elo(table: MatchupTable, weeks_played: Optional[Dict[int, int]] = None,
+            grid: Optional[Dict[str, List[float]]] = None, burn_in_seasons: int = 1,
+            processes: Optional[int] = None) -> Dict:
+    """
+    Grid-search EloParams by the log loss of the pregame win probabilities.
+
+    Args:
+        table: All matchups
+        weeks_played: As for EloEngine.update
+        grid: {param name: candidate values}; params left out keep their defaults
+        burn_in_seasons: Leading seasons played but not scored (ratings start flat)
+        processes: Score the candidates over this many worker processes (None = in-process;
+            capped at the CPU count)
+
+    Returns:
+        {'best': {...}, 'results': [...]} with results sorted by log loss
+    """
+    grid = grid if grid is not None else DEFAULT_GRID
+    rows = EloEngine.played_rows(table, weeks_played)
+    games = EloEngine.game_arrays(table, rows)
+    years = np.unique(games['year'])
+    first_scored_year = int(years[min(burn_in_seasons, len(years) - 1)]) if len(years) else 0
+
+    names = list(grid)
+    candidates = [EloParams()._replace(**dict(zip(names, values))) for values in product(*(grid[n] for n in names))]
+    work = [(games, params, len(table.teams), first_scored_year) for params in candidates]
+
+    if processes and processes > 1 and len(work) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(processes, len(work), os.cpu_count() or 1)) as pool:
+            results = list(pool.map(_score_params, work, chunksize=8))
+    else:
+        results = [_score_params(args) for args in work]
+
+    results.sort(key=lambda r: r['log_loss'])
+    return {
+        'best': results[0] if results else None,
+        'results': results
+    }
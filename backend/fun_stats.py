@@ -3,11 +3,23 @@ Fun Statistics Calculator for NFL Fantasy Dashboard
 Calculates rivalries, streaks, blowouts, bad beats, weekly awards, consistency, clutch performance, etc.
 """
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import os
 
 
+def _live_season(*row_lists: List[Dict]) -> Optional[int]:
+    """The season still being played: the latest year in the matchup/standings rows (None without rows)"""
+    from season_partitions import live_season
+    return live_season(row.get('year', 0) for rows in row_lists for row in rows)
+
+
+def _last_completed_season(*row_lists: List[Dict]) -> int:
+    """The season before the live one (0 without rows, when there is nothing to filter)"""
+    live = _live_season(*row_lists)
+    return live - 1 if live is not None else 0
+
+
 def calculate_rivalries(matchups: List[Dict], normalize_team_name) -> List[Dict]:
     """Calculate top rivalries based on games played, win differential, and recency"""
     rivalry_data = defaultdict(lambda: {
@@ -147,8 +159,11 @@ def generate_trash_talk(team1: str, team2: str, rivalry_data: Dict, normalize_te
     return trash_talk
 
 
-def calculate_streaks(matchups: List[Dict], standings: List[Dict], normalize_team_name) -> Dict:
-    """Calculate current and all-time streaks"""
+def calculate_streaks(matchups: List[Dict], standings: List[Dict], normalize_team_name,
+                      current_year: Optional[int] = None) -> Dict:
+    """Calculate current and all-time streaks (current ones within current_year, by default the live season)"""
+    if current_year is None:
+        current_year = _live_season(matchups)
     # Organize matchups by team and year/week
     team_games = defaultdict(lambda: defaultdict(list))
     
@@ -181,7 +196,7 @@ def calculate_streaks(matchups: List[Dict], standings: List[Dict], normalize_tea
             'tie': winner.lower() == 'tie'
         }
     
-    # Calculate current streaks (2025 season)
+    # Calculate current streaks (live season)
     current_streaks = []
     all_time_streaks = []
     
@@ -189,12 +204,12 @@ def calculate_streaks(matchups: List[Dict], standings: List[Dict], normalize_tea
         # Sort games chronologically
         sorted_games = sorted(games_dict.items(), key=lambda x: (x[0][0], x[0][1]))
         
-        # Current streak (2025 only)
-        current_2025_games = [(y, w, g) for (y, w), g in sorted_games if y == 2025]
-        if current_2025_games:
+        # Current streak (live season only)
+        current_games = [(y, w, g) for (y, w), g in sorted_games if y == current_year]
+        if current_games:
             current_streak = 0
             current_type = None
-            for year, week, game in reversed(current_2025_games):
+            for year, week, game in reversed(current_games):
                 if game['tie']:
                     break
                 if current_type is None:
@@ -622,28 +637,44 @@ def calculate_clutch_performance(matchups: List[Dict], normalize_team_name) -> L
     return clutch_scores
 
 
-def calculate_team_dna(matchups: List[Dict], standings: List[Dict], normalize_team_name) -> List[Dict]:
-    """Calculate team DNA/personality profiles based on performance patterns"""
+def calculate_team_dna(matchups: List[Dict], standings: List[Dict], normalize_team_name,
+                       final_standings: Optional[List[Dict]] = None,
+                       consistency: Optional[List[Dict]] = None,
+                       clutch: Optional[List[Dict]] = None,
+                       max_year: Optional[int] = None) -> List[Dict]:
+    """Calculate team DNA/personality profiles based on performance patterns
+    
+    final_standings can be passed in (e.g. from the shared StandingsStore); otherwise
+    standings_final.csv is loaded from the data directory. consistency and clutch can be
+    passed in precomputed (e.g. from the AnalyticsEngine) to skip rescanning the matchups.
+    Championships and playoff appearances only count seasons up to max_year (by default the
+    last completed one).
+    """
     # Get consistency data
-    consistency = calculate_consistency(matchups, normalize_team_name)
+    if consistency is None:
+        consistency = calculate_consistency(matchups, normalize_team_name)
     consistency_dict = {c['team']: c for c in consistency}
     
     # Get clutch data
-    clutch = calculate_clutch_performance(matchups, normalize_team_name)
+    if clutch is None:
+        clutch = calculate_clutch_performance(matchups, normalize_team_name)
     clutch_dict = {c['team']: c for c in clutch}
     
     # Get playoff/championship data
-    from standings_scraper import load_standings_from_csv
-    data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-    final_standings_file = os.path.join(data_dir, 'standings_final.csv')
-    final_standings = load_standings_from_csv(final_standings_file, 'final')
+    if final_standings is None:
+        from standings_scraper import load_standings_from_csv
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+        # load_standings_from_csv maps the base standings.csv path to standings_final.csv
+        final_standings = load_standings_from_csv(os.path.join(data_dir, 'standings.csv'), 'final')
+    if max_year is None:
+        max_year = _last_completed_season(matchups, standings, final_standings)
     
     team_championships = defaultdict(int)
     team_playoff_appearances = defaultdict(int)
     team_seasons = defaultdict(int)
     
     for standing in final_standings:
-        if standing.get('year', 0) > 2024:  # Exclude incomplete seasons
+        if standing.get('year', 0) > max_year:  # Exclude incomplete seasons
             continue
         team = normalize_team_name(standing.get('team_name', ''))
         place = standing.get('place', 0)
@@ -714,13 +745,24 @@ def calculate_team_dna(matchups: List[Dict], standings: List[Dict], normalize_te
     return team_dna
 
 
-def calculate_trophy_case(matchups: List[Dict], standings: List[Dict], normalize_team_name) -> Dict:
-    """Calculate trophy case achievements for each team"""
+def calculate_trophy_case(matchups: List[Dict], standings: List[Dict], normalize_team_name,
+                          final_standings: Optional[List[Dict]] = None,
+                          max_year: Optional[int] = None) -> Dict:
+    """Calculate trophy case achievements for each team
+    
+    standings are the regular season standings. final_standings can be passed in
+    (e.g. from the shared StandingsStore); otherwise standings_final.csv is loaded
+    from the data directory. Standings-based trophies only count seasons up to max_year
+    (by default the last completed one).
+    """
     # Load final standings for championships
     from standings_scraper import load_standings_from_csv
     data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-    final_standings_file = os.path.join(data_dir, 'standings_final.csv')
-    final_standings = load_standings_from_csv(final_standings_file, 'final')
+    if final_standings is None:
+        # load_standings_from_csv maps the base standings.csv path to standings_final.csv
+        final_standings = load_standings_from_csv(os.path.join(data_dir, 'standings.csv'), 'final')
+    if max_year is None:
+        max_year = _last_completed_season(matchups, standings, final_standings)
     
     # Organize achievements by team
     trophies = defaultdict(lambda: {
@@ -735,7 +777,7 @@ def calculate_trophy_case(matchups: List[Dict], standings: List[Dict], normalize
     
     # Championships, playoffs, spoons
     for standing in final_standings:
-        if standing.get('year', 0) > 2024:
+        if standing.get('year', 0) > max_year:
             continue
         team = normalize_team_name(standing.get('team_name', ''))
         year = standing.get('year', 0)
@@ -808,10 +850,12 @@ def calculate_trophy_case(matchups: List[Dict], standings: List[Dict], normalize
             trophies[team]['longest_win_streak'] = max_streak
     
     # Perfect seasons (need to check regular season records)
-    regular_standings_file = os.path.join(data_dir, 'standings.csv')
-    regular_standings = load_standings_from_csv(regular_standings_file, 'regular')
+    regular_standings = standings
+    if not regular_standings:
+        regular_standings_file = os.path.join(data_dir, 'standings.csv')
+        regular_standings = load_standings_from_csv(regular_standings_file, 'regular')
     for standing in regular_standings:
-        if standing.get('year', 0) > 2024:
+        if standing.get('year', 0) > max_year:
             continue
         team = normalize_team_name(standing.get('team_name', ''))
         year = standing.get('year', 0)
@@ -824,7 +868,7 @@ def calculate_trophy_case(matchups: List[Dict], standings: List[Dict], normalize
     from collections import defaultdict as dd
     season_points = dd(lambda: dd(float))
     for standing in regular_standings:
-        if standing.get('year', 0) > 2024:
+        if standing.get('year', 0) > max_year:
             continue
         team = normalize_team_name(standing.get('team_name', ''))
         year = standing.get('year', 0)
@@ -854,13 +898,15 @@ def calculate_trophy_case(matchups: List[Dict], standings: List[Dict], normalize
     return formatted_trophies
 
 
-def calculate_points_trends(matchups: List[Dict], normalize_team_name) -> Dict:
-    """Calculate points trends over time for each team"""
+def calculate_points_trends(matchups: List[Dict], normalize_team_name, max_year: Optional[int] = None) -> Dict:
+    """Calculate points trends over time for each team (seasons up to max_year, by default the last completed one)"""
+    if max_year is None:
+        max_year = _last_completed_season(matchups)
     team_yearly_scores = defaultdict(lambda: defaultdict(list))
     
     for matchup in matchups:
         year = matchup.get('year', 0)
-        if year > 2024:  # Only historical
+        if year > max_year:  # Only historical
             continue
         
         t1 = normalize_team_name(matchup.get('team1_name', ''))
@@ -904,17 +950,55 @@ def calculate_points_trends(matchups: List[Dict], normalize_team_name) -> Dict:
     return trends
 
 
-def calculate_playoff_probability_over_time(standings: List[Dict], current_year: int = 2025) -> Dict:
-    """Calculate how playoff probability changed week-by-week for current season"""
-    # This would require week-by-week standings data
-    # For now, return placeholder structure
-    return {
-        'message': 'Week-by-week playoff probability requires additional data collection'
-    }
+def calculate_playoff_probability_over_time(standings: List[Dict], matchups: List[Dict], years: Optional[List[int]] = None,
+                                            n_sims: Optional[int] = None, seed: int = 0, processes: Optional[int] = None,
+                                            cache_dir: Optional[str] = None) -> Dict[int, Dict]:
+    """
+    Calculate how playoff probability changed week-by-week, per team per season
+    
+    Each season is replayed from matchups.csv (playoff_calculator.playoff_odds_history). A
+    season is replayed up to the games played in its regular season standings, so a season
+    in progress stops at the last completed week. Histories are cached in cache_dir, keyed
+    by the data they were computed from; missing seasons are replayed together.
+    
+    Returns:
+        {year: {'year', 'weeks', 'simulations', 'teams': {team: {'playoff', 'championship', 'spoon'}}}}
+    """
+    from playoff_calculator import HISTORY_SIMS, history_cache_key, load_cached_history, playoff_odds_history, save_cached_history
+    
+    n_sims = n_sims or HISTORY_SIMS
+    if years is None:
+        years = sorted({m.get('year') for m in matchups if m.get('year')})
+    
+    weeks_played = {}
+    for year in years:
+        games = [s.get('wins', 0) + s.get('losses', 0) + s.get('ties', 0) for s in standings if s.get('year') == year]
+        weeks_played[year] = max(games) if games else 99
+    
+    histories = {}
+    keys = {}
+    for year in years:
+        keys[year] = history_cache_key(matchups, year, weeks_played[year], n_sims, seed)
+        cached = load_cached_history(cache_dir, year, keys[year]) if cache_dir else None
+        if cached is not None:
+            histories[year] = cached
+    
+    missing = {year: weeks_played[year] for year in years if year not in histories}
+    if missing:
+        replayed = playoff_odds_history(matchups, missing, n_sims=n_sims, seed=seed, processes=processes)
+        for year, history in replayed.items():
+            histories[year] = history
+            if cache_dir:
+                save_cached_history(cache_dir, year, keys[year], history)
+    
+    return {year: histories[year] for year in years if year in histories}
 
 
-def calculate_matchup_difficulty(standings: List[Dict], matchups: List[Dict], normalize_team_name, current_year: int = 2025) -> List[Dict]:
-    """Calculate strength of schedule / matchup difficulty for current season"""
+def calculate_matchup_difficulty(standings: List[Dict], matchups: List[Dict], normalize_team_name,
+                                 current_year: Optional[int] = None) -> List[Dict]:
+    """Calculate strength of schedule / matchup difficulty for current_year (by default the live season)"""
+    if current_year is None:
+        current_year = _live_season(matchups, standings)
     # Get current season standings to determine team strength
     current_standings = [s for s in standings if s.get('year') == current_year]
     team_strength = {}
@@ -955,14 +1039,16 @@ def calculate_matchup_difficulty(standings: List[Dict], matchups: List[Dict], no
     return difficulty_scores
 
 
-def calculate_lowest_scoring_weeks(matchups: List[Dict], normalize_team_name) -> List[Dict]:
-    """Calculate top 10 lowest scoring weeks by any team (2012-2024 only)"""
+def calculate_lowest_scoring_weeks(matchups: List[Dict], normalize_team_name, max_year: Optional[int] = None) -> List[Dict]:
+    """Calculate top 10 lowest scoring weeks by any team (seasons up to max_year, by default the last completed one)"""
+    if max_year is None:
+        max_year = _last_completed_season(matchups)
     lowest_scores = []
     
     for matchup in matchups:
         year = matchup.get('year', 0)
-        # Only include 2012-2024
-        if year < 2012 or year > 2024:
+        # Only include completed seasons
+        if year > max_year:
             continue
         
         t1 = normalize_team_name(matchup.get('team1_name', ''))
@@ -0,0 +1,142 @@
+"""
+Head-to-Head Matrix
+All-pairs head-to-head records built in one pass over a MatchupTable, so single-pair
+and all-pairs lookups are O(1) array reads instead of a scan over every matchup.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from matchup_table import MatchupTable, WINNER_TIE
+
+
+class HeadToHeadMatrix:
+    """
+    Dense T x T arrays indexed by team id (the table's TeamRegistry):
+        wins[i, j]    games team i won against team j
+        ties[i, j]    tied games between i and j (symmetric)
+        points[i, j]  total points team i scored against team j
+    losses[i, j] is wins[j, i].
+
+    games maps each (lower id, higher id) pair to the table row indices of their
+    games, in table (file) order.
+    """
+
+    def __init__(self, table: MatchupTable):
+        self.table = table
+        self.teams = table.teams
+
+        n_teams = len(self.teams)
+        self.wins = np.zeros((n_teams, n_teams), dtype=np.int32)
+        self.ties = np.zeros((n_teams, n_teams), dtype=np.int32)
+        self.points = np.zeros((n_teams, n_teams), dtype=np.float64)
+        self.games: Dict[Tuple[int, int], np.ndarray] = {}
+        self._add_rows(0)
+
+    def extended(self, table: MatchupTable) -> 'HeadToHeadMatrix':
+        """
+        New matrix for `table`, which must be this matrix's table with rows appended.
+        Only the new rows are scanned; the result is identical to HeadToHeadMatrix(table)
+        and this matrix is left unchanged.
+        """
+        matrix = HeadToHeadMatrix.__new__(HeadToHeadMatrix)
+        matrix.table = table
+        matrix.teams = table.teams
+
+        n_old = self.wins.shape[0]
+        n_teams = len(table.teams)
+        for name in ('wins', 'ties', 'points'):
+            old = getattr(self, name)
+            grown = np.zeros((n_teams, n_teams), dtype=old.dtype)
+            grown[:n_old, :n_old] = old
+            setattr(matrix, name, grown)
+        matrix.games = dict(self.games)
+        matrix._add_rows(len(self.table))
+        return matrix
+
+    def _add_rows(self, start: int):
+        """Accumulate table rows start..end into the arrays"""
+        table = self.table
+        team1, team2 = table.team1[start:], table.team2[start:]
+        valid = (team1 >= 0) & (team2 >= 0) & (team1 != team2)
+        rows = start + np.flatnonzero(valid)
+        t1, t2, win = table.team1[rows], table.team2[rows], table.winner[rows]
+
+        # Interleave both sides so every cell sums its points in row order
+        scorer = np.column_stack((t1, t2)).ravel()
+        opponent = np.column_stack((t2, t1)).ravel()
+        np.add.at(self.points, (scorer, opponent), np.column_stack((table.score1[rows], table.score2[rows])).ravel())
+
+        won1 = win == t1
+        won2 = win == t2
+        np.add.at(self.wins, (t1[won1], t2[won1]), 1)
+        np.add.at(self.wins, (t2[won2], t1[won2]), 1)
+
+        tied = win == WINNER_TIE
+        np.add.at(self.ties, (t1[tied], t2[tied]), 1)
+        np.add.at(self.ties, (t2[tied], t1[tied]), 1)
+
+        # Group row indices by unordered pair (stable sort keeps file order within a pair)
+        n = max(self.wins.shape[0], 1)
+        pair_key = np.minimum(t1, t2).astype(np.int64) * n + np.maximum(t1, t2)
+        order = np.argsort(pair_key, kind='stable')
+        unique_keys, starts = np.unique(pair_key[order], return_index=True)
+        for key, group in zip(unique_keys.tolist(), np.split(order, starts[1:])):
+            pair = divmod(key, n)
+            existing = self.games.get(pair)
+            self.games[pair] = rows[group] if existing is None else np.concatenate((existing, rows[group]))
+
+    @property
+    def losses(self) -> np.ndarray:
+        return self.wins.T
+
+    def games_between(self, team1_id: int, team2_id: int) -> np.ndarray:
+        """Table row indices of every game between two team ids"""
+        key = (min(team1_id, team2_id), max(team1_id, team2_id))
+        return self.games.get(key, np.empty(0, dtype=np.int64))
+
+    def record(self, team1: str, team2: str, include_games: bool = True) -> Dict:
+        """
+        Head-to-head record between two teams (any historical names), in the same format
+        DataManager.get_head_to_head has always returned.
+        """
+        # The shared registry may know teams added after this matrix was built
+        n_teams = self.wins.shape[0]
+        id1 = self.teams.get_id(team1)
+        id2 = self.teams.get_id(team2)
+        id1 = id1 if id1 < n_teams else -1
+        id2 = id2 if id2 < n_teams else -1
+
+        team1_wins = team2_wins = ties = 0
+        games: List[Dict] = []
+        if id1 >= 0 and id2 >= 0 and id1 != id2:
+            team1_wins = int(self.wins[id1, id2])
+            team2_wins = int(self.wins[id2, id1])
+            ties = int(self.ties[id1, id2])
+            if include_games:
+                games = self.table.to_dicts(self.games_between(id1, id2))
+
+        total_games = team1_wins + team2_wins + ties
+        team1_win_pct = (team1_wins / total_games * 100) if total_games > 0 else 0
+        team2_win_pct = (team2_wins / total_games * 100) if total_games > 0 else 0
+
+        return {
+            'team1': team1,
+            'team2': team2,
+            'team1_wins': team1_wins,
+            'team2_wins': team2_wins,
+            'ties': ties,
+            'total_games': total_games,
+            'team1_win_pct': round(team1_win_pct, 2),
+            'team2_win_pct': round(team2_win_pct, 2),
+            'games': games
+        }
+
+    def all_records(self, teams: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Records for every pair of `teams` (defaults to every team in the table)"""
+        teams = teams if teams is not None else list(self.teams.names)
+        h2h_matrix = {}
+        for i, team1 in enumerate(teams):
+            for team2 in teams[i+1:]:
+                h2h_matrix[f"{team1} vs {team2}"] = self.record(team1, team2)
+        return h2h_matrix
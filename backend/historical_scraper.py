@@ -3,35 +3,112 @@ Historical Data Scraper for NFL Fantasy League
 Scrapes historical matchup data from 2017-2025 using exact URL pattern
 """
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import csv
+import io
 import re
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from page_cache import PageCache, is_completed_season
+from rate_limiter import RateLimiter
+from team_mapper import normalize_team_name
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml is optional; pages are then parsed with html.parser only
+    etree = lxml_html = None
+
+if lxml_html is not None:
+    # Same matches as the class_=re.compile(..., re.I) lookups in parse_matchups_from_page
+    _MATCHUP_LIS = etree.XPath("//li[contains(translate(@class, 'MATCHUP', 'matchup'), 'matchup')]")
+    _TEAM_LINKS = etree.XPath(".//a[contains(translate(@class, 'TEAMNAME', 'teamname'), 'teamname')]")
+    _TEXT_NODES = etree.XPath('.//text()')
+# A score is a whole text node like 128.62 (the >128.62< pattern of the full parser)
+_SCORE_TEXT = re.compile(r'\d+\.\d+')
+
+
+def _matchup(year: int, week: int, team1_name: str, team1_score: float, team2_name: str, team2_score: float) -> Dict:
+    return {
+        'year': year,
+        'week': week,
+        'team1_name': team1_name,
+        'team1_score': team1_score,
+        'team2_name': team2_name,
+        'team2_score': team2_score,
+        'winner': team1_name if team1_score > team2_score else (team2_name if team2_score > team1_score else 'Tie'),
+        'scraped_at': datetime.now().isoformat()
+    }
+
+
+def _unique_matchups(matchups: List[Dict]) -> List[Dict]:
+    """Remove duplicates (same teams in same week)"""
+    seen = set()
+    unique_matchups = []
+    for m in matchups:
+        key = (m['team1_name'], m['team2_name'], m['week'])
+        if key not in seen:
+            seen.add(key)
+            unique_matchups.append(m)
+    return unique_matchups
 
 
 class HistoricalScraper:
-    def __init__(self, league_id: str):
+    def __init__(self, league_id: str, base_url: Optional[str] = None,
+                 requests_per_second: float = 2.0, max_in_flight: int = 4, cache: Optional[PageCache] = None,
+                 fast_parse: bool = True):
+        """
+        Args:
+            league_id: NFL.com league id
+            base_url: League history URL (default NFL.com; point it at a local server to test)
+            requests_per_second: Average request rate across all fetch threads
+            max_in_flight: Most requests (and fetch threads) at once
+            cache: Optional raw page cache (completed seasons are then never refetched)
+            fast_parse: Parse pages with parse_matchups_fast when it can (falls back to the full parser)
+        """
         self.league_id = league_id
-        self.base_url = f"https://fantasy.nfl.com/league/{league_id}/history"
+        self.cache = cache
+        self.fast_parse = fast_parse
+        self.base_url = (base_url or f"https://fantasy.nfl.com/league/{league_id}/history").rstrip('/')
+        self.limiter = RateLimiter(requests_per_second, max_in_flight)
         self.session = requests.Session()
+        # One pooled connection per concurrent request
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Error from the most recent fetch_week_page call (None if it succeeded)
+        self.last_error: Optional[str] = None
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
     
-    def fetch_week_page(self, year: int, week: int) -> Optional[BeautifulSoup]:
-        """Fetch schedule page for a specific year and week"""
-        url = f"{self.base_url}/{year}/schedule?gameSeason={year}&leagueId={self.league_id}&scheduleDetail={week}&scheduleType=week&standingsTab=schedule"
+    def week_url(self, year: int, week: int) -> str:
+        return f"{self.base_url}/{year}/schedule?gameSeason={year}&leagueId={self.league_id}&scheduleDetail={week}&scheduleType=week&standingsTab=schedule"
+    
+    def _fetch_week(self, year: int, week: int) -> Tuple[Optional[bytes], Optional[str]]:
+        """(page body, None) or (None, error) - safe to call from several threads"""
+        url = self.week_url(year, week)
         try:
             print(f"  Fetching {year} Week {week}...")
-            response = self.session.get(url, timeout=15)
+            if self.cache is not None:
+                return self.cache.fetch(self.session, url, is_completed_season(year), self.limiter), None
+            with self.limiter:
+                response = self.session.get(url, timeout=15)
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            return response.content, None
         except Exception as e:
             print(f"    Error: {e}")
-            return None
+            return None, str(e)
+    
+    def fetch_week_page(self, year: int, week: int) -> Optional[BeautifulSoup]:
+        """Fetch schedule page for a specific year and week"""
+        content, self.last_error = self._fetch_week(year, week)
+        return BeautifulSoup(content, 'html.parser') if content is not None else None
     
     def parse_matchups_from_page(self, soup: BeautifulSoup, year: int, week: int) -> List[Dict]:
         """Parse matchups from the schedule page HTML"""
@@ -78,28 +155,38 @@ class HistoricalScraper:
                     else:
                         continue  # Skip this matchup if we can't find scores
                 
-                matchup = {
-                    'year': year,
-                    'week': week,
-                    'team1_name': team1_name,
-                    'team1_score': team1_score,
-                    'team2_name': team2_name,
-                    'team2_score': team2_score,
-                    'winner': team1_name if team1_score > team2_score else (team2_name if team2_score > team1_score else 'Tie'),
-                    'scraped_at': datetime.now().isoformat()
-                }
-                matchups.append(matchup)
+                matchups.append(_matchup(year, week, team1_name, team1_score, team2_name, team2_score))
         
-        # Remove duplicates (same teams in same week)
-        seen = set()
-        unique_matchups = []
-        for m in matchups:
-            key = (m['team1_name'], m['team2_name'], m['week'])
-            if key not in seen:
-                seen.add(key)
-                unique_matchups.append(m)
+        return _unique_matchups(matchups)
+    
+    def parse_matchups_fast(self, content: bytes, year: int, week: int) -> Optional[List[Dict]]:
+        """
+        Fast path for parse_matchups_from_page: lxml with precompiled XPath over just the
+        matchup <li>s, reading scores from whole decimal text nodes instead of running a
+        regex over each serialized <li>. Returns None (use the full parser) if lxml is not
+        installed or the page does not have the expected shape.
+        """
+        if lxml_html is None or not content:
+            return None
+        try:
+            root = lxml_html.fromstring(content)
+        except (etree.ParserError, ValueError):
+            return None
+        
+        matchups = []
+        for matchup_li in _MATCHUP_LIS(root):
+            team_links = _TEAM_LINKS(matchup_li)
+            if len(team_links) < 2:
+                continue
+            scores = [float(text) for text in _TEXT_NODES(matchup_li) if _SCORE_TEXT.fullmatch(text)]
+            if len(scores) < 2:
+                # The full parser has extra fallbacks for this
+                return None
+            team1_name = ''.join(text.strip() for text in team_links[0].itertext())
+            team2_name = ''.join(text.strip() for text in team_links[1].itertext())
+            matchups.append(_matchup(year, week, team1_name, scores[0], team2_name, scores[1]))
         
-        return unique_matchups
+        return _unique_matchups(matchups) if matchups else None
     
     def _parse_structured_matchups(self, soup: BeautifulSoup, year: int, week: int) -> List[Dict]:
         """Parse matchups using the known HTML structure"""
@@ -169,13 +256,11 @@ class HistoricalScraper:
         else:
             return 'unknown'
     
-    def scrape_week(self, year: int, week: int) -> List[Dict]:
-        """Scrape a specific week"""
-        soup = self.fetch_week_page(year, week)
-        if not soup:
-            return []
-        
-        matchups = self.parse_matchups_from_page(soup, year, week)
+    def parse_week(self, content: bytes, year: int, week: int) -> List[Dict]:
+        """Matchups (with week_type) from a schedule page body"""
+        matchups = self.parse_matchups_fast(content, year, week) if self.fast_parse else None
+        if matchups is None:
+            matchups = self.parse_matchups_from_page(BeautifulSoup(content, 'html.parser'), year, week)
         
         # Determine week type
         week_type = self.determine_week_type(len(matchups))
@@ -186,23 +271,52 @@ class HistoricalScraper:
         
         return matchups
     
+    def _scrape_week(self, year: int, week: int) -> Tuple[List[Dict], Optional[str]]:
+        content, error = self._fetch_week(year, week)
+        if content is None:
+            return [], error
+        return self.parse_week(content, year, week), None
+    
+    def scrape_week(self, year: int, week: int) -> List[Dict]:
+        """Scrape a specific week"""
+        matchups, self.last_error = self._scrape_week(year, week)
+        return matchups
+    
+    def scrape_weeks(self, weeks: Iterable[Tuple[int, int]]) -> Iterator[Tuple[int, int, List[Dict], Optional[str]]]:
+        """
+        Scrape (year, week) pairs concurrently, bounded by the rate limiter.
+        
+        Yields (year, week, matchups, error) in the order the weeks were given, as soon as
+        each week and every week before it are done, so callers can write them in order.
+        """
+        weeks = list(weeks)
+        if not weeks:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.limiter.max_in_flight, len(weeks)),
+                                thread_name_prefix='scrape') as pool:
+            futures = [pool.submit(self._scrape_week, year, week) for year, week in weeks]
+            try:
+                for (year, week), future in zip(weeks, futures):
+                    matchups, error = future.result()
+                    yield year, week, matchups, error
+            finally:
+                # Stop fetching if the caller gives up early
+                for future in futures:
+                    future.cancel()
+    
     def scrape_year(self, year: int, start_week: int = 1, end_week: int = 17) -> List[Dict]:
         """Scrape all weeks for a year"""
         all_matchups = []
         
         print(f"\nScraping {year}...")
         
-        for week in range(start_week, end_week + 1):
-            matchups = self.scrape_week(year, week)
-            
+        # Rate limiting is done by self.limiter
+        for _, week, matchups, _ in self.scrape_weeks((year, week) for week in range(start_week, end_week + 1)):
             if matchups:
                 all_matchups.extend(matchups)
                 print(f"    Week {week}: {len(matchups)} matchups ({matchups[0].get('week_type', 'unknown')})")
             else:
                 print(f"    Week {week}: No matchups found")
-            
-            # Rate limiting
-            time.sleep(0.5)
         
         return all_matchups
     
@@ -210,10 +324,9 @@ class HistoricalScraper:
         """Scrape all historical data"""
         all_matchups = []
         
-        for year in range(start_year, end_year + 1):
-            matchups = self.scrape_year(year)
+        weeks = [(year, week) for year in range(start_year, end_year + 1) for week in range(1, 18)]
+        for _, _, matchups, _ in self.scrape_weeks(weeks):
             all_matchups.extend(matchups)
-            time.sleep(1)  # Be polite between years
         
         return all_matchups
     
@@ -222,35 +335,144 @@ class HistoricalScraper:
         return self.scrape_year(year, start_week=1, end_week=max_week)
 
 
+MATCHUP_FIELDS = ['year', 'week', 'week_type', 'team1_name', 'team1_score',
+                  'team2_name', 'team2_score', 'winner', 'scraped_at']
+
+
+def _csv_row(matchup: Dict) -> Dict:
+    return {
+        'year': matchup.get('year'),
+        'week': matchup.get('week'),
+        'week_type': matchup.get('week_type', 'unknown'),
+        'team1_name': matchup.get('team1_name'),
+        'team1_score': matchup.get('team1_score'),
+        'team2_name': matchup.get('team2_name'),
+        'team2_score': matchup.get('team2_score'),
+        'winner': matchup.get('winner'),
+        'scraped_at': matchup.get('scraped_at', datetime.now().isoformat())
+    }
+
+
+def matchup_key(matchup: Dict) -> Tuple[int, int, Tuple[str, str]]:
+    """(year, week, canonical team pair) - a game's identity regardless of which team is listed first"""
+    pair = sorted((normalize_team_name(str(matchup['team1_name'])), normalize_team_name(str(matchup['team2_name']))))
+    return int(matchup['year']), int(matchup['week']), tuple(pair)
+
+
+def _same_result(row: Dict, matchup: Dict) -> bool:
+    """Whether a CSV row already holds a matchup (scraped_at aside)"""
+    try:
+        return (row['week_type'] == str(matchup['week_type'])
+                and row['team1_name'] == str(matchup['team1_name'])
+                and row['team2_name'] == str(matchup['team2_name'])
+                and float(row['team1_score']) == float(matchup['team1_score'])
+                and float(row['team2_score']) == float(matchup['team2_score'])
+                and row['winner'] == str(matchup['winner']))
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
 def save_to_csv(matchups: List[Dict], csv_file: str):
-    """Save matchups to CSV file"""
+    """Save matchups to CSV file (appends; see upsert_to_csv for re-scraped weeks)"""
     if not matchups:
         return
     
     # Check if file exists to determine if we need headers
     file_exists = os.path.exists(csv_file)
     
-    fieldnames = ['year', 'week', 'week_type', 'team1_name', 'team1_score', 
-                  'team2_name', 'team2_score', 'winner', 'scraped_at']
-    
     with open(csv_file, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=MATCHUP_FIELDS)
         
         if not file_exists:
             writer.writeheader()
         
         for matchup in matchups:
-            writer.writerow({
-                'year': matchup.get('year'),
-                'week': matchup.get('week'),
-                'week_type': matchup.get('week_type', 'unknown'),
-                'team1_name': matchup.get('team1_name'),
-                'team1_score': matchup.get('team1_score'),
-                'team2_name': matchup.get('team2_name'),
-                'team2_score': matchup.get('team2_score'),
-                'winner': matchup.get('winner'),
-                'scraped_at': matchup.get('scraped_at', datetime.now().isoformat())
-            })
+            writer.writerow(_csv_row(matchup))
+
+
+def upsert_to_csv(matchups: List[Dict], csv_file: str) -> Dict[str, int]:
+    """
+    Insert or update matchups keyed on (year, week, canonical team pair), so re-scraping a
+    week (--force, or a week scraped while still in progress) never duplicates rows.
+
+    New games only are appended (readers such as MatchupStore then load just the new rows).
+    If any existing game changed, the file is rewritten to a temp file and renamed over the
+    original: untouched rows are copied byte for byte, only changed rows are re-serialized
+    (in place), and older duplicates of an upserted game are dropped.
+
+    Returns:
+        {'inserted', 'updated', 'unchanged', 'removed'} row counts
+    """
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+    # Stage the new rows (the last one wins if a key repeats)
+    staged = {}
+    for matchup in matchups:
+        staged[matchup_key(matchup)] = matchup
+    if not staged:
+        return counts
+    
+    if not os.path.exists(csv_file) or os.path.getsize(csv_file) == 0:
+        save_to_csv(list(staged.values()), csv_file)
+        counts['inserted'] = len(staged)
+        return counts
+    
+    with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+        lines = f.readlines()
+    fieldnames = next(csv.reader(lines[:1]))
+    
+    # Merge against the key index of the existing rows: line number -> replacement (None = drop)
+    replacements = {}
+    seen = set()
+    for line_no, values in enumerate(csv.reader(lines[1:]), 1):
+        if not values:
+            continue
+        row = dict(zip(fieldnames, values))
+        try:
+            key = matchup_key(row)
+        except (KeyError, ValueError):
+            continue
+        matchup = staged.get(key)
+        if matchup is None:
+            continue
+        if key in seen:
+            replacements[line_no] = None
+            counts['removed'] += 1
+        elif _same_result(row, matchup):
+            counts['unchanged'] += 1
+        else:
+            replacements[line_no] = matchup
+            counts['updated'] += 1
+        seen.add(key)
+    
+    inserted = [matchup for key, matchup in staged.items() if key not in seen]
+    counts['inserted'] = len(inserted)
+    
+    if not replacements:
+        save_to_csv(inserted, csv_file)
+        return counts
+    
+    def serialize(matchup_list):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+        for matchup in matchup_list:
+            writer.writerow(_csv_row(matchup))
+        return buffer.getvalue()
+    
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(csv_file)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            for line_no, line in enumerate(lines):
+                if line_no not in replacements:
+                    f.write(line if line.endswith('\n') else line + '\r\n')
+                elif replacements[line_no] is not None:
+                    f.write(serialize([replacements[line_no]]))
+            f.write(serialize(inserted))
+        os.replace(tmp_file, csv_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return counts
 
 
 def load_from_csv(csv_file: str) -> List[Dict]:
@@ -258,21 +480,26 @@ def load_from_csv(csv_file: str) -> List[Dict]:
     if not os.path.exists(csv_file):
         return []
     
-    matchups = []
     with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            matchups.append({
-                'year': int(row['year']),
-                'week': int(row['week']),
-                'week_type': row['week_type'],
-                'team1_name': row['team1_name'],
-                'team1_score': float(row['team1_score']),
-                'team2_name': row['team2_name'],
-                'team2_score': float(row['team2_score']),
-                'winner': row['winner'],
-                'scraped_at': row.get('scraped_at', '')
-            })
+        return parse_matchups_csv(f)
+
+
+def parse_matchups_csv(lines: Iterable[str], fieldnames: Optional[List[str]] = None) -> List[Dict]:
+    """Parse matchup rows from CSV lines (the first line is the header unless fieldnames is given)"""
+    matchups = []
+    reader = csv.DictReader(lines, fieldnames=fieldnames)
+    for row in reader:
+        matchups.append({
+            'year': int(row['year']),
+            'week': int(row['week']),
+            'week_type': row['week_type'],
+            'team1_name': row['team1_name'],
+            'team1_score': float(row['team1_score']),
+            'team2_name': row['team2_name'],
+            'team2_score': float(row['team2_score']),
+            'winner': row['winner'],
+            'scraped_at': row.get('scraped_at', '')
+        })
     
     return matchups
 
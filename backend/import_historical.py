@@ -5,6 +5,7 @@ Scrapes historical matchup data and saves to CSV for fast access
 import os
 import sys
 from datetime import datetime
+from typing import Optional
 
 # Get project root
 if os.path.basename(os.getcwd()) == 'backend':
@@ -20,14 +21,30 @@ if backend_dir not in sys.path:
 from historical_scraper import (
     HistoricalScraper, 
     save_to_csv, 
+    upsert_to_csv, 
     load_from_csv, 
     get_scraped_weeks
 )
 from data_manager import DataManager
+from snapshot import write_snapshot
+from sqlite_store import sync_league_database
+from page_cache import PageCache, current_season
 
+# Raw schedule/standings pages, shared with import_standings
+PAGE_CACHE_DIR = os.path.join(project_root, 'data', 'cache', 'pages')
 
-def import_historical_data(league_id: str = "987449", start_year: int = 2012, end_year: int = 2024, force: bool = False):
-    """Scrape and import historical data to CSV"""
+
+def import_historical_data(league_id: str = "987449", start_year: int = 2012, end_year: int = 2024, force: bool = False,
+                           progress=None, requests_per_second: float = 2.0, max_in_flight: int = 4):
+    """
+    Scrape and import historical data to CSV
+
+    Weeks are fetched by up to max_in_flight threads at requests_per_second on average.
+
+    progress is an optional reporter (e.g. a jobs.Job): progress.plan(weeks) is called once
+    with the number of weeks to scrape and progress.week_done(year, week, rows, error) after
+    each of them.
+    """
     csv_file = os.path.join(project_root, 'data', 'matchups.csv')
     
     print("="*60)
@@ -39,49 +56,72 @@ def import_historical_data(league_id: str = "987449", start_year: int = 2012, en
     print("="*60)
     print()
     
-    scraper = HistoricalScraper(league_id)
+    scraper = HistoricalScraper(league_id, requests_per_second=requests_per_second, max_in_flight=max_in_flight,
+                                cache=PageCache(PAGE_CACHE_DIR))
     
     # Get already scraped weeks if not forcing
     scraped_weeks = {} if force else get_scraped_weeks(csv_file)
+    for year in range(start_year, end_year + 1):
+        if year in scraped_weeks:
+            print(f"  {year} already scraped weeks: {sorted(scraped_weeks[year])}")
+    
+    # Weeks 1-17 of each year, skipping those already scraped (unless forcing)
+    pending = [(year, week) for year in range(start_year, end_year + 1) for week in range(1, 18)
+               if force or week not in scraped_weeks.get(year, ())]
     
     total_new_matchups = 0
     
-    # Scrape historical years (2017-2024)
-    for year in range(start_year, end_year + 1):
-        print(f"\n{'='*60}")
-        print(f"Processing {year}")
-        print(f"{'='*60}")
+    if progress:
+        progress.plan(len(pending))
+    
+    # Weeks are fetched concurrently but come back (and are saved) in (year, week) order
+    current_year = None
+    for year, week, matchups, error in scraper.scrape_weeks(pending):
+        if year != current_year:
+            current_year = year
+            print(f"\n{'='*60}")
+            print(f"Processing {year}")
+            print(f"{'='*60}")
         
-        if year in scraped_weeks:
-            print(f"  Already scraped weeks: {sorted(scraped_weeks[year])}")
+        written = 0
+        if matchups:
+            counts = upsert_to_csv(matchups, csv_file)
+            written = counts['inserted'] + counts['updated']
+            total_new_matchups += written
+            print(f"    Week {week}: {len(matchups)} matchups ({matchups[0].get('week_type', 'unknown')}): "
+                  f"{counts['inserted']} new, {counts['updated']} updated")
+        else:
+            # If no matchups found, might be end of season
+            print(f"    Week {week}: No matchups (may be end of season)")
+            # Don't break, continue to next week in case there are gaps
         
-        # Scrape weeks 1-17 for each year
-        for week in range(1, 18):
-            # Skip if already scraped (unless forcing)
-            if not force and year in scraped_weeks and week in scraped_weeks[year]:
-                continue
-            
-            matchups = scraper.scrape_week(year, week)
-            
-            if matchups:
-                save_to_csv(matchups, csv_file)
-                total_new_matchups += len(matchups)
-                print(f"    Week {week}: {len(matchups)} matchups saved ({matchups[0].get('week_type', 'unknown')})")
-            else:
-                # If no matchups found, might be end of season
-                print(f"    Week {week}: No matchups (may be end of season)")
-                # Don't break, continue to next week in case there are gaps
+        if progress:
+            progress.week_done(year, week, written, error)
     
     print("\n" + "="*60)
     print("Historical Import Complete!")
     print("="*60)
-    print(f"Total new matchups added: {total_new_matchups}")
+    print(f"Total matchups added or updated: {total_new_matchups}")
     print(f"Data saved to: {csv_file}")
     print("="*60)
+    sync_league_database(os.path.dirname(csv_file))
+    write_snapshot(os.path.dirname(csv_file))
+    return total_new_matchups
+
+
+def _unfinished_weeks(csv_file: str, year: int) -> set:
+    """The latest scraped week of a season and any week with a 0-0 (not yet played) game"""
+    rows = [m for m in load_from_csv(csv_file) if m['year'] == year]
+    if not rows:
+        return set()
+    unfinished = {m['week'] for m in rows if m['team1_score'] == 0 and m['team2_score'] == 0}
+    unfinished.add(max(m['week'] for m in rows))
+    return unfinished
 
 
-def import_current_season(league_id: str = "987449", year: int = 2025, max_week: int = 17, force: bool = False):
-    """Import current season, only scraping new weeks"""
+def import_current_season(league_id: str = "987449", year: int = 2025, max_week: int = 17, force: bool = False,
+                          progress=None, requests_per_second: float = 2.0, max_in_flight: int = 4):
+    """Import current season, only scraping new weeks (other args as for import_historical_data)"""
     csv_file = os.path.join(project_root, 'data', 'matchups.csv')
     
     print("="*60)
@@ -93,7 +133,8 @@ def import_current_season(league_id: str = "987449", year: int = 2025, max_week:
     print("="*60)
     print()
     
-    scraper = HistoricalScraper(league_id)
+    scraper = HistoricalScraper(league_id, requests_per_second=requests_per_second, max_in_flight=max_in_flight,
+                                cache=PageCache(PAGE_CACHE_DIR))
     
     # Get already scraped weeks
     scraped_weeks = get_scraped_weeks(csv_file)
@@ -107,29 +148,82 @@ def import_current_season(league_id: str = "987449", year: int = 2025, max_week:
     
     total_new_matchups = 0
     
-    # Scrape only new weeks
+    # New weeks, plus weeks that may still have been in progress when scraped (rows are
+    # upserted, so re-scraping them updates rather than duplicates)
+    in_progress = set() if force else _unfinished_weeks(csv_file, year)
     for week in range(1, max_week + 1):
-        # Skip if already scraped (unless forcing)
-        if not force and week in year_scraped:
+        if not force and week in year_scraped and week not in in_progress:
             print(f"  Week {week}: Already scraped, skipping")
-            continue
-        
-        print(f"\n  Scraping Week {week}...")
-        matchups = scraper.scrape_week(year, week)
-        
+    pending = [(year, week) for week in range(1, max_week + 1)
+               if force or week not in year_scraped or week in in_progress]
+    
+    if progress:
+        progress.plan(len(pending))
+    
+    for _, week, matchups, error in scraper.scrape_weeks(pending):
+        print(f"\n  Week {week}...")
+        written = 0
         if matchups:
-            save_to_csv(matchups, csv_file)
-            total_new_matchups += len(matchups)
-            print(f"    ✓ {len(matchups)} matchups saved ({matchups[0].get('week_type', 'unknown')})")
+            counts = upsert_to_csv(matchups, csv_file)
+            written = counts['inserted'] + counts['updated']
+            total_new_matchups += written
+            print(f"    ✓ {len(matchups)} matchups ({matchups[0].get('week_type', 'unknown')}): "
+                  f"{counts['inserted']} new, {counts['updated']} updated")
         else:
             print(f"    ✗ No matchups found (may not be played yet)")
+        
+        if progress:
+            progress.week_done(year, week, written, error)
     
     print("\n" + "="*60)
     print("Current Season Import Complete!")
     print("="*60)
-    print(f"Total new matchups added: {total_new_matchups}")
+    print(f"Total matchups added or updated: {total_new_matchups}")
     print(f"Data saved to: {csv_file}")
     print("="*60)
+    sync_league_database(os.path.dirname(csv_file))
+    write_snapshot(os.path.dirname(csv_file))
+    return total_new_matchups
+
+
+def reparse_matchups_from_cache(league_id: str = "987449", start_year: int = 2012, end_year: Optional[int] = None,
+                                max_week: int = 17):
+    """
+    Rebuild matchups.csv from the page cache alone (no network), e.g. after a parser fix.
+    Weeks missing from the cache are skipped; the new file replaces the old one atomically.
+    """
+    csv_file = os.path.join(project_root, 'data', 'matchups.csv')
+    end_year = end_year if end_year is not None else current_season()
+    cache = PageCache(PAGE_CACHE_DIR)
+    scraper = HistoricalScraper(league_id, cache=cache)
+    
+    tmp_file = csv_file + '.tmp'
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+    
+    total = 0
+    missing = []
+    for year in range(start_year, end_year + 1):
+        for week in range(1, max_week + 1):
+            url = scraper.week_url(year, week)
+            content = cache.get(url)
+            if content is None:
+                missing.append((year, week))
+                continue
+            matchups = scraper.parse_week(content, year, week)
+            for matchup in matchups:
+                matchup['scraped_at'] = cache.info(url)['fetched_at']
+            save_to_csv(matchups, tmp_file)
+            total += len(matchups)
+    
+    if not total:
+        print("No cached schedule pages found; matchups.csv left unchanged")
+        return 0
+    os.replace(tmp_file, csv_file)
+    print(f"Rebuilt {csv_file} from cache: {total} matchups ({len(missing)} weeks not cached)")
+    sync_league_database(os.path.dirname(csv_file))
+    write_snapshot(os.path.dirname(csv_file))
+    return total
 
 
 def sync_csv_to_data_manager():
@@ -168,23 +262,32 @@ if __name__ == '__main__':
     parser.add_argument('--historical', action='store_true', help='Import historical data (2012-2024)')
     parser.add_argument('--current', action='store_true', help='Import current season (2025)')
     parser.add_argument('--sync', action='store_true', help='Sync CSV to data manager')
+    parser.add_argument('--reparse', action='store_true', help='Rebuild matchups.csv from cached pages (no network)')
     parser.add_argument('--force', action='store_true', help='Force re-scrape of all weeks')
     parser.add_argument('--year', type=int, default=2025, help='Year for current season (default: 2025)')
     parser.add_argument('--max-week', type=int, default=17, help='Max week to scrape (default: 17)')
     parser.add_argument('--start-year', type=int, default=2012, help='Start year for historical import (default: 2012)')
     parser.add_argument('--end-year', type=int, default=2024, help='End year for historical import (default: 2024)')
+    parser.add_argument('--rps', type=float, default=2.0, help='Average requests per second (default: 2)')
+    parser.add_argument('--max-in-flight', type=int, default=4, help='Concurrent requests (default: 4)')
     
     args = parser.parse_args()
     
-    if args.historical:
-        import_historical_data(start_year=args.start_year, end_year=args.end_year, force=args.force)
+    if args.reparse:
+        reparse_matchups_from_cache(start_year=args.start_year)
+    elif args.historical:
+        import_historical_data(start_year=args.start_year, end_year=args.end_year, force=args.force,
+                               requests_per_second=args.rps, max_in_flight=args.max_in_flight)
     elif args.current:
-        import_current_season(year=args.year, max_week=args.max_week, force=args.force)
+        import_current_season(year=args.year, max_week=args.max_week, force=args.force,
+                              requests_per_second=args.rps, max_in_flight=args.max_in_flight)
     elif args.sync:
         sync_csv_to_data_manager()
     else:
         # Default: do both historical and current, then sync
         print("Running full import (historical + current season)...")
-        import_historical_data(start_year=args.start_year, end_year=args.end_year, force=args.force)
-        import_current_season(year=args.year, max_week=args.max_week, force=args.force)
+        import_historical_data(start_year=args.start_year, end_year=args.end_year, force=args.force,
+                               requests_per_second=args.rps, max_in_flight=args.max_in_flight)
+        import_current_season(year=args.year, max_week=args.max_week, force=args.force,
+                              requests_per_second=args.rps, max_in_flight=args.max_in_flight)
         sync_csv_to_data_manager()
@@ -3,6 +3,7 @@ Script to import historical standings data
 """
 import os
 import sys
+from typing import Optional
 
 # Get project root
 if os.path.basename(os.getcwd()) == 'backend':
@@ -17,6 +18,12 @@ if backend_dir not in sys.path:
 
 from standings_scraper import StandingsScraper, save_standings_to_csv, load_standings_from_csv
 from team_mapper import normalize_team_name
+from page_cache import PageCache, current_season
+from snapshot import write_snapshot
+from sqlite_store import sync_league_database
+
+# Raw pages, shared with import_historical
+PAGE_CACHE_DIR = os.path.join(project_root, 'data', 'cache', 'pages')
 
 
 def import_standings(start_year: int = 2012, end_year: int = 2025, force: bool = False):
@@ -31,7 +38,7 @@ def import_standings(start_year: int = 2012, end_year: int = 2025, force: bool =
     print("="*60)
     print()
     
-    scraper = StandingsScraper('987449')
+    scraper = StandingsScraper('987449', cache=PageCache(PAGE_CACHE_DIR))
     
     # Get already scraped years (check both regular and final)
     scraped_years = set()
@@ -90,6 +97,51 @@ def import_standings(start_year: int = 2012, end_year: int = 2025, force: bool =
     print(f"Final standings: {total_new_final}")
     print(f"Data saved to: {csv_file} and {csv_file.replace('.csv', '_final.csv')}")
     print("="*60)
+    sync_league_database(os.path.dirname(csv_file))
+    write_snapshot(os.path.dirname(csv_file))
+
+
+def reparse_standings_from_cache(start_year: int = 2012, end_year: Optional[int] = None):
+    """
+    Rebuild standings.csv and standings_final.csv from the page cache alone (no network).
+    Years missing from the cache are skipped; each file is replaced atomically.
+    """
+    csv_file = os.path.join(project_root, 'data', 'standings.csv')
+    end_year = end_year if end_year is not None else current_season()
+    cache = PageCache(PAGE_CACHE_DIR)
+    scraper = StandingsScraper('987449', cache=cache)
+    
+    # save_standings_to_csv appends (and adds _final itself), so build into a temp base path
+    tmp_file = csv_file.replace('.csv', '.tmp.csv')
+    for standings_type in ('regular', 'final'):
+        path = tmp_file.replace('.csv', '_final.csv') if standings_type == 'final' else tmp_file
+        if os.path.exists(path):
+            os.remove(path)
+    
+    totals = {'regular': 0, 'final': 0}
+    for year in range(start_year, end_year + 1):
+        for standings_type in ('regular', 'final'):
+            url = scraper.standings_url(year, standings_type)
+            content = cache.get(url)
+            if content is None:
+                continue
+            standings = scraper.parse_standings_html(content, year)
+            for s in standings:
+                s['team_name'] = normalize_team_name(s['team_name'])
+                s['scraped_at'] = cache.info(url)['fetched_at']
+            save_standings_to_csv(standings, tmp_file, standings_type)
+            totals[standings_type] += len(standings)
+    
+    for standings_type in ('regular', 'final'):
+        suffix = '_final.csv' if standings_type == 'final' else '.csv'
+        if totals[standings_type]:
+            os.replace(tmp_file.replace('.csv', suffix), csv_file.replace('.csv', suffix))
+            print(f"Rebuilt {standings_type} standings from cache: {totals[standings_type]} rows")
+        else:
+            print(f"No cached {standings_type} standings pages found; file left unchanged")
+    sync_league_database(os.path.dirname(csv_file))
+    write_snapshot(os.path.dirname(csv_file))
+    return totals
 
 
 if __name__ == '__main__':
@@ -99,7 +151,11 @@ if __name__ == '__main__':
     parser.add_argument('--force', action='store_true', help='Force re-scrape of all years')
     parser.add_argument('--start-year', type=int, default=2012, help='Start year')
     parser.add_argument('--end-year', type=int, default=2025, help='End year')
+    parser.add_argument('--reparse', action='store_true', help='Rebuild the standings CSVs from cached pages (no network)')
     
     args = parser.parse_args()
-    import_standings(args.start_year, args.end_year, args.force)
+    if args.reparse:
+        reparse_standings_from_cache(args.start_year, args.end_year)
+    else:
+        import_standings(args.start_year, args.end_year, args.force)
 
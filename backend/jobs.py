@@ -0,0 +1,165 @@
+"""
+Background Jobs
+In-process job queue for long-running imports (/api/refresh, /api/import-historical).
+Jobs run one at a time on a single worker thread so request workers are never held by
+scraping; a league can only have one import queued or running at a time. Progress is
+polled through /api/jobs/<id>.
+"""
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+# Finished jobs kept for status polling
+MAX_FINISHED_JOBS = 50
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class JobConflict(Exception):
+    """A job for the same league is already queued or running"""
+
+    def __init__(self, job: 'Job'):
+        super().__init__(f'An import for league {job.league_id} is already {job.status} (job {job.id})')
+        self.job = job
+
+
+class Job:
+    """
+    Status and progress of one background job. The import functions report through
+    plan() and week_done() (see import_historical); the runner sets everything else.
+    """
+
+    def __init__(self, kind: str, league_id: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.league_id = league_id
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.weeks_total = 0
+        self.weeks_done = 0
+        self.rows_written = 0
+        self.errors: List[str] = []
+        self.message = ''
+        self._lock = threading.Lock()
+
+    def plan(self, weeks: int):
+        """Add weeks to the number this job expects to process"""
+        with self._lock:
+            self.weeks_total += weeks
+
+    def week_done(self, year: int, week: int, rows: int, error: Optional[str] = None):
+        """Record one processed week, the rows written for it and any fetch error"""
+        with self._lock:
+            self.weeks_done += 1
+            self.rows_written += rows
+            self.message = f'{year} week {week}'
+            if error:
+                self.errors.append(f'{year} week {week}: {error}')
+
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining time extrapolated from the average time per week so far"""
+        if self.status != RUNNING or not self.weeks_done or not self.weeks_total:
+            return None
+        elapsed = time.time() - self.started_at
+        return round(elapsed / self.weeks_done * max(self.weeks_total - self.weeks_done, 0), 1)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'id': self.id,
+                'kind': self.kind,
+                'league_id': self.league_id,
+                'status': self.status,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'weeks_total': self.weeks_total,
+                'weeks_done': self.weeks_done,
+                'rows_written': self.rows_written,
+                'errors': list(self.errors),
+                'message': self.message,
+                'eta_seconds': self.eta_seconds()
+            }
+
+
+class JobRunner:
+    """Single worker thread draining a FIFO of jobs (started on the first submit)"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, kind: str, league_id: str, func: Callable, *args, **kwargs) -> Job:
+        """
+        Queue func(job, *args, **kwargs) and return its Job right away.
+
+        Raises:
+            JobConflict: If the league already has a job queued or running
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.league_id == league_id and job.status in (QUEUED, RUNNING):
+                    raise JobConflict(job)
+            job = Job(kind, league_id)
+            self._jobs[job.id] = job
+            self._prune()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='job-runner', daemon=True)
+                self._worker.start()
+        self._queue.put((job, func, args, kwargs))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in (SUCCEEDED, FAILED)]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
+
+    def _run(self):
+        while True:
+            job, func, args, kwargs = self._queue.get()
+            job.status = RUNNING
+            job.started_at = time.time()
+            try:
+                result = func(job, *args, **kwargs)
+                if result:
+                    job.message = str(result)
+                job.status = SUCCEEDED
+            except Exception as e:
+                traceback.print_exc()
+                job.errors.append(str(e))
+                job.status = FAILED
+            finally:
+                job.finished_at = time.time()
+                self._queue.task_done()
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Get the process-wide job runner"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
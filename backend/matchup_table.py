@@ -0,0 +1,194 @@
+"""
+Columnar Matchup Table
+Holds matchups as parallel NumPy arrays with team names interned to small integer ids,
+so the hot aggregations run as array operations instead of per-row dict/string work.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from team_mapper import TeamRegistry
+
+# Special values for the winner column (team ids are >= 0)
+WINNER_TIE = -1
+WINNER_NONE = -2
+
+
+class MatchupTable:
+    """
+    Matchups stored column-wise:
+        year, week, week_type (code into week_types), team1, team2 (team ids),
+        score1, score2, winner (team id, WINNER_TIE or WINNER_NONE)
+
+    Team ids index into `teams` (a TeamRegistry); a missing team name is stored as -1.
+    """
+
+    def __init__(self, year, week, week_type, team1, team2, score1, score2, winner,
+                 teams: TeamRegistry, week_types: List[str], scraped_at: Optional[List[str]] = None):
+        self.year = year
+        self.week = week
+        self.week_type = week_type
+        self.team1 = team1
+        self.team2 = team2
+        self.score1 = score1
+        self.score2 = score2
+        self.winner = winner
+        self.teams = teams
+        self.week_types = week_types
+        self.scraped_at = scraped_at if scraped_at is not None else [''] * len(year)
+
+    @classmethod
+    def from_matchups(cls, matchups: List[Dict], teams: Optional[TeamRegistry] = None,
+                      week_types: Optional[List[str]] = None) -> 'MatchupTable':
+        """
+        Build a table from load_from_csv-style matchup dicts.
+        An existing team registry / week_types list can be passed in to keep its ids and codes.
+        """
+        teams = teams if teams is not None else TeamRegistry()
+        week_types = week_types if week_types is not None else []
+        week_type_codes = {wt: code for code, wt in enumerate(week_types)}
+
+        n = len(matchups)
+        year = np.empty(n, dtype=np.int32)
+        week = np.empty(n, dtype=np.int32)
+        week_type = np.empty(n, dtype=np.uint8)
+        team1 = np.empty(n, dtype=np.int32)
+        team2 = np.empty(n, dtype=np.int32)
+        score1 = np.empty(n, dtype=np.float64)
+        score2 = np.empty(n, dtype=np.float64)
+        winner = np.empty(n, dtype=np.int32)
+        scraped_at = []
+
+        for i, m in enumerate(matchups):
+            wt = m.get('week_type', 'regular')
+            code = week_type_codes.get(wt)
+            if code is None:
+                code = len(week_types)
+                week_type_codes[wt] = code
+                week_types.append(wt)
+
+            winner_name = m.get('winner', '') or ''
+            if winner_name.lower() == 'tie':
+                winner_id = WINNER_TIE
+            elif not winner_name:
+                winner_id = WINNER_NONE
+            else:
+                winner_id = teams.intern(winner_name)
+
+            year[i] = m.get('year', 0)
+            week[i] = m.get('week', 0)
+            week_type[i] = code
+            team1[i] = teams.intern(m.get('team1_name', ''))
+            team2[i] = teams.intern(m.get('team2_name', ''))
+            score1[i] = m.get('team1_score', 0)
+            score2[i] = m.get('team2_score', 0)
+            winner[i] = winner_id
+            scraped_at.append(m.get('scraped_at', ''))
+
+        return cls(year, week, week_type, team1, team2, score1, score2, winner,
+                   teams, week_types, scraped_at)
+
+    def extended(self, matchups: List[Dict]) -> 'MatchupTable':
+        """
+        New table with matchups appended. Existing team ids and week type codes are kept
+        (new names are added to the shared registry), so the result is identical to
+        from_matchups() over all the rows; this table is left unchanged.
+        """
+        tail = MatchupTable.from_matchups(matchups, self.teams, self.week_types)
+        columns = [np.concatenate((getattr(self, name), getattr(tail, name)))
+                   for name in ('year', 'week', 'week_type', 'team1', 'team2', 'score1', 'score2', 'winner')]
+        return MatchupTable(*columns, self.teams, self.week_types, self.scraped_at + tail.scraped_at)
+
+    def __len__(self):
+        return len(self.year)
+
+    def team_name(self, team_id: int) -> str:
+        return self.teams.get_name(team_id)
+
+    def winner_name(self, winner_id: int) -> str:
+        if winner_id == WINNER_TIE:
+            return 'Tie'
+        if winner_id == WINNER_NONE:
+            return ''
+        return self.teams.get_name(winner_id)
+
+    def to_dicts(self, rows: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        List-of-dicts view (canonical team names), same keys as load_from_csv.
+        `rows` optionally selects (and orders) a subset of row indices.
+        """
+        names = self.teams.names
+        week_types = self.week_types
+        if rows is None:
+            rows = np.arange(len(self))
+        scraped_at = [self.scraped_at[i] for i in rows.tolist()]
+        rows = zip(self.year[rows].tolist(), self.week[rows].tolist(), self.week_type[rows].tolist(),
+                   self.team1[rows].tolist(), self.team2[rows].tolist(),
+                   self.score1[rows].tolist(), self.score2[rows].tolist(), self.winner[rows].tolist(),
+                   scraped_at)
+        return [{
+            'year': y,
+            'week': w,
+            'week_type': week_types[wt],
+            'team1_name': names[t1] if t1 >= 0 else '',
+            'team1_score': s1,
+            'team2_name': names[t2] if t2 >= 0 else '',
+            'team2_score': s2,
+            'winner': self.winner_name(win),
+            'scraped_at': scraped
+        } for y, w, wt, t1, t2, s1, s2, win, scraped in rows]
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _both_teams(self) -> np.ndarray:
+        return (self.team1 >= 0) & (self.team2 >= 0)
+
+    def _team_scores(self, row_mask: Optional[np.ndarray] = None):
+        """
+        Flatten (team, score, row, side) entries in row order, team1 before team2 -
+        the same order the list-based code appends them in. side is 0 for team1, 1 for team2.
+        """
+        teams = np.column_stack((self.team1, self.team2)).ravel()
+        scores = np.column_stack((self.score1, self.score2)).ravel()
+        rows = np.repeat(np.arange(len(self)), 2)
+        sides = np.tile(np.array([0, 1], dtype=np.int8), len(self))
+        keep = teams >= 0
+        if row_mask is not None:
+            keep &= np.repeat(row_mask, 2)
+        return teams[keep], scores[keep], rows[keep], sides[keep]
+
+    def _week_type_name(self, code: int) -> str:
+        return self.week_types[code]
+
+    # ------------------------------------------------------------------
+    # Aggregations (table-native versions of the fun_stats functions)
+    # ------------------------------------------------------------------
+
+    def lowest_scoring_weeks(self, max_year: Optional[int] = None, limit: int = 10) -> List[Dict]:
+        """
+        Same output as fun_stats.calculate_lowest_scoring_weeks: seasons up to max_year,
+        by default every season before the live (latest) one
+        """
+        if max_year is None:
+            max_year = int(self.year.max()) - 1 if len(self) else 0
+        in_range = self._both_teams() & (self.year <= max_year)
+        teams, scores, rows, sides = self._team_scores(in_range)
+        order = np.argsort(scores, kind='stable')[:limit]
+
+        lowest_scores = []
+        for i in order.tolist():
+            r = int(rows[i])
+            is_team1 = sides[i] == 0
+            opp_id = self.team2[r] if is_team1 else self.team1[r]
+            lowest_scores.append({
+                'year': int(self.year[r]),
+                'week': int(self.week[r]),
+                'week_type': self._week_type_name(int(self.week_type[r])),
+                'team': self.team_name(int(teams[i])),
+                'score': float(scores[i]),
+                'opponent': self.team_name(int(opp_id)),
+                'opponent_score': float(self.score2[r] if is_team1 else self.score1[r])
+            })
+        return lowest_scores
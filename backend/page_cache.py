@@ -0,0 +1,144 @@
+"""
+Page Cache
+On-disk cache of raw scraped pages. Page bodies are stored gzipped and content-addressed
+(objects/<sha256[:2]>/<sha256>.gz, so identical pages are stored once); index.json maps
+each URL to its body hash and the validators (ETag / Last-Modified) used to revalidate it.
+Pages of completed seasons are never fetched again, and the importers can rebuild the
+CSVs from the cache alone (re-parse mode).
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import requests
+
+
+def current_season(today: Optional[datetime] = None) -> int:
+    """The NFL season in progress (or most recently started): seasons start in September"""
+    today = today or datetime.now()
+    return today.year if today.month >= 9 else today.year - 1
+
+
+def is_completed_season(year: int, today: Optional[datetime] = None) -> bool:
+    """Whether a season's pages can no longer change"""
+    return year < current_season(today)
+
+
+class PageCache:
+    """
+    fetch() returns a page body, going to the network only when the cached copy may be
+    stale; get() returns the cached body without any network access.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._index_file = os.path.join(cache_dir, self.INDEX_FILE)
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        if os.path.exists(self._index_file):
+            try:
+                with open(self._index_file, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable page cache index: {e}")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, 'objects', digest[:2], f'{digest}.gz')
+
+    def _read_object(self, digest: str) -> Optional[bytes]:
+        try:
+            with gzip.open(self._object_path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_object(self, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(content))
+            os.replace(tmp, path)
+        return digest
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._index_file)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Cached body for a URL (no network), or None"""
+        with self._lock:
+            entry = self._index.get(url)
+        return self._read_object(entry['sha256']) if entry else None
+
+    def info(self, url: str) -> Optional[Dict]:
+        """Index entry for a URL (sha256, etag, last_modified, fetched_at, completed), or None"""
+        with self._lock:
+            entry = self._index.get(url)
+            return dict(entry) if entry else None
+
+    def fetch(self, session: requests.Session, url: str, completed: bool = False, limiter=None,
+              timeout: float = 15) -> bytes:
+        """
+        Body for a URL. A page cached after its season was completed is returned as is;
+        any other cached page is revalidated with If-None-Match / If-Modified-Since.
+
+        Args:
+            session: Session to fetch with
+            url: Page URL (the cache key)
+            completed: Whether the page's season is over (the copy fetched now is final)
+            limiter: Optional RateLimiter wrapped around network requests
+
+        Raises:
+            requests.RequestException: If the page has to be fetched and that fails
+        """
+        with self._lock:
+            entry = self._index.get(url)
+        cached = self._read_object(entry['sha256']) if entry else None
+        if cached is not None and entry.get('completed'):
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        if limiter is not None:
+            with limiter:
+                response = session.get(url, headers=headers, timeout=timeout)
+        else:
+            response = session.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and cached is not None:
+            # Not modified: keep the body and validators we have
+            content, etag, last_modified = cached, entry.get('etag'), entry.get('last_modified')
+        else:
+            response.raise_for_status()
+            content = response.content
+            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+        digest = self._write_object(content)
+        with self._lock:
+            self._index[url] = {
+                'sha256': digest,
+                'etag': etag,
+                'last_modified': last_modified,
+                'fetched_at': datetime.now().isoformat(),
+                'completed': completed
+            }
+            self._save_index()
+        return content
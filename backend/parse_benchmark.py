@@ -0,0 +1,132 @@
+"""
+Parse Benchmark
+Checks that the fast schedule/standings parsers give the same rows as the full
+BeautifulSoup parsers, and measures both in pages per second, over saved pages: the
+scrapers' page cache (data/cache/pages) and/or a directory of fixture pages named
+schedule_<year>_<week>.html and standings_<year>_<type>.html.
+
+    python parse_benchmark.py [--cache DIR] [--pages DIR] [--repeat N]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from historical_scraper import HistoricalScraper
+from standings_scraper import StandingsScraper
+from page_cache import PageCache
+
+# Get project root
+if os.path.basename(os.getcwd()) == 'backend':
+    project_root = os.path.dirname(os.getcwd())
+else:
+    project_root = os.getcwd()
+
+_SCHEDULE_URL = re.compile(r'/(\d{4})/schedule\?.*scheduleDetail=(\d+)')
+_STANDINGS_URL = re.compile(r'/(\d{4})/standings\?historyStandingsType=(\w+)')
+_SCHEDULE_FILE = re.compile(r'schedule_(\d{4})_(\d+)\.html?$')
+_STANDINGS_FILE = re.compile(r'standings_(\d{4})_(\w+)\.html?$')
+
+
+def load_pages(cache_dir: str = None, pages_dir: str = None) -> List[Tuple[str, int, object, bytes]]:
+    """[(kind, year, week or standings type, body)] from a page cache and/or fixture directory"""
+    pages = []
+    if cache_dir and os.path.exists(os.path.join(cache_dir, PageCache.INDEX_FILE)):
+        cache = PageCache(cache_dir)
+        with open(os.path.join(cache_dir, PageCache.INDEX_FILE), 'r', encoding='utf-8') as f:
+            urls = sorted(json.load(f))
+        for url in urls:
+            schedule, standings = _SCHEDULE_URL.search(url), _STANDINGS_URL.search(url)
+            content = cache.get(url)
+            if content is None:
+                continue
+            if schedule:
+                pages.append(('schedule', int(schedule.group(1)), int(schedule.group(2)), content))
+            elif standings:
+                pages.append(('standings', int(standings.group(1)), standings.group(2), content))
+    if pages_dir:
+        for name in sorted(os.listdir(pages_dir)):
+            schedule, standings = _SCHEDULE_FILE.search(name), _STANDINGS_FILE.search(name)
+            if not (schedule or standings):
+                continue
+            with open(os.path.join(pages_dir, name), 'rb') as f:
+                content = f.read()
+            if schedule:
+                pages.append(('schedule', int(schedule.group(1)), int(schedule.group(2)), content))
+            else:
+                pages.append(('standings', int(standings.group(1)), standings.group(2), content))
+    return pages
+
+
+def _rows(rows):
+    """Rows without the parse-time timestamp, for comparison"""
+    return [{k: v for k, v in row.items() if k != 'scraped_at'} for row in rows or []]
+
+
+def _rate(parse: Callable, pages, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            parse(page)
+    elapsed = time.perf_counter() - start
+    return len(pages) * repeat / elapsed if elapsed else float('inf')
+
+
+def run(pages, repeat: int = 3) -> bool:
+    """Print parity and throughput per page kind; True if every page matched"""
+    schedule = HistoricalScraper('0')
+    standings = StandingsScraper('0')
+    parsers = {
+        'schedule': (
+            lambda p: schedule.parse_matchups_from_page(BeautifulSoup(p[3], 'html.parser'), p[1], p[2]),
+            lambda p: schedule.parse_matchups_fast(p[3], p[1], p[2])
+        ),
+        'standings': (
+            lambda p: standings.parse_standings(BeautifulSoup(p[3], 'html.parser'), p[1]),
+            lambda p: standings.parse_standings_html(p[3], p[1])
+        )
+    }
+
+    ok = True
+    for kind, (full, fast) in parsers.items():
+        kind_pages = [p for p in pages if p[0] == kind]
+        if not kind_pages:
+            continue
+        mismatches, fallbacks = [], 0
+        for page in kind_pages:
+            fast_rows = fast(page)
+            if fast_rows is None:
+                fallbacks += 1
+                continue
+            if _rows(fast_rows) != _rows(full(page)):
+                mismatches.append(f'{page[1]} {page[2]}')
+        ok = ok and not mismatches
+
+        full_rate = _rate(full, kind_pages, repeat)
+        fast_rate = _rate(fast, kind_pages, repeat)
+        print(f"{kind}: {len(kind_pages)} pages, {len(mismatches)} mismatches, {fallbacks} fell back to the full parser")
+        for mismatch in mismatches:
+            print(f"  mismatch: {mismatch}")
+        print(f"  full parser: {full_rate:8.1f} pages/sec")
+        print(f"  fast parser: {fast_rate:8.1f} pages/sec ({fast_rate / full_rate:.1f}x)")
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check and benchmark the fast page parsers')
+    parser.add_argument('--cache', default=os.path.join(project_root, 'data', 'cache', 'pages'),
+                        help='Page cache directory (default: data/cache/pages)')
+    parser.add_argument('--pages', help='Directory of fixture pages (schedule_<year>_<week>.html, standings_<year>_<type>.html)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing passes over the pages (default: 3)')
+    args = parser.parse_args()
+
+    pages = load_pages(args.cache, args.pages)
+    if not pages:
+        print("No saved pages found (import with the page cache enabled or pass --pages)")
+        sys.exit(1)
+    sys.exit(0 if run(pages, args.repeat) else 1)
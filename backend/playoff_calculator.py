@@ -2,18 +2,206 @@
 Playoff Scenario Calculator
 Calculates playoff scenarios based on current standings and remaining matchups
 """
-from typing import Dict, List, Tuple, Set
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
+
+import numpy as np
+
 from team_mapper import normalize_team_name
 
 
-def calculate_playoff_scenarios(standings: List[Dict], week15_matchups: List[Dict]) -> Dict:
+# League format: top 4 make the playoffs (1 v 4, 2 v 3, then the final), no first-round
+# byes, and last place after the regular season takes the spoon
+PLAYOFF_SPOTS = 4
+BYE_SPOTS = 0
+REGULAR_WEEK_TYPES = ('regular', 'unknown')
+
+# Exact enumeration is 2^games outcomes; 20 undecided games is ~1M
+MAX_ENUMERATED_GAMES = 20
+
+
+class TooManyGamesError(ValueError):
+    """Too many undecided games to enumerate; carries what the win ranges alone settle"""
+    
+    def __init__(self, n_games: int, clinched: np.ndarray, eliminated: np.ndarray):
+        super().__init__(f"{n_games} undecided games is too many to enumerate "
+                         f"(max {MAX_ENUMERATED_GAMES}); use simulate_playoff_odds")
+        self.n_games = n_games
+        self.clinched = clinched
+        self.eliminated = eliminated
+
+
+# ----------------------------------------------------------------------
+# Exact scenarios
+# ----------------------------------------------------------------------
+
+def _decided_by_bounds(base_wins: np.ndarray, games_left: np.ndarray, playoff_spots: int):
+    """Teams clinched/eliminated whatever happens, from win ranges alone"""
+    min_wins = base_wins
+    max_wins = base_wins + games_left
+    n_teams = len(base_wins)
+    clinched = np.zeros(n_teams, dtype=bool)
+    eliminated = np.zeros(n_teams, dtype=bool)
+    for i in range(n_teams):
+        others = np.arange(n_teams) != i
+        # Worst case: everyone who can still reach our floor finishes ahead on tiebreaks
+        clinched[i] = np.count_nonzero(max_wins[others] >= min_wins[i]) < playoff_spots
+        # Best case: only teams already past our ceiling finish ahead
+        eliminated[i] = np.count_nonzero(min_wins[others] > max_wins[i]) >= playoff_spots
+    return clinched, eliminated
+
+
+def enumerate_outcomes(base_wins: List[float], points_for: List[float], games: List[Tuple[int, int]],
+                       playoff_spots: int = PLAYOFF_SPOTS) -> Dict:
+    """
+    Enumerate every win/loss combination of the remaining games exactly.
+    
+    Outcome o is a bitmask over games: bit g set means games[g][0] won game g. Teams that are
+    clinched or eliminated on win ranges alone are settled up front; games between two such
+    teams cannot change anyone's fate and are dropped. The rest are enumerated, and outcomes
+    that leave the undecided teams with the same wins vector are collapsed into one state,
+    so the standings are only evaluated once per distinct state.
+    
+    Args:
+        base_wins: Current wins per team (ties as half wins)
+        points_for: Current points_for per team, the projected tiebreaker
+        games: Remaining games as (team index, team index)
+        playoff_spots: Teams that make the playoffs
+        
+    Returns:
+        {
+            'games': the enumerated games (indices into `games`),
+            'clinched', 'eliminated': bool arrays per team,
+            'sure', 'possible', 'projected': (outcomes x teams) bool arrays - in the playoffs
+                whatever the tiebreaks, if every tiebreak went their way, and with points_for
+                as it stands
+        }
+        
+    Raises:
+        TooManyGamesError: If more than MAX_ENUMERATED_GAMES games are undecided
+    """
+    base_wins = np.asarray(base_wins, dtype=np.float64)
+    points_for = np.asarray(points_for, dtype=np.float64)
+    n_teams = len(base_wins)
+    
+    games_left = np.zeros(n_teams, dtype=np.int64)
+    for a, b in games:
+        games_left[a] += 1
+        games_left[b] += 1
+    clinched, eliminated = _decided_by_bounds(base_wins, games_left, playoff_spots)
+    decided = clinched | eliminated
+    
+    relevant = [g for g, (a, b) in enumerate(games) if not (decided[a] and decided[b])]
+    if len(relevant) > MAX_ENUMERATED_GAMES:
+        raise TooManyGamesError(len(relevant), clinched, eliminated)
+    
+    # Only undecided teams compete for the spots the clinched teams leave open
+    open_teams = np.flatnonzero(~decided)
+    open_spots = playoff_spots - int(np.count_nonzero(clinched))
+    
+    # Each outcome's wins vector for the undecided teams as a mixed-radix key (one digit per
+    # team), so outcomes that only permute who beat whom collapse into one state
+    radix = games_left[open_teams] + 1
+    place = np.cumprod(np.concatenate(([1], radix[:-1]))).astype(np.int64)
+    team_place = np.zeros(n_teams, dtype=np.int64)
+    team_place[open_teams] = place
+    
+    n_outcomes = 1 << len(relevant)
+    outcomes = np.arange(n_outcomes, dtype=np.int64)
+    keys = np.zeros(n_outcomes, dtype=np.int64)
+    for bit, g in enumerate(relevant):
+        a, b = games[g]
+        keys += team_place[b] + ((outcomes >> bit) & 1) * (team_place[a] - team_place[b])
+    state_keys, inverse = np.unique(keys, return_inverse=True)
+    added = (state_keys[:, None] // place[None, :]) % radix[None, :]
+    
+    # Per state: teams strictly ahead on wins, level on wins, and ahead on (wins, points_for),
+    # from a cumulative histogram of half-wins per state
+    n_states, n_open = len(state_keys), len(open_teams)
+    half_wins = np.rint(2 * (base_wins[open_teams] + added)).astype(np.int64)
+    stride = int(half_wins.max(initial=0)) + 2
+    cells = half_wins + 1 + np.arange(n_states, dtype=np.int64)[:, None] * stride
+    at_most = np.bincount(cells.ravel(), minlength=n_states * stride).reshape(n_states, stride).cumsum(axis=1)
+    rows = np.arange(n_states)[:, None]
+    not_above = at_most[rows, half_wins + 1]
+    above = n_open - not_above
+    level = not_above - at_most[rows, half_wins] - 1
+    
+    points_rank = np.argsort(np.argsort(points_for[open_teams], kind='stable'), kind='stable')
+    order = np.argsort(half_wins * n_open + points_rank, axis=1)
+    ahead = np.empty_like(order)
+    np.put_along_axis(ahead, order, np.arange(n_open - 1, -1, -1)[None, :], axis=1)
+    
+    state_sure = above + level < open_spots
+    state_possible = above < open_spots
+    state_projected = ahead < open_spots
+    
+    def expand(state_values, fill_decided):
+        full = np.empty((n_outcomes, n_teams), dtype=bool)
+        full[:, decided] = fill_decided[decided]
+        full[:, open_teams] = state_values[inverse.ravel()]
+        return full
+    
+    sure = expand(state_sure, clinched)
+    possible = expand(state_possible, clinched)
+    projected = expand(state_projected, clinched)
+    
+    return {
+        'games': relevant,
+        'clinched': sure.all(axis=0),
+        'eliminated': ~possible.any(axis=0),
+        'sure': sure,
+        'possible': possible,
+        'projected': projected
+    }
+
+
+def _matching(outcomes: np.ndarray, results: Dict[int, int]) -> np.ndarray:
+    """Mask of the outcomes consistent with the given {bit: 0/1} game results"""
+    mask = sum(1 << bit for bit in results)
+    value = sum(won << bit for bit, won in results.items())
+    return (outcomes & mask) == value
+
+
+def _minimal_outcomes(made_it: np.ndarray, preferred: np.ndarray, drop_order: List[int]) -> Optional[Dict[int, int]]:
     """
-    Calculate playoff scenarios for Week 15
+    Smallest sufficient set of game results, as {bit: 0/1}: starts from the preferred outcome
+    the team makes it in and drops every result it turns out not to need. None if there is none.
+    """
+    candidates = np.flatnonzero(made_it)
+    if not len(candidates):
+        return None
+    start = int(candidates[np.argmax(preferred[candidates])])
+    
+    outcomes = np.arange(len(made_it), dtype=np.int64)
+    needed = {bit: (start >> bit) & 1 for bit in drop_order}
+    for bit in drop_order:
+        trial = {b: won for b, won in needed.items() if b != bit}
+        if made_it[_matching(outcomes, trial)].all():
+            needed = trial
+    return needed
+
+
+def calculate_playoff_scenarios(standings: List[Dict], remaining_matchups: List[Dict],
+                                playoff_spots: int = PLAYOFF_SPOTS) -> Dict:
+    """
+    Calculate exact playoff scenarios for the rest of the regular season
+    
+    Every win/loss combination of the remaining matchups is enumerated (see
+    enumerate_outcomes). Points For breaks ties on wins; since remaining scores are unknown,
+    "Locked" and "Eliminated" hold whatever the tiebreaks, while a team's needs use points_for
+    as it stands and call out when they also rely on the tiebreaker. With more than
+    MAX_ENUMERATED_GAMES undecided games only the locked / eliminated teams are worked out
+    (from win ranges) and the result has 'exact': False.
     
     Args:
         standings: List of team standings with 'team', 'wins', 'losses', 'points_for'
-        week15_matchups: List of Week 15 matchups with 'team1_name', 'team2_name'
+        remaining_matchups: Remaining matchups with 'team1_name', 'team2_name' (and 'week')
+        playoff_spots: Teams that make the playoffs
         
     Returns:
         Dictionary with playoff scenario information
@@ -25,17 +213,21 @@ def calculate_playoff_scenarios(standings: List[Dict], week15_matchups: List[Dic
         teams[team_name] = {
             'wins': s.get('wins', 0),
             'losses': s.get('losses', 0),
+            'ties': s.get('ties', 0),
             'points_for': s.get('points_for', 0.0),
             'current_record': f"{s.get('wins', 0)}-{s.get('losses', 0)}"
         }
+    names = list(teams)
+    team_ids = {name: i for i, name in enumerate(names)}
     
     # Normalize matchup team names
     normalized_matchups = []
-    for matchup in week15_matchups:
+    for matchup in remaining_matchups:
         t1 = normalize_team_name(matchup.get('team1_name', ''))
         t2 = normalize_team_name(matchup.get('team2_name', ''))
         if t1 and t2 and t1 in teams and t2 in teams:
             normalized_matchups.append({
+                'week': matchup.get('week'),
                 'team1': t1,
                 'team2': t2,
                 'team1_record': teams[t1]['current_record'],
@@ -43,112 +235,523 @@ def calculate_playoff_scenarios(standings: List[Dict], week15_matchups: List[Dic
                 'team1_points': teams[t1]['points_for'],
                 'team2_points': teams[t2]['points_for']
             })
+    weeks = sorted({m['week'] for m in normalized_matchups if m['week'] is not None})
+    current_week = weeks[0] if weeks else None
+    
+    games = [(team_ids[m['team1']], team_ids[m['team2']]) for m in normalized_matchups]
+    try:
+        result = enumerate_outcomes(
+            [teams[n]['wins'] + 0.5 * teams[n]['ties'] for n in names],
+            [teams[n]['points_for'] for n in names],
+            games,
+            playoff_spots
+        )
+    except TooManyGamesError as e:
+        # Too early in the season to enumerate: only what the win ranges settle is reported
+        result = {'clinched': e.clinched, 'eliminated': e.eliminated}
+    exact = 'sure' in result
+    bits = {g: bit for bit, g in enumerate(result['games'])} if exact else {}
+    outcomes = np.arange(result['sure'].shape[0] if exact else 0, dtype=np.int64)
     
-    # Sort teams by wins (desc), then points_for (desc)
-    sorted_teams = sorted(teams.items(), key=lambda x: (-x[1]['wins'], -x[1]['points_for']))
+    def week_label(m):
+        return f" in Week {m['week']}" if m['week'] is not None else ''
     
-    # Identify teams at 9-5 (locked for playoffs - top 3)
-    teams_at_9_5 = [name for name, data in sorted_teams if data['wins'] == 9 and data['losses'] == 5]
-    teams_at_9_5.sort(key=lambda x: -teams[x]['points_for'])
+    def describe(team_name, needed):
+        """Turn {bit: result} into readable needs, the team's own games first"""
+        own, others = [], []
+        for g, bit in bits.items():
+            if bit not in needed:
+                continue
+            m = normalized_matchups[g]
+            winner, loser = (m['team1'], m['team2']) if needed[bit] else (m['team2'], m['team1'])
+            if winner == team_name:
+                own.append(f'Win vs {loser}{week_label(m)}')
+            elif loser == team_name:
+                own.append(f'Lose vs {winner}{week_label(m)}')
+            else:
+                others.append(f'{loser} lose vs {winner}{week_label(m)}')
+        return own + others
     
-    # Calculate scenarios
     locked_teams = []
     can_make_it = []
     eliminated = []
     
-    # Teams at 9-5 are locked (top 4 make playoffs, and these 3 are at 9-5)
-    # Even if they lose Week 15, they'd be 9-6, and only 1 other team (The Ratpack at 8-6) could reach 9-6
-    for team_name in teams_at_9_5:
-        locked_teams.append({
-            'team': team_name,
-            'record': teams[team_name]['current_record'],
-            'points_for': teams[team_name]['points_for'],
-            'status': 'Locked for Playoffs',
-            'reason': '9-5 record (cannot be eliminated)'
-        })
-    
-    # Check The Ratpack (8-6) - they control their destiny
-    ratpack_name = None
-    for team_name, team_data in teams.items():
-        if team_name == 'The Ratpack' and team_data['wins'] == 8 and team_data['losses'] == 6:
-            ratpack_name = team_name
-            # Check their Week 15 matchup
-            ratpack_matchup = None
-            for matchup in normalized_matchups:
-                if matchup['team1'] == team_name or matchup['team2'] == team_name:
-                    ratpack_matchup = matchup
-                    break
-            
-            if ratpack_matchup:
-                opponent = ratpack_matchup['team2'] if ratpack_matchup['team1'] == team_name else ratpack_matchup['team1']
-                can_make_it.append({
-                    'team': team_name,
-                    'record': team_data['current_record'],
-                    'points_for': team_data['points_for'],
-                    'status': 'Controls Own Destiny',
-                    'needs': f'Win vs {opponent} in Week 15',
-                    'opponent': opponent,
-                    'opponent_record': teams[opponent]['current_record']
-                })
-            break
-    
-    # Check teams at 7-7 (Mebs Militia, Freshie Vice, cheeseheads)
-    # They need to win AND have The Ratpack lose to make playoffs
-    teams_at_7_7 = [name for name, data in teams.items() if data['wins'] == 7 and data['losses'] == 7]
-    teams_at_7_7.sort(key=lambda x: -teams[x]['points_for'])
-    
-    for team_name in teams_at_7_7:
-        # Find their Week 15 matchup
-        team_matchup = None
-        for matchup in normalized_matchups:
-            if matchup['team1'] == team_name or matchup['team2'] == team_name:
-                team_matchup = matchup
-                break
+    for team_name in names:
+        i = team_ids[team_name]
+        data = teams[team_name]
+        own_games = [g for g, (a, b) in enumerate(games) if i in (a, b)]
+        opponent = None
+        if own_games:
+            a, b = games[own_games[0]]
+            opponent = names[b] if a == i else names[a]
         
-        if team_matchup:
-            opponent = team_matchup['team2'] if team_matchup['team1'] == team_name else team_matchup['team1']
-            needs = []
-            needs.append(f'Win vs {opponent} in Week 15')
-            if ratpack_name:
-                # Find Ratpack's opponent
-                for m in normalized_matchups:
-                    if m['team1'] == ratpack_name or m['team2'] == ratpack_name:
-                        ratpack_opponent = m['team2'] if m['team1'] == ratpack_name else m['team1']
-                        needs.append(f'{ratpack_name} lose vs {ratpack_opponent}')
-                        break
-            
-            can_make_it.append({
+        if result['clinched'][i]:
+            locked_teams.append({
                 'team': team_name,
-                'record': teams[team_name]['current_record'],
-                'points_for': teams[team_name]['points_for'],
-                'status': 'Needs Help',
-                'needs': needs,
-                'opponent': opponent,
-                'opponent_record': teams[opponent]['current_record']
+                'record': data['current_record'],
+                'points_for': data['points_for'],
+                'status': 'Locked for Playoffs',
+                'reason': f"{data['current_record']} record (cannot be eliminated)"
             })
-    
-    # All other teams are eliminated
-    locked_team_names = {t['team'] for t in locked_teams}
-    can_make_team_names = {t['team'] for t in can_make_it}
-    
-    for team_name, team_data in teams.items():
-        if team_name not in locked_team_names and team_name not in can_make_team_names:
+            continue
+        if result['eliminated'][i]:
             eliminated.append({
                 'team': team_name,
-                'record': team_data['current_record'],
-                'points_for': team_data['points_for'],
+                'record': data['current_record'],
+                'points_for': data['points_for'],
                 'status': 'Eliminated'
             })
+            continue
+        if not exact:
+            entry = {
+                'team': team_name,
+                'record': data['current_record'],
+                'points_for': data['points_for'],
+                'status': 'Needs Help',
+                'needs': []
+            }
+            if opponent:
+                entry['opponent'] = opponent
+                entry['opponent_record'] = teams[opponent]['current_record']
+            can_make_it.append(entry)
+            continue
+        
+        # Outcomes scored by how many of its own games the team wins
+        own_bits = [(bits[g], games[g][0] == i) for g in own_games if g in bits]
+        own_wins = np.zeros(len(outcomes), dtype=np.int64)
+        for bit, is_team1 in own_bits:
+            won = (outcomes >> bit) & 1
+            own_wins += won if is_team1 else 1 - won
+        wins_out = own_wins == len(own_bits)
+        
+        # Other teams' results are dropped first, so needs lean on the team's own games
+        own_bit_set = {bit for bit, _ in own_bits}
+        drop_order = [bit for bit in range(len(bits)) if bit not in own_bit_set] + sorted(own_bit_set)
+        
+        needs_tiebreak = not result['projected'][:, i].any()
+        made_it = result['possible'][:, i] if needs_tiebreak else result['projected'][:, i]
+        needed = _minimal_outcomes(made_it, own_wins, drop_order) or {}
+        needs = describe(team_name, needed)
+        if needs_tiebreak or not result['sure'][_matching(outcomes, needed), i].all():
+            needs.append('Win the Points For tiebreaker')
+        
+        controls_destiny = bool(own_bits) and result['projected'][wins_out, i].all()
+        entry = {
+            'team': team_name,
+            'record': data['current_record'],
+            'points_for': data['points_for'],
+            'status': 'Controls Own Destiny' if controls_destiny else 'Needs Help',
+            'needs': needs[0] if controls_destiny and len(needs) == 1 else needs,
+            'outcomes_in': int(np.count_nonzero(made_it)),
+            'outcomes_total': len(outcomes)
+        }
+        if opponent:
+            entry['opponent'] = opponent
+            entry['opponent_record'] = teams[opponent]['current_record']
+        can_make_it.append(entry)
     
     # Sort by wins, then points
-    can_make_it.sort(key=lambda x: (-teams[x['team']]['wins'], -teams[x['team']]['points_for']))
-    eliminated.sort(key=lambda x: (-teams[x['team']]['wins'], -teams[x['team']]['points_for']))
+    def sort_key(x):
+        return (-teams[x['team']]['wins'], -teams[x['team']]['points_for'])
+    locked_teams.sort(key=sort_key)
+    can_make_it.sort(key=sort_key)
+    eliminated.sort(key=sort_key)
     
     return {
         'locked': locked_teams,
         'can_make_it': can_make_it,
         'eliminated': eliminated,
-        'week15_matchups': normalized_matchups,
-        'playoff_spots': 4,
-        'current_week': 15
+        'week15_matchups': [m for m in normalized_matchups if m['week'] == current_week],
+        'remaining_matchups': normalized_matchups,
+        'remaining_weeks': weeks,
+        'playoff_spots': playoff_spots,
+        'current_week': current_week,
+        # False when too many games are left to enumerate (only clinched / eliminated are exact)
+        'exact': exact
+    }
+
+
+# ----------------------------------------------------------------------
+# Monte Carlo playoff odds
+# ----------------------------------------------------------------------
+
+# Fewest current-season scores a team needs before its own sample is used on its own
+MIN_SCORE_SAMPLES = 5
+
+# Simulations per work unit; runs are split into fixed chunks with their own seeds,
+# so a given seed gives the same answer with or without a process pool
+SIMS_PER_CHUNK = 25000
+
+# Below this many simulations a process pool costs more to start than it saves
+MIN_POOL_SIMS = 250000
+
+
+def build_season_state(matchups: List[Dict], standings: List[Dict], year: int) -> Dict:
+    """
+    Derive the inputs for the playoff odds from the raw data for one season.
+    
+    Args:
+        matchups: load_from_csv-style matchups (any seasons)
+        standings: regular season standings rows for `year` (team_name/team, wins, losses, ties, points_for)
+        year: The season
+        
+    Returns:
+        {
+            'standings': [{'team', 'wins', 'losses', 'ties', 'points_for'}],
+            'completed_weeks': regular season weeks already reflected in the standings,
+            'remaining_matchups': [{'week', 'team1_name', 'team2_name'}] still to be played,
+            'score_samples': {team: [scores]} each team's empirical scoring distribution
+        }
+    """
+    formatted = []
+    for s in standings:
+        formatted.append({
+            'team': normalize_team_name(s.get('team', s.get('team_name', ''))),
+            'wins': s.get('wins', 0),
+            'losses': s.get('losses', 0),
+            'ties': s.get('ties', 0),
+            'points_for': s.get('points_for', 0.0)
+        })
+    teams = {s['team'] for s in formatted}
+    completed_weeks = max((s['wins'] + s['losses'] + s['ties'] for s in formatted), default=0)
+    
+    remaining = []
+    current_scores = defaultdict(list)
+    past_scores = defaultdict(list)
+    for m in matchups:
+        if m.get('week_type', 'regular') not in REGULAR_WEEK_TYPES:
+            continue
+        t1 = normalize_team_name(m.get('team1_name', ''))
+        t2 = normalize_team_name(m.get('team2_name', ''))
+        if t1 not in teams or t2 not in teams:
+            continue
+        
+        m_year = m.get('year', 0)
+        week = m.get('week', 0)
+        if m_year == year:
+            if week > completed_weeks:
+                remaining.append({'week': week, 'team1_name': t1, 'team2_name': t2})
+            else:
+                current_scores[t1].append(m.get('team1_score', 0))
+                current_scores[t2].append(m.get('team2_score', 0))
+        elif m_year < year:
+            past_scores[t1].append((m_year, week, m.get('team1_score', 0)))
+            past_scores[t2].append((m_year, week, m.get('team2_score', 0)))
+    
+    # Early in a season, top a team's sample up with its most recent past scores, and a
+    # team with no history (e.g. a new owner) with the whole league's scores this season
+    league_scores = [score for team in sorted(teams) for score in current_scores[team]]
+    score_samples = {}
+    for team in sorted(teams):
+        scores = list(current_scores[team])
+        if len(scores) < MIN_SCORE_SAMPLES:
+            history = sorted(past_scores[team], reverse=True)
+            scores += [score for _, _, score in history[:MIN_SCORE_SAMPLES * 3]]
+        if len(scores) < MIN_SCORE_SAMPLES:
+            scores += league_scores
+        score_samples[team] = scores
+    
+    remaining.sort(key=lambda m: m['week'])
+    return {
+        'standings': formatted,
+        'completed_weeks': completed_weeks,
+        'remaining_matchups': remaining,
+        'score_samples': score_samples
+    }
+
+
+def _check_bracket(playoff_spots: int, bye_spots: int):
+    """Raise ValueError unless the format is a single-elimination bracket (byes in round one only)"""
+    first_round = playoff_spots - bye_spots
+    after_first = bye_spots + first_round // 2
+    if (playoff_spots < 2 or not 0 <= bye_spots < playoff_spots or first_round % 2
+            or after_first & (after_first - 1)):
+        raise ValueError(f"Invalid playoff format: {playoff_spots} spots, {bye_spots} byes")
+
+
+def _sample_scores(rng, pools, pool_sizes, team_ids):
+    """Draw one score per entry of team_ids from that team's empirical distribution"""
+    picks = (rng.random(team_ids.shape) * pool_sizes[team_ids]).astype(np.int64)
+    return pools[team_ids, picks]
+
+
+def _simulate_chunk(args) -> Dict[str, np.ndarray]:
+    """Simulate one chunk of seasons; returns per-team counts (runs in worker processes too)"""
+    (n_sims, seed_seq, base_wins, base_points, game_team1, game_team2,
+     pools, pool_sizes, playoff_spots, bye_spots) = args
+    rng = np.random.default_rng(seed_seq)
+    n_teams = len(base_wins)
+    
+    # Remaining regular season: (sims x games) scores, turned into per-team wins/points
+    wins = np.broadcast_to(base_wins, (n_sims, n_teams)).copy()
+    points = np.broadcast_to(base_points, (n_sims, n_teams)).copy()
+    if len(game_team1):
+        score1 = _sample_scores(rng, pools, pool_sizes, np.broadcast_to(game_team1, (n_sims, len(game_team1))))
+        score2 = _sample_scores(rng, pools, pool_sizes, np.broadcast_to(game_team2, (n_sims, len(game_team2))))
+        one_hot1 = np.eye(n_teams)[game_team1]
+        one_hot2 = np.eye(n_teams)[game_team2]
+        wins += (score1 > score2) @ one_hot1 + (score2 > score1) @ one_hot2
+        wins += 0.5 * (score1 == score2) @ (one_hot1 + one_hot2)
+        points += score1 @ one_hot1 + score2 @ one_hot2
+    
+    # Seed order: wins, then points_for (stable, so exact ties fall back to team order)
+    order = np.lexsort((-points, -wins), axis=-1)
+    seeds = np.empty_like(order)
+    np.put_along_axis(seeds, order, np.arange(n_teams)[None, :], axis=1)
+    
+    # Playoff bracket on seed numbers: best remaining seed plays worst, higher seed wins ties
+    alive = np.broadcast_to(np.arange(playoff_spots), (n_sims, playoff_spots))
+    byes = bye_spots
+    while alive.shape[1] > 1:
+        resting, playing = alive[:, :byes], alive[:, byes:]
+        half = playing.shape[1] // 2
+        high, low = playing[:, :half], playing[:, half:][:, ::-1]
+        high_teams = np.take_along_axis(order, high, axis=1)
+        low_teams = np.take_along_axis(order, low, axis=1)
+        high_scores = _sample_scores(rng, pools, pool_sizes, high_teams)
+        low_scores = _sample_scores(rng, pools, pool_sizes, low_teams)
+        winners = np.where(low_scores > high_scores, low, high)
+        alive = np.sort(np.concatenate((resting, winners), axis=1), axis=1)
+        byes = 0
+    champions = order[np.arange(n_sims), alive[:, 0]]
+    
+    return {
+        'playoff': np.count_nonzero(seeds < playoff_spots, axis=0),
+        'bye': np.count_nonzero(seeds < bye_spots, axis=0),
+        'championship': np.bincount(champions, minlength=n_teams),
+        'spoon': np.count_nonzero(seeds == n_teams - 1, axis=0),
+        'seed_sum': seeds.sum(axis=0) + n_sims,  # 1-based seeds
+        'wins_sum': wins.sum(axis=0)
+    }
+
+
+def simulate_playoff_odds(standings: List[Dict], remaining_matchups: List[Dict],
+                          score_samples: Dict[str, List[float]], n_sims: int = 100000,
+                          seed: Optional[int] = None, playoff_spots: int = PLAYOFF_SPOTS,
+                          bye_spots: int = BYE_SPOTS, processes: Optional[int] = None) -> Dict:
+    """
+    Monte Carlo playoff odds.
+    
+    Every simulated season plays the remaining matchups by drawing each team's score from
+    its empirical distribution, seeds the teams by wins then points_for, and plays out the
+    playoff bracket the same way.
+    
+    Args:
+        standings: Current standings with 'team' (or 'team_name'), 'wins', 'ties', 'points_for'
+        remaining_matchups: Unplayed matchups with 'team1_name', 'team2_name'
+        score_samples: {team: [scores]} to sample from (see build_season_state)
+        n_sims: Number of simulated seasons
+        seed: Random seed, for reproducible results
+        playoff_spots: Teams that make the playoffs
+        bye_spots: Top seeds that skip the first playoff round
+        processes: Fan the chunks out over this many worker processes (None = in-process;
+            ignored below MIN_POOL_SIMS simulations, capped at the CPU count)
+        
+    Returns:
+        {'simulations', 'seed', 'playoff_spots', 'bye_spots', 'remaining_games',
+         'teams': [{'team', 'wins', 'losses', 'points_for', 'playoff', 'bye', 'championship',
+                    'spoon', 'avg_seed', 'avg_wins'}]} with probabilities in 0-1, sorted by playoff odds
+    """
+    _check_bracket(playoff_spots, bye_spots)
+    if n_sims < 1:
+        raise ValueError("n_sims must be at least 1")
+    
+    teams = [normalize_team_name(s.get('team', s.get('team_name', ''))) for s in standings]
+    team_ids = {team: i for i, team in enumerate(teams)}
+    if len(teams) < playoff_spots:
+        raise ValueError(f"Need at least {playoff_spots} teams, got {len(teams)}")
+    
+    # Ties count as half a win for seeding
+    base_wins = np.array([s.get('wins', 0) + 0.5 * s.get('ties', 0) for s in standings], dtype=np.float64)
+    base_points = np.array([s.get('points_for', 0.0) for s in standings], dtype=np.float64)
+    
+    games = [(team_ids[normalize_team_name(m.get('team1_name', ''))], team_ids[normalize_team_name(m.get('team2_name', ''))])
+             for m in remaining_matchups
+             if normalize_team_name(m.get('team1_name', '')) in team_ids and normalize_team_name(m.get('team2_name', '')) in team_ids]
+    game_team1 = np.array([g[0] for g in games], dtype=np.int64)
+    game_team2 = np.array([g[1] for g in games], dtype=np.int64)
+    
+    # Padded (teams x samples) score pools; teams without any scores use the league's
+    league_pool = [score for team in teams for score in score_samples.get(team, [])] or [0.0]
+    team_pools = [list(score_samples.get(team) or league_pool) for team in teams]
+    pool_sizes = np.array([len(p) for p in team_pools], dtype=np.int64)
+    pools = np.zeros((len(teams), pool_sizes.max()), dtype=np.float64)
+    for i, pool in enumerate(team_pools):
+        pools[i, :len(pool)] = pool
+    
+    chunk_sizes = [SIMS_PER_CHUNK] * (n_sims // SIMS_PER_CHUNK)
+    if n_sims % SIMS_PER_CHUNK:
+        chunk_sizes.append(n_sims % SIMS_PER_CHUNK)
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    work = [(size, seed_seq, base_wins, base_points, game_team1, game_team2,
+             pools, pool_sizes, playoff_spots, bye_spots)
+            for size, seed_seq in zip(chunk_sizes, seed_seqs)]
+    
+    if processes and processes > 1 and n_sims >= MIN_POOL_SIMS:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(processes, len(work), os.cpu_count() or 1)) as pool:
+            chunks = list(pool.map(_simulate_chunk, work))
+    else:
+        chunks = [_simulate_chunk(args) for args in work]
+    
+    totals = {key: sum(chunk[key] for chunk in chunks) for key in chunks[0]}
+    
+    results = []
+    for i, team in enumerate(teams):
+        s = standings[i]
+        results.append({
+            'team': team,
+            'wins': s.get('wins', 0),
+            'losses': s.get('losses', 0),
+            'points_for': s.get('points_for', 0.0),
+            'playoff': round(float(totals['playoff'][i]) / n_sims, 4),
+            'bye': round(float(totals['bye'][i]) / n_sims, 4),
+            'championship': round(float(totals['championship'][i]) / n_sims, 4),
+            'spoon': round(float(totals['spoon'][i]) / n_sims, 4),
+            'avg_seed': round(float(totals['seed_sum'][i]) / n_sims, 2),
+            'avg_wins': round(float(totals['wins_sum'][i]) / n_sims, 2)
+        })
+    results.sort(key=lambda x: (-x['playoff'], x['avg_seed']))
+    
+    return {
+        'simulations': n_sims,
+        'seed': seed,
+        'playoff_spots': playoff_spots,
+        'bye_spots': bye_spots,
+        'remaining_games': len(games),
+        'teams': results
     }
+
+
+# ----------------------------------------------------------------------
+# Playoff odds history (week by week replays)
+# ----------------------------------------------------------------------
+
+# Bump when the replay or simulation changes, so cached histories are recomputed
+HISTORY_VERSION = 1
+HISTORY_SIMS = 10000
+
+
+def _standings_through_week(season_matchups: List[Dict], week: int) -> List[Dict]:
+    """
+    Regular season standings from a season's matchups, counting weeks 1..week. Games
+    without a winner yet (not played) are left out; a winner of 'Tie' is a tie for both.
+    """
+    records = {}
+    for m in season_matchups:
+        t1 = normalize_team_name(m.get('team1_name', ''))
+        t2 = normalize_team_name(m.get('team2_name', ''))
+        for team in (t1, t2):
+            records.setdefault(team, {'team': team, 'wins': 0, 'losses': 0, 'ties': 0, 'points_for': 0.0})
+        winner_name = m.get('winner', '') or ''
+        if m.get('week', 0) > week or not winner_name:
+            continue
+        
+        winner = 'Tie' if winner_name.lower() == 'tie' else normalize_team_name(winner_name)
+        for team, score in ((t1, m.get('team1_score', 0)), (t2, m.get('team2_score', 0))):
+            records[team]['points_for'] += score
+            if winner == 'Tie':
+                records[team]['ties'] += 1
+            elif winner == team:
+                records[team]['wins'] += 1
+            else:
+                records[team]['losses'] += 1
+    return sorted(records.values(), key=lambda s: (-s['wins'], -s['points_for']))
+
+
+def _season_matchups(matchups: List[Dict], year: int) -> List[Dict]:
+    return [m for m in matchups
+            if m.get('year') == year and m.get('week_type', 'regular') in REGULAR_WEEK_TYPES
+            and m.get('team1_name') and m.get('team2_name')]
+
+
+def history_cache_key(matchups: List[Dict], year: int, weeks_played: int,
+                      n_sims: int = HISTORY_SIMS, seed: int = 0) -> str:
+    """
+    Content hash of everything a season's history depends on: its regular season and every
+    season before it (early weeks top score samples up from a team's latest past games,
+    however far back), the weeks replayed and the simulation settings
+    """
+    rows = [(m.get('year'), m.get('week'), m.get('week_type'), m.get('team1_name'), m.get('team2_name'),
+             m.get('team1_score'), m.get('team2_score'), m.get('winner'))
+            for m in matchups
+            if m.get('year', 0) <= year and m.get('week_type', 'regular') in REGULAR_WEEK_TYPES]
+    payload = json.dumps([HISTORY_VERSION, year, weeks_played, n_sims, seed, rows], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _replay_week(args) -> Dict:
+    """Playoff odds as of one week (runs in worker processes too)"""
+    standings, remaining, score_samples, n_sims, seed = args
+    return simulate_playoff_odds(standings, remaining, score_samples, n_sims=n_sims, seed=seed)
+
+
+def playoff_odds_history(matchups: List[Dict], weeks_played: Dict[int, int], n_sims: int = HISTORY_SIMS,
+                         seed: int = 0, processes: Optional[int] = None) -> Dict[int, Dict]:
+    """
+    Replay seasons week by week: after each regular season week, rebuild the standings from
+    the matchups and run the playoff odds simulation with the rest of that season's schedule.
+    
+    Args:
+        matchups: load_from_csv-style matchups (all seasons)
+        weeks_played: {year: regular season weeks to replay} for each season wanted
+        n_sims: Simulations per week
+        seed: Base seed; every (year, week) gets its own, so results don't depend on `processes`
+        processes: Replay the weeks over this many worker processes (None = in-process;
+            capped at the CPU count)
+        
+    Returns:
+        {year: {'year', 'weeks': [1, 2, ...], 'simulations',
+                'teams': {team: {'playoff': [...], 'championship': [...], 'spoon': [...]}}}}
+        with one probability per replayed week
+    """
+    work = []
+    for year, n_weeks in sorted(weeks_played.items()):
+        season = _season_matchups(matchups, year)
+        weeks = sorted({m.get('week', 0) for m in season})[:n_weeks]
+        for week in weeks:
+            state = build_season_state(matchups, _standings_through_week(season, week), year)
+            work.append((year, week, (state['standings'], state['remaining_matchups'], state['score_samples'],
+                                      n_sims, seed * 1000000 + year * 100 + week)))
+    
+    if processes and processes > 1 and len(work) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(processes, len(work), os.cpu_count() or 1)) as pool:
+            results = list(pool.map(_replay_week, [args for _, _, args in work], chunksize=4))
+    else:
+        results = [_replay_week(args) for _, _, args in work]
+    
+    histories = {}
+    for (year, week, _), odds in zip(work, results):
+        history = histories.setdefault(year, {'year': year, 'weeks': [], 'simulations': n_sims, 'teams': {}})
+        history['weeks'].append(week)
+        for team in odds['teams']:
+            curves = history['teams'].setdefault(team['team'], {'playoff': [], 'championship': [], 'spoon': []})
+            for key in curves:
+                curves[key].append(team[key])
+    return histories
+
+
+def load_cached_history(cache_dir: str, year: int, key: str) -> Optional[Dict]:
+    path = os.path.join(cache_dir, f'playoff_odds_{year}_{key[:16]}.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_history(cache_dir: str, year: int, key: str, history: Dict):
+    """Write a season's history atomically and drop that season's stale entries"""
+    os.makedirs(cache_dir, exist_ok=True)
+    name = f'playoff_odds_{year}_{key[:16]}.json'
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(history, f)
+    os.replace(tmp_path, os.path.join(cache_dir, name))
+    for stale in os.listdir(cache_dir):
+        if stale.startswith(f'playoff_odds_{year}_') and stale != name:
+            try:
+                os.remove(os.path.join(cache_dir, stale))
+            except OSError:
+                pass
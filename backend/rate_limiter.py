@@ -0,0 +1,57 @@
+"""
+Rate Limiter
+Token bucket shared by every thread of a scraper: at most `requests_per_second` requests
+on average (bursts up to `burst`) and at most `max_in_flight` at the same time.
+"""
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Use as a context manager around each request:
+
+        with limiter:
+            response = session.get(url)
+    """
+
+    def __init__(self, requests_per_second: float = 2.0, max_in_flight: int = 4, burst: int = 1):
+        if requests_per_second <= 0:
+            raise ValueError('requests_per_second must be positive')
+        self.requests_per_second = requests_per_second
+        self.max_in_flight = max_in_flight
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+
+    def acquire(self):
+        """Block until a request may start"""
+        self._in_flight.acquire()
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.requests_per_second)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.requests_per_second
+                time.sleep(wait)
+        except BaseException:
+            self._in_flight.release()
+            raise
+
+    def release(self):
+        """Mark a request as finished"""
+        self._in_flight.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
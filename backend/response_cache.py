@@ -0,0 +1,92 @@
+"""
+Response Cache
+Serialized JSON responses kept per (route, normalized query args, data generation), with a
+strong ETag so a client that already has the current body gets a 304 instead of the
+handler recomputing and re-serializing it.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Hashable, Optional, Tuple
+
+from flask import current_app, request
+
+MAX_ENTRIES = 256
+
+
+class ResponseCache:
+    """
+    LRU of successful GET responses. `generation` returns a hashable value that changes
+    whenever the underlying data changes (so stale entries simply stop being hit).
+    """
+
+    def __init__(self, generation: Callable[[], Hashable], max_entries: int = MAX_ENTRIES):
+        self.generation = generation
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (body bytes, mimetype, etag)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalized_args():
+        return tuple(sorted((key, tuple(values)) for key, values in request.args.lists()))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _respond(self, body: bytes, mimetype: str, etag: str):
+        response = current_app.response_class(body, status=200, mimetype=mimetype)
+        response.set_etag(etag)
+        # Always revalidate; a matching ETag costs the client a 304
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+
+    def _lookup(self, key, func, *args, **kwargs):
+        """
+        (entry, None) with the cached or freshly stored (body, mimetype, etag) for key, or
+        (None, response) when func's response is not a cacheable 200.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry, None
+        response = current_app.make_response(func(*args, **kwargs))
+        if response.status_code != 200 or response.direct_passthrough:
+            return None, response
+        body = response.get_data()
+        entry = (body, response.mimetype, hashlib.sha1(body).hexdigest())
+        self.put(key, entry)
+        return entry, None
+
+    def cached(self, view: Optional[Callable] = None):
+        """Decorator for a GET view. Only 200 responses are stored; errors pass through."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (request.path, self._normalized_args(), self.generation())
+                entry, response = self._lookup(key, func, *args, **kwargs)
+                return response if entry is None else self._respond(*entry)
+            return wrapper
+        return decorator(view) if view is not None else decorator
+
+    def body(self, path: str, view: Callable) -> Tuple[int, bytes]:
+        """
+        (status, JSON body) of a cached view as served at path with no query args, sharing
+        entries with the view's own route (view is the undecorated function).
+        """
+        entry, response = self._lookup((path, (), self.generation()), view)
+        return (response.status_code, response.get_data()) if entry is None else (200, entry[0])
@@ -0,0 +1,162 @@
+"""
+Schedule Swap
+"Schedule luck" grid: every team's record had it played every other team's schedule,
+keeping its own weekly scores. Computed per season as one (weeks x teams x teams)
+comparison, and cached per season by content, so after a refresh only the season
+whose games changed (normally the current one) is recomputed.
+"""
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from all_play import score_matrix
+from matchup_table import MatchupTable
+
+# {year: (content digest, grid)} shared by every request
+_grid_cache: Dict[int, Tuple[str, Dict]] = {}
+_grid_cache_lock = threading.Lock()
+
+
+def _season_digest(table: MatchupTable, rows: np.ndarray) -> str:
+    digest = hashlib.sha1()
+    for column in (table.week, table.team1, table.team2, table.score1, table.score2):
+        digest.update(np.ascontiguousarray(column[rows]).tobytes())
+    return digest.hexdigest()
+
+
+def season_grid(table: MatchupTable, year: int, max_week: Optional[int] = None) -> Dict:
+    """
+    Schedule swap grid for one season.
+
+    wins[a][b] is team a's wins with team b's schedule (a's scores against the scores of
+    b's opponents; the week b played a, a plays b instead). The diagonal is the actual record.
+
+    Returns:
+        {'year', 'teams': [names], 'wins', 'losses', 'ties': T x T lists,
+         'summary': [{'team', 'actual_wins', 'avg_wins', 'best_wins', 'best_schedule',
+                      'worst_wins', 'worst_schedule', 'schedule_luck'}]}
+    """
+    scores, weeks, team_ids, rows = score_matrix(table, year, max_week)
+    n_weeks, n_teams = scores.shape
+
+    # Opponent index per (week, team), -1 if the team did not play
+    opponents = np.full((n_weeks, n_teams), -1, dtype=np.int64)
+    week_index = np.searchsorted(weeks, table.week[rows])
+    index1 = np.searchsorted(team_ids, table.team1[rows])
+    index2 = np.searchsorted(team_ids, table.team2[rows])
+    opponents[week_index, index1] = index2
+    opponents[week_index, index2] = index1
+
+    # faced[w, a, b]: who a faces in week w on b's schedule
+    teams = np.arange(n_teams)
+    faced = np.broadcast_to(opponents[:, None, :], (n_weeks, n_teams, n_teams)).copy()
+    faced = np.where(faced == teams[None, :, None], teams[None, None, :], faced)
+    has_game = (faced >= 0) & ~np.isnan(scores)[:, :, None]
+
+    own = np.broadcast_to(scores[:, :, None], faced.shape)
+    other = np.take_along_axis(scores, np.clip(faced, 0, None).reshape(n_weeks, -1), axis=1).reshape(faced.shape)
+    wins = ((own > other) & has_game).sum(axis=0)
+    losses = ((own < other) & has_game).sum(axis=0)
+    ties = ((own == other) & has_game).sum(axis=0)
+
+    names = [table.team_name(int(t)) for t in team_ids]
+    summary = []
+    for a, team in enumerate(names):
+        row = wins[a] + 0.5 * ties[a]
+        best, worst = int(np.argmax(row)), int(np.argmin(row))
+        summary.append({
+            'team': team,
+            'actual_wins': int(wins[a, a]),
+            'avg_wins': round(float(row.mean()), 2),
+            'best_wins': int(wins[a, best]),
+            'best_schedule': names[best],
+            'worst_wins': int(wins[a, worst]),
+            'worst_schedule': names[worst],
+            'schedule_luck': round(float(row[a] - row.mean()), 2)
+        })
+    summary.sort(key=lambda x: x['schedule_luck'], reverse=True)
+
+    return {
+        'year': year,
+        'teams': names,
+        'wins': wins.tolist(),
+        'losses': losses.tolist(),
+        'ties': ties.tolist(),
+        'summary': summary
+    }
+
+
+def calculate_schedule_swaps(table: MatchupTable, weeks_played: Optional[Dict[int, int]] = None) -> Dict[int, Dict]:
+    """
+    Schedule swap grids for every season; seasons whose games have not changed since the
+    last call are served from the cache.
+
+    Args:
+        table: All matchups
+        weeks_played: Optional {year: last regular season week to count}
+    """
+    weeks_played = weeks_played or {}
+    grids = {}
+    for year in np.unique(table.year).tolist():
+        max_week = weeks_played.get(year)
+        _, _, _, rows = score_matrix(table, year, max_week)
+        if not len(rows):
+            continue
+
+        digest = _season_digest(table, rows)
+        with _grid_cache_lock:
+            cached = _grid_cache.get(year)
+        if cached is not None and cached[0] == digest:
+            grids[year] = cached[1]
+            continue
+
+        grid = season_grid(table, year, max_week)
+        with _grid_cache_lock:
+            _grid_cache[year] = (digest, grid)
+        grids[year] = grid
+    return grids
+
+
+def all_time_schedule_swaps(grids: Dict[int, Dict]) -> Dict:
+    """
+    Sum the season grids over every season each pair of teams shared.
+
+    Returns:
+        {'teams', 'wins', 'losses', 'ties', 'seasons': T x T lists (seasons[a][b] = seasons
+         summed into that cell), 'summary': [{'team', 'seasons', 'actual_wins', 'avg_wins',
+         'schedule_luck'}]}
+    """
+    names = sorted({team for grid in grids.values() for team in grid['teams']})
+    index = {team: i for i, team in enumerate(names)}
+    n = len(names)
+    totals = {key: np.zeros((n, n), dtype=np.int64) for key in ('wins', 'losses', 'ties', 'seasons')}
+    actual = np.zeros(n)
+    expected = np.zeros(n)
+    seasons = np.zeros(n, dtype=np.int64)
+
+    for grid in grids.values():
+        ids = np.array([index[team] for team in grid['teams']], dtype=np.int64)
+        cells = np.ix_(ids, ids)
+        for key in ('wins', 'losses', 'ties'):
+            totals[key][cells] += np.array(grid[key], dtype=np.int64)
+        totals['seasons'][cells] += 1
+        season_wins = np.array(grid['wins']) + 0.5 * np.array(grid['ties'])
+        actual[ids] += np.diag(season_wins)
+        expected[ids] += season_wins.mean(axis=1)
+        seasons[ids] += 1
+
+    summary = [{
+        'team': team,
+        'seasons': int(seasons[i]),
+        'actual_wins': round(float(actual[i]), 1),
+        'avg_wins': round(float(expected[i]), 2),
+        'schedule_luck': round(float(actual[i] - expected[i]), 2)
+    } for i, team in enumerate(names)]
+    summary.sort(key=lambda x: x['schedule_luck'], reverse=True)
+
+    result = {key: values.tolist() for key, values in totals.items()}
+    result['teams'] = names
+    result['summary'] = summary
+    return result
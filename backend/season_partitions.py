@@ -0,0 +1,283 @@
+"""
+Season Partitions
+Closed seasons never change, so their aggregates are computed once and frozen to
+data/cache/seasons/<year>.json: standings (regular and final), playoff records, winning
+scores and weekly award candidates. Only
+the live season (the latest one with any matchups or standings) is recomputed from the
+raw rows when the data changes; all-time figures merge the frozen partials with it.
+
+Each frozen file records a fingerprint of the rows it was built from, so a closed season
+that is re-imported (e.g. import_historical --force) is rebuilt instead of served stale.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from analytics_engine import AnalyticsEngine, WeeklyAwardsAccumulator
+
+# Bump when the partition layout or any aggregate's definition changes
+PARTITION_VERSION = 1
+
+# Weeks with this many games are playoff (4) or championship (2) weeks
+PLAYOFF_WEEK_GAMES = (4, 2)
+
+
+def live_season(years: Iterable[int]) -> Optional[int]:
+    """The season still being played (or last played): the latest year in the data"""
+    return max(years, default=None)
+
+
+def _fingerprint(matchups: List[Dict], regular: List[Dict], final: List[Dict]) -> str:
+    """Hash of a season's source rows (scrape timestamps aside)"""
+    digest = hashlib.sha1()
+    for rows in (matchups, regular, final):
+        for row in rows:
+            digest.update(json.dumps([[k, v] for k, v in sorted(row.items()) if k != 'scraped_at']).encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def summarize_season(year: int, matchups: List[Dict], regular: List[Dict], final: List[Dict]) -> Dict:
+    """
+    Aggregate one season.
+
+    Args:
+        year: Season
+        matchups: The season's load_from_csv-style matchups, in file order
+        regular: The season's regular season standings rows (normalized team names)
+        final: The season's final standings rows (normalized team names)
+
+    Returns:
+        The partition dict (JSON-serializable)
+    """
+    engine = AnalyticsEngine(accumulators=[WeeklyAwardsAccumulator(limit=None)], current_year=year)
+    engine.add_matchups(matchups)
+
+    games_per_week = defaultdict(int)
+    for matchup in matchups:
+        games_per_week[matchup.get('week', 0)] += 1
+
+    teams = set()
+    playoff_records = {}
+    league_winning = [0, 0.0]
+    team_winning = {}
+    for matchup in matchups:
+        game = engine.to_game(matchup)
+        team1, team2, s1, s2, winner = game.team1, game.team2, game.score1, game.score2, game.winner
+
+        # Winning scores: the higher score of every game with points, and each team's winning scores
+        if max(s1, s2) > 0:
+            league_winning[0] += 1
+            league_winning[1] += max(s1, s2)
+        if s1 != s2:
+            team, score = (team1, s1) if s1 > s2 else (team2, s2)
+            entry = team_winning.setdefault(team, [0, 0.0])
+            entry[0] += 1
+            entry[1] += score
+
+        teams.update(team for team in (team1, team2) if team)
+        if not team1 or not team2:
+            continue
+
+        if games_per_week[matchup.get('week', 0)] in PLAYOFF_WEEK_GAMES and winner in (team1, team2):
+            loser = team2 if winner == team1 else team1
+            playoff_records.setdefault(winner, {'wins': 0, 'losses': 0})['wins'] += 1
+            playoff_records.setdefault(loser, {'wins': 0, 'losses': 0})['losses'] += 1
+
+    return {
+        'version': PARTITION_VERSION,
+        'year': year,
+        'games': len(matchups),
+        'teams': len(teams),
+        'standings': {'regular': regular, 'final': final},
+        'playoff_records': playoff_records,
+        'winning_scores': {'league': league_winning, 'teams': team_winning},
+        'awards': engine.result('weekly_awards')
+    }
+
+
+# ------------------------------------------------------------------
+# Merging partitions
+# ------------------------------------------------------------------
+
+def merge_standings(partitions: List[Dict], standings_type: str = 'regular') -> List[Dict]:
+    """Standings rows of every partition, season by season"""
+    return [row for p in partitions for row in p['standings'][standings_type]]
+
+
+def merge_playoff_records(partitions: List[Dict]) -> Dict[str, Dict]:
+    """{team: {'wins', 'losses'}} in playoff and championship weeks over the partitions"""
+    merged = {}
+    for p in partitions:
+        for team, record in p['playoff_records'].items():
+            entry = merged.setdefault(team, {'wins': 0, 'losses': 0})
+            entry['wins'] += record['wins']
+            entry['losses'] += record['losses']
+    return merged
+
+
+def merge_winning_scores(partitions: List[Dict]) -> Dict:
+    """{'league': [count, total], 'teams': {team: [count, total]}} over the partitions"""
+    league = [0, 0.0]
+    teams = {}
+    for p in partitions:
+        scores = p['winning_scores']
+        league[0] += scores['league'][0]
+        league[1] += scores['league'][1]
+        for team, (count, total) in scores['teams'].items():
+            entry = teams.setdefault(team, [0, 0.0])
+            entry[0] += count
+            entry[1] += total
+    return {'league': league, 'teams': teams}
+
+
+def merge_awards(partitions: List[Dict], limit: Optional[int] = 30) -> Dict[str, List[Dict]]:
+    """All-time weekly awards (same format as the weekly_awards metric) from every season's candidates"""
+    highest_scores, lowest_winning_scores, biggest_margins = [], [], []
+    for p in partitions:
+        highest_scores.extend(p['awards']['highest_scores'])
+        lowest_winning_scores.extend(p['awards']['lowest_winning_scores'])
+        biggest_margins.extend(p['awards']['biggest_margins'])
+
+    highest_scores.sort(key=lambda x: x['score'], reverse=True)
+    lowest_winning_scores.sort(key=lambda x: x['score'])
+    biggest_margins.sort(key=lambda x: x['margin'], reverse=True)
+    return {
+        'highest_scores': [dict(a) for a in highest_scores[:limit]],
+        'lowest_winning_scores': [dict(a) for a in lowest_winning_scores[:limit]],
+        'biggest_margins': [dict(a) for a in biggest_margins[:limit]]
+    }
+
+
+# ------------------------------------------------------------------
+# Store
+# ------------------------------------------------------------------
+
+class SeasonStore:
+    """
+    Per-season partitions over a MatchupStore and StandingsStore. Closed seasons are
+    loaded from (or frozen to) cache_dir; the live season is summarized in memory.
+    Everything is rebuilt lazily when either store's generation changes, and only the
+    seasons whose rows changed are re-fingerprinted and re-summarized.
+
+    Usage:
+        seasons = SeasonStore(matchup_store, standings_store, cache_dir)
+        seasons.live_season()
+        merge_standings(seasons.get_partitions(include_live=False), 'final')
+    """
+
+    def __init__(self, matchup_store, standings_store, cache_dir: str):
+        self.matchup_store = matchup_store
+        self.standings_store = standings_store
+        self.cache_dir = cache_dir
+        self._lock = threading.RLock()
+        self._generations = None
+        self._partitions: Dict[int, Dict] = {}
+        self._fingerprints: Dict[int, str] = {}
+        self._sources: Dict[int, Tuple[List[Dict], List[Dict], List[Dict]]] = {}
+        self._live: Optional[int] = None
+
+    def live_season(self) -> Optional[int]:
+        """The season still open to changes (None when there is no data)"""
+        self._refresh_if_changed()
+        return self._live
+
+    def closed_seasons(self) -> List[int]:
+        """Sorted list of seasons that are over (and frozen)"""
+        self._refresh_if_changed()
+        return sorted(year for year in self._partitions if year != self._live)
+
+    def get_partition(self, year: int) -> Optional[Dict]:
+        """One season's partition, or None"""
+        self._refresh_if_changed()
+        return self._partitions.get(year)
+
+    def get_partitions(self, include_live: bool = True) -> List[Dict]:
+        """Partitions in season order, optionally without the live season"""
+        self._refresh_if_changed()
+        return [self._partitions[year] for year in sorted(self._partitions)
+                if include_live or year != self._live]
+
+    def seed(self, partitions: Dict[int, Dict], live: Optional[int]):
+        """Adopt partitions compiled elsewhere (see snapshot) for the stores' current data"""
+        with self._lock:
+            self._partitions = dict(partitions)
+            self._fingerprints = {year: partition['source'] for year, partition in partitions.items()}
+            self._sources = {}
+            self._live = live
+            self._generations = (self.matchup_store.get_generation(), self.standings_store.get_generation())
+
+    def _path(self, year: int) -> str:
+        return os.path.join(self.cache_dir, f'{year}.json')
+
+    def _load_frozen(self, year: int, fingerprint: str) -> Optional[Dict]:
+        try:
+            with open(self._path(year), 'r', encoding='utf-8') as f:
+                partition = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if partition.get('version') != PARTITION_VERSION or partition.get('source') != fingerprint:
+            return None
+        return partition
+
+    def _freeze(self, partition: Dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(partition, f)
+        os.replace(tmp, self._path(partition['year']))
+
+    def _refresh_if_changed(self):
+        generations = (self.matchup_store.get_generation(), self.standings_store.get_generation())
+        if generations == self._generations:
+            return
+
+        with self._lock:
+            generations = (self.matchup_store.get_generation(), self.standings_store.get_generation())
+            if generations == self._generations:
+                return
+
+            matchups_by_year = defaultdict(list)
+            for matchup in self.matchup_store.get_matchups():
+                matchups_by_year[matchup.get('year', 0)].append(matchup)
+            years = set(matchups_by_year) | set(self.standings_store.get_years('regular')) \
+                | set(self.standings_store.get_years('final'))
+            live = live_season(years)
+
+            partitions, fingerprints, sources = {}, {}, {}
+            for year in sorted(years):
+                matchups = matchups_by_year.get(year, [])
+                regular = self.standings_store.get_standings('regular', year)
+                final = self.standings_store.get_standings('final', year)
+                sources[year] = (matchups, regular, final)
+                # Only hash seasons whose rows differ from last time; rows kept across an
+                # append are the same objects, so the comparison is mostly identity checks
+                if year in self._fingerprints and self._sources.get(year) == sources[year]:
+                    fingerprint = self._fingerprints[year]
+                else:
+                    fingerprint = _fingerprint(matchups, regular, final)
+                fingerprints[year] = fingerprint
+
+                partition = self._partitions.get(year) if self._fingerprints.get(year) == fingerprint else None
+                closed = year != live
+                if partition is None and closed:
+                    partition = self._load_frozen(year, fingerprint)
+                if partition is None:
+                    partition = summarize_season(year, matchups, regular, final)
+                    partition['source'] = fingerprint
+                    partition['closed'] = False
+                # Written once, when the season closes (or after its rows were re-imported)
+                if closed and not partition['closed']:
+                    partition['closed'] = True
+                    self._freeze(partition)
+                partitions[year] = partition
+
+            self._partitions = partitions
+            self._fingerprints = fingerprints
+            self._sources = sources
+            self._live = live
+            self._generations = generations
@@ -0,0 +1,350 @@
+"""
+Snapshot
+Compiled copy of the league data for fast cold starts and for sharing between worker
+processes: the columnar matchups and standings and the season partitions in one file
+(data/cache/snapshot.bin). It is written at the end of every import; each process
+memory-maps it read-only, so the MatchupTable columns are one physical copy in the page
+cache however many workers run, and no worker parses the CSVs or re-summarizes a season
+itself. The row dicts, standings rows, partitions and analytics built from them are
+still per process.
+
+File layout (little-endian):
+    header    magic, format version, partition version, generation, SHA-1 of the
+              source CSVs, metadata length
+    metadata  JSON: string pool, team names, week types, standings row counts,
+              partitions and the dtype / offset / length of every array
+    arrays    matchup and standings columns (8-byte aligned), used in place
+
+The generation increases with every write. SharedSnapshot.check() (run before each
+request) reads the header and, when another process published a new generation, maps
+the new file and re-seeds the stores from it. A snapshot whose checksum does not match
+matchups.csv, standings.csv and standings_final.csv as they are now (or written by
+another format or partition version) is ignored, and the stores parse the CSVs as usual.
+
+    python snapshot.py [--data-dir DIR]    # write data/cache/snapshot.bin from the CSVs
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections import namedtuple
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from data_store import MatchupStore, StandingsStore
+from matchup_table import MatchupTable
+from season_partitions import PARTITION_VERSION, SeasonStore
+from team_mapper import TeamRegistry
+
+MAGIC = b'NFLSNAP\0'
+# Bump when the layout or the metadata changes
+SNAPSHOT_VERSION = 2
+# magic, snapshot version, partition version, generation, source checksum, metadata length
+HEADER = struct.Struct('<8sHHQ20sQ')
+ALIGN = 8
+
+SOURCE_FILES = ('matchups.csv', 'standings.csv', 'standings_final.csv')
+
+# MatchupTable columns stored as they are (team ids index the metadata's team names)
+TABLE_COLUMNS = ('year', 'week', 'week_type', 'team1', 'team2', 'score1', 'score2', 'winner')
+# Per-row string pool ids of the strings as written in matchups.csv
+STRING_COLUMNS = ('team1_name', 'team2_name', 'winner_name', 'scraped_at')
+# Standings row fields: numeric columns (dtype) and string pool id columns, regular rows then final
+STANDINGS_NUMERIC = (('year', np.int32), ('place', np.int32), ('wins', np.int32), ('losses', np.int32),
+                     ('ties', np.int32), ('win_pct', np.float64), ('points_for', np.float64),
+                     ('points_against', np.float64))
+STANDINGS_STRINGS = ('team_name', 'scraped_at', 'standings_type', 'team_logo')
+
+Snapshot = namedtuple('Snapshot', ['generation', 'checksum', 'matchups', 'table', 'standings', 'partitions',
+                                   'live', 'sources'])
+
+
+def snapshot_path(data_dir: str) -> str:
+    return os.path.join(data_dir, 'cache', 'snapshot.bin')
+
+
+def read_header(path: str) -> Optional[Tuple[int, bytes, int]]:
+    """(generation, source checksum, metadata length) of a snapshot this version can read, or None"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, version, partition_version, generation, checksum, metadata_length = HEADER.unpack(header)
+    if magic != MAGIC or version != SNAPSHOT_VERSION or partition_version != PARTITION_VERSION:
+        return None
+    return generation, checksum, metadata_length
+
+
+def _read_sources(data_dir: str) -> Dict[str, Tuple[bytes, Optional[os.stat_result]]]:
+    """{file name: (bytes, os.fstat when read)} for each source CSV ((b'', None) if missing)"""
+    sources = {}
+    for name in SOURCE_FILES:
+        try:
+            with open(os.path.join(data_dir, name), 'rb') as f:
+                stat = os.fstat(f.fileno())
+                sources[name] = (f.read(stat.st_size), stat)
+        except OSError:
+            sources[name] = (b'', None)
+    return sources
+
+
+def _checksum(sources: Dict[str, Tuple[bytes, Optional[os.stat_result]]]) -> bytes:
+    digest = hashlib.sha1()
+    for name in SOURCE_FILES:
+        raw, stat = sources[name]
+        digest.update(f'{name}:{len(raw) if stat else -1}\n'.encode())
+        digest.update(raw)
+    return digest.digest()
+
+
+def _file_signature(stat: Optional[os.stat_result]):
+    """Same signature data_store uses for a file: (mtime_ns, size), or None if missing"""
+    return (stat.st_mtime_ns, stat.st_size) if stat else None
+
+
+# ------------------------------------------------------------------
+# Writing
+# ------------------------------------------------------------------
+
+def write_snapshot(data_dir: str) -> Optional[str]:
+    """
+    Compile the CSVs in data_dir into the next generation of the snapshot (replacing the
+    old file atomically; processes that mapped it keep their mapping until they remap).
+    Closed seasons come from their frozen partitions in data/cache/seasons when valid.
+
+    Returns:
+        The snapshot path, or None if the CSVs changed while it was built or it could not be written
+    """
+    sources = _read_sources(data_dir)
+    checksum = _checksum(sources)
+
+    matchup_store = MatchupStore(os.path.join(data_dir, 'matchups.csv'))
+    standings_store = StandingsStore(os.path.join(data_dir, 'standings.csv'))
+    season_store = SeasonStore(matchup_store, standings_store, os.path.join(data_dir, 'cache', 'seasons'))
+    matchups = matchup_store.get_matchups()
+    table = matchup_store.get_table()
+    standings = [row for s_type in StandingsStore.STANDINGS_TYPES for row in standings_store.get_standings(s_type)]
+    partitions = season_store.get_partitions()
+    live = season_store.live_season()
+
+    if _checksum(_read_sources(data_dir)) != checksum:
+        print("CSVs changed while the snapshot was built; not written")
+        return None
+
+    strings, string_ids = [], {}
+
+    def string_id(value: str) -> int:
+        sid = string_ids.get(value)
+        if sid is None:
+            sid = string_ids[value] = len(strings)
+            strings.append(value)
+        return sid
+
+    arrays = {f'matchups.{name}': getattr(table, name) for name in TABLE_COLUMNS}
+    for column, key in zip(STRING_COLUMNS, ('team1_name', 'team2_name', 'winner', 'scraped_at')):
+        arrays[f'matchups.{column}'] = np.array([string_id(m.get(key, '')) for m in matchups], dtype=np.int32)
+    for column, dtype in STANDINGS_NUMERIC:
+        arrays[f'standings.{column}'] = np.array([row[column] for row in standings], dtype=dtype)
+    for column in STANDINGS_STRINGS:
+        arrays[f'standings.{column}'] = np.array([string_id(row[column]) for row in standings], dtype=np.int32)
+
+    layout, chunks, offset = {}, [], 0
+    for name, array in arrays.items():
+        dtype = array.dtype.newbyteorder('<')
+        data = np.ascontiguousarray(array, dtype=dtype).tobytes()
+        layout[name] = [dtype.str, offset, len(array)]
+        padding = -len(data) % ALIGN
+        chunks.append(data + b'\0' * padding)
+        offset += len(data) + padding
+
+    metadata = json.dumps({
+        'strings': strings,
+        'teams': table.teams.names,
+        'week_types': table.week_types,
+        'standings_rows': {s_type: len(standings_store.get_standings(s_type))
+                           for s_type in StandingsStore.STANDINGS_TYPES},
+        'partitions': partitions,
+        'live': live,
+        'arrays': layout
+    }, separators=(',', ':')).encode('utf-8')
+    metadata += b' ' * (-(HEADER.size + len(metadata)) % ALIGN)
+
+    path = snapshot_path(data_dir)
+    previous = read_header(path)
+    generation = previous[0] + 1 if previous else 1
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, SNAPSHOT_VERSION, PARTITION_VERSION, generation, checksum, len(metadata)))
+            f.write(metadata)
+            f.writelines(chunks)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Error writing snapshot: {e}")
+        return None
+    return path
+
+
+# ------------------------------------------------------------------
+# Loading
+# ------------------------------------------------------------------
+
+def load_snapshot(data_dir: str) -> Optional[Snapshot]:
+    """
+    Map the snapshot for data_dir. The matchup table's columns are read-only views of the
+    mapping; the row dicts, standings rows and partitions are built per process.
+
+    Returns:
+        The snapshot, or None if there is none or it does not match the CSVs
+    """
+    try:
+        with open(snapshot_path(data_dir), 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) < HEADER.size:
+        return None
+    magic, version, partition_version, generation, checksum, metadata_length = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != SNAPSHOT_VERSION or partition_version != PARTITION_VERSION:
+        return None
+    sources = _read_sources(data_dir)
+    if checksum != _checksum(sources):
+        return None
+
+    metadata = json.loads(buffer[HEADER.size:HEADER.size + metadata_length])
+    base = HEADER.size + metadata_length
+    arrays = {name: np.frombuffer(buffer, dtype=np.dtype(dtype), count=count, offset=base + offset)
+              if count else np.empty(0, dtype=np.dtype(dtype))
+              for name, (dtype, offset, count) in metadata['arrays'].items()}
+
+    strings = metadata['strings']
+    week_types = metadata['week_types']
+    table = MatchupTable(
+        *(arrays[f'matchups.{name}'] for name in TABLE_COLUMNS),
+        TeamRegistry.from_names(metadata['teams']), week_types,
+        [strings[sid] for sid in arrays['matchups.scraped_at'].tolist()])
+
+    rows = zip(table.year.tolist(), table.week.tolist(), table.week_type.tolist(),
+               arrays['matchups.team1_name'].tolist(), table.score1.tolist(),
+               arrays['matchups.team2_name'].tolist(), table.score2.tolist(),
+               arrays['matchups.winner_name'].tolist(), table.scraped_at)
+    matchups = [{
+        'year': year,
+        'week': week,
+        'week_type': week_types[week_type],
+        'team1_name': strings[team1],
+        'team1_score': score1,
+        'team2_name': strings[team2],
+        'team2_score': score2,
+        'winner': strings[winner],
+        'scraped_at': scraped_at
+    } for year, week, week_type, team1, score1, team2, score2, winner, scraped_at in rows]
+
+    # Same keys, order and types as load_standings_from_csv
+    numeric = [arrays[f'standings.{column}'].tolist() for column, _ in STANDINGS_NUMERIC]
+    text = [[strings[sid] for sid in arrays[f'standings.{column}'].tolist()] for column in STANDINGS_STRINGS]
+    standing_rows = [{
+        'year': year,
+        'place': place,
+        'team_name': team_name,
+        'scraped_at': scraped_at,
+        'standings_type': standings_type,
+        'wins': wins,
+        'losses': losses,
+        'ties': ties,
+        'win_pct': win_pct,
+        'points_for': points_for,
+        'points_against': points_against,
+        'team_logo': team_logo
+    } for (year, place, wins, losses, ties, win_pct, points_for, points_against,
+           team_name, scraped_at, standings_type, team_logo) in zip(*numeric, *text)]
+    standings, start = {}, 0
+    for s_type in StandingsStore.STANDINGS_TYPES:
+        count = metadata['standings_rows'][s_type]
+        standings[s_type] = standing_rows[start:start + count]
+        start += count
+
+    partitions = {partition['year']: partition for partition in metadata['partitions']}
+    return Snapshot(generation, checksum, matchups, table, standings, partitions, metadata['live'], sources)
+
+
+class SharedSnapshot:
+    """
+    The snapshot as mapped by this process, kept current for a set of stores.
+
+    check() is cheap (one header read) and is meant to run before every request: when a
+    new generation was published (by an import in this or any other worker) it maps the
+    new file and seeds the stores from it, instead of each worker re-parsing the CSVs.
+    A snapshot that does not match the CSVs is left alone, and the stores keep following
+    the CSVs themselves until a matching one is published. Not used with the SQLite backend.
+
+    Usage:
+        shared = SharedSnapshot(data_dir, matchup_store, standings_store, season_store)
+        shared.check()
+    """
+
+    def __init__(self, data_dir: str, matchup_store: MatchupStore, standings_store: StandingsStore,
+                 season_store: SeasonStore):
+        self.data_dir = data_dir
+        self.path = snapshot_path(data_dir)
+        self.matchup_store = matchup_store
+        self.standings_store = standings_store
+        self.season_store = season_store
+        self.generation = None
+        self._seen = None
+        self._lock = threading.Lock()
+        self.enabled = matchup_store.database is None and standings_store.database is None
+
+    def check(self) -> bool:
+        """
+        Remap if a different snapshot was published since the last check.
+
+        Returns:
+            True if the stores were (re)seeded from it
+        """
+        if not self.enabled:
+            return False
+        header = read_header(self.path)
+        if header is None or header[:2] == self._seen:
+            return False
+
+        with self._lock:
+            header = read_header(self.path)
+            if header is None or header[:2] == self._seen:
+                return False
+            snapshot = load_snapshot(self.data_dir)
+            # Stale (the CSVs moved on since it was written): wait for the next generation
+            self._seen = header[:2]
+            if snapshot is None or (snapshot.generation, snapshot.checksum) != header[:2]:
+                return False
+
+            raw, stat = snapshot.sources['matchups.csv']
+            self.matchup_store.seed(snapshot.matchups, snapshot.table, raw, stat)
+            self.standings_store.seed(snapshot.standings, tuple(
+                _file_signature(snapshot.sources[name][1]) for name in ('standings.csv', 'standings_final.csv')))
+            self.season_store.seed(snapshot.partitions, snapshot.live)
+            self.generation = snapshot.generation
+            return True
+
+
+if __name__ == '__main__':
+    import argparse
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description='Compile the league CSVs into the boot snapshot')
+    parser.add_argument('--data-dir', default=os.path.join(project_root, 'data'),
+                        help='Directory with the CSVs (default: data/)')
+    args = parser.parse_args()
+
+    path = write_snapshot(args.data_dir)
+    if path is None:
+        raise SystemExit(1)
+    print(f"Wrote {path} ({os.path.getsize(path)} bytes)")
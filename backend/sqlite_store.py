@@ -0,0 +1,387 @@
+"""
+SQLite Store
+Optional SQLite backend for the league data, enabled with DATA_BACKEND=sqlite. One
+database file (data/league.db) in WAL mode, so readers never block the refresh writer:
+
+    matchups      year, week, both teams (raw name + canonical team id), scores, winner
+    standings     regular and final standings rows
+    teams         canonical team names; team_aliases maps every raw name to one
+    transactions  league transactions (the raw dict as JSON, plus team id and date)
+    documents     DataManager's league_data / historical_data (instead of the JSON files)
+
+The CSVs stay the files the importers write (and the ones kept in git); sync_from_csv()
+mirrors them into the database after every import, and load_matchups() / load_standings()
+return exactly what historical_scraper.load_from_csv / standings_scraper.load_standings_from_csv
+return, so MatchupStore and StandingsStore work unchanged on top of it. Targeted queries
+(team_game_log, week_matchups) use the indexes instead of a full scan.
+
+    python sqlite_store.py [--data-dir DIR]    # build or refresh data/league.db from the CSVs
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from historical_scraper import load_from_csv
+from standings_scraper import load_standings_from_csv
+from team_mapper import TEAM_NAME_MAPPINGS, normalize_team_name
+
+DB_FILE = 'league.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS team_aliases (
+    alias TEXT PRIMARY KEY,
+    team_id INTEGER NOT NULL REFERENCES teams(id)
+);
+CREATE TABLE IF NOT EXISTS matchups (
+    id INTEGER PRIMARY KEY,
+    year INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    week_type TEXT,
+    team1_name TEXT,
+    team1_id INTEGER REFERENCES teams(id),
+    team1_score REAL,
+    team2_name TEXT,
+    team2_id INTEGER REFERENCES teams(id),
+    team2_score REAL,
+    winner TEXT,
+    scraped_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_matchups_year_week ON matchups(year, week);
+CREATE INDEX IF NOT EXISTS idx_matchups_team1 ON matchups(team1_id);
+CREATE INDEX IF NOT EXISTS idx_matchups_team2 ON matchups(team2_id);
+CREATE TABLE IF NOT EXISTS standings (
+    id INTEGER PRIMARY KEY,
+    standings_type TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    place INTEGER NOT NULL,
+    team_name TEXT,
+    team_id INTEGER REFERENCES teams(id),
+    wins INTEGER,
+    losses INTEGER,
+    ties INTEGER,
+    win_pct REAL,
+    points_for REAL,
+    points_against REAL,
+    team_logo TEXT,
+    scraped_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_standings_type_year ON standings(standings_type, year);
+CREATE INDEX IF NOT EXISTS idx_standings_team ON standings(team_id);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    team_id INTEGER REFERENCES teams(id),
+    occurred_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_team ON transactions(team_id);
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at TEXT
+);
+"""
+
+MATCHUP_COLUMNS = ('year', 'week', 'week_type', 'team1_name', 'team1_score', 'team2_name', 'team2_score',
+                   'winner', 'scraped_at')
+STANDINGS_COLUMNS = ('year', 'place', 'team_name', 'scraped_at', 'standings_type', 'wins', 'losses', 'ties',
+                     'win_pct', 'points_for', 'points_against', 'team_logo')
+
+# Change counters kept in meta: appends, rewrites (updates/deletes) and standings changes
+MATCHUPS_GENERATION = 'matchups_generation'
+MATCHUPS_REWRITES = 'matchups_rewrites'
+STANDINGS_GENERATION = 'standings_generation'
+
+
+def sqlite_enabled() -> bool:
+    """Whether DATA_BACKEND selects the SQLite backend"""
+    return os.environ.get('DATA_BACKEND', 'csv').lower() == 'sqlite'
+
+
+class LeagueDatabase:
+    """
+    Connection per thread (sqlite3 connections cannot be shared across threads); writes
+    run in one IMMEDIATE transaction each, so readers see either all of a sync or none.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    def _write(self, func, *args):
+        """Run func(conn, *args) in one write transaction"""
+        with self._write_lock:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = func(conn, *args)
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+            return result
+
+    # ------------------------------------------------------------------
+    # Change tracking
+    # ------------------------------------------------------------------
+
+    def _meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self._connection().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value):
+        conn.execute('INSERT INTO meta (key, value) VALUES (?, ?) '
+                     'ON CONFLICT(key) DO UPDATE SET value = excluded.value', (key, str(value)))
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, key: str):
+        conn.execute("INSERT INTO meta (key, value) VALUES (?, '1') "
+                     'ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1', (key,))
+
+    def matchups_signature(self) -> Tuple[int, int]:
+        """(appends + rewrites, rewrites) - changes whenever the matchups do"""
+        rows = dict(self._connection().execute(
+            'SELECT key, value FROM meta WHERE key IN (?, ?)', (MATCHUPS_GENERATION, MATCHUPS_REWRITES)).fetchall())
+        return int(rows.get(MATCHUPS_GENERATION, 0)), int(rows.get(MATCHUPS_REWRITES, 0))
+
+    def standings_signature(self) -> int:
+        """Changes whenever the standings do"""
+        return int(self._meta(STANDINGS_GENERATION, '0'))
+
+    # ------------------------------------------------------------------
+    # Teams
+    # ------------------------------------------------------------------
+
+    def _team_id(self, conn: sqlite3.Connection, name: str, cache: Dict[str, int]) -> Optional[int]:
+        """Canonical team id for a raw name, registering the team and alias if new"""
+        if not name:
+            return None
+        team_id = cache.get(name)
+        if team_id is not None:
+            return team_id
+        row = conn.execute('SELECT team_id FROM team_aliases WHERE alias = ?', (name,)).fetchone()
+        if row is None:
+            canonical = normalize_team_name(name)
+            conn.execute('INSERT OR IGNORE INTO teams (name) VALUES (?)', (canonical,))
+            team_id = conn.execute('SELECT id FROM teams WHERE name = ?', (canonical,)).fetchone()[0]
+            conn.execute('INSERT INTO team_aliases (alias, team_id) VALUES (?, ?)', (name, team_id))
+        else:
+            team_id = row[0]
+        cache[name] = team_id
+        return team_id
+
+    def get_team_id(self, team_name: str) -> Optional[int]:
+        """Canonical team id for any known name (raw or canonical), or None"""
+        conn = self._connection()
+        row = conn.execute('SELECT team_id FROM team_aliases WHERE alias = ?', (team_name,)).fetchone()
+        if row is None:
+            row = conn.execute('SELECT id FROM teams WHERE name = ?', (normalize_team_name(team_name),)).fetchone()
+        return row[0] if row else None
+
+    def get_aliases(self) -> Dict[str, str]:
+        """{raw name: canonical name} for every name seen"""
+        return dict(self._connection().execute(
+            'SELECT a.alias, t.name FROM team_aliases a JOIN teams t ON t.id = a.team_id ORDER BY a.alias').fetchall())
+
+    # ------------------------------------------------------------------
+    # Matchups and standings (same dicts as the CSV loaders)
+    # ------------------------------------------------------------------
+
+    def load_matchups(self) -> List[Dict]:
+        """Every matchup in ingest order"""
+        return self.load_matchups_after(0)[0]
+
+    def load_matchups_after(self, after_id: int) -> Tuple[List[Dict], int]:
+        """(matchups stored after row id after_id in ingest order, the last row id read)"""
+        rows = self._connection().execute(
+            f"SELECT id, {', '.join(MATCHUP_COLUMNS)} FROM matchups WHERE id > ? ORDER BY id", (after_id,)).fetchall()
+        last_id = rows[-1]['id'] if rows else after_id
+        return [{column: row[column] for column in MATCHUP_COLUMNS} for row in rows], last_id
+
+    def load_standings(self, standings_type: str = 'regular') -> List[Dict]:
+        """Every standings row of one type in ingest order"""
+        rows = self._connection().execute(
+            f"SELECT {', '.join(STANDINGS_COLUMNS)} FROM standings WHERE standings_type = ? ORDER BY id",
+            (standings_type,))
+        return [dict(row) for row in rows]
+
+    def week_matchups(self, year: int, week: int) -> List[Dict]:
+        """One week's matchups (uses the (year, week) index)"""
+        rows = self._connection().execute(
+            f"SELECT {', '.join(MATCHUP_COLUMNS)} FROM matchups WHERE year = ? AND week = ? ORDER BY id",
+            (year, week))
+        return [dict(row) for row in rows]
+
+    def team_game_log(self, team_name: str) -> List[Dict]:
+        """Every matchup a team (under any of its names) played, chronologically (uses the team indexes)"""
+        team_id = self.get_team_id(team_name)
+        if team_id is None:
+            return []
+        rows = self._connection().execute(
+            f"SELECT {', '.join(MATCHUP_COLUMNS)} FROM matchups WHERE team1_id = ? OR team2_id = ? "
+            "ORDER BY year, week, id", (team_id, team_id))
+        return [dict(row) for row in rows]
+
+    def _insert_matchups(self, conn: sqlite3.Connection, matchups: List[Dict]):
+        team_ids = {}
+        conn.executemany(
+            'INSERT INTO matchups (year, week, week_type, team1_name, team1_id, team1_score, '
+            'team2_name, team2_id, team2_score, winner, scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(m['year'], m['week'], m['week_type'], m['team1_name'], self._team_id(conn, m['team1_name'], team_ids),
+              m['team1_score'], m['team2_name'], self._team_id(conn, m['team2_name'], team_ids), m['team2_score'],
+              m['winner'], m.get('scraped_at', '')) for m in matchups])
+
+    def _sync_matchups(self, conn: sqlite3.Connection, matchups: List[Dict]) -> str:
+        stored = self.load_matchups()
+        if stored == matchups:
+            return 'unchanged'
+        if len(matchups) > len(stored) and matchups[:len(stored)] == stored:
+            # Only new rows at the end: readers can pick up just those
+            self._insert_matchups(conn, matchups[len(stored):])
+            self._bump(conn, MATCHUPS_GENERATION)
+            return 'appended'
+        conn.execute('DELETE FROM matchups')
+        self._insert_matchups(conn, matchups)
+        self._bump(conn, MATCHUPS_GENERATION)
+        self._bump(conn, MATCHUPS_REWRITES)
+        return 'rewritten'
+
+    def _sync_standings(self, conn: sqlite3.Connection, standings_type: str, standings: List[Dict]) -> str:
+        if self.load_standings(standings_type) == standings:
+            return 'unchanged'
+        team_ids = {}
+        conn.execute('DELETE FROM standings WHERE standings_type = ?', (standings_type,))
+        conn.executemany(
+            'INSERT INTO standings (standings_type, year, place, team_name, team_id, wins, losses, ties, win_pct, '
+            'points_for, points_against, team_logo, scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(s['standings_type'], s['year'], s['place'], s['team_name'], self._team_id(conn, s['team_name'], team_ids),
+              s['wins'], s['losses'], s['ties'], s['win_pct'], s['points_for'], s['points_against'],
+              s['team_logo'], s['scraped_at']) for s in standings])
+        self._bump(conn, STANDINGS_GENERATION)
+        return 'rewritten'
+
+    def sync_from_csv(self, data_dir: str) -> Dict[str, str]:
+        """
+        Mirror matchups.csv, standings.csv and standings_final.csv into the database.
+        Rows appended to matchups.csv are inserted on their own; any other change
+        replaces the table's rows. Unchanged files are not touched.
+
+        Returns:
+            {'matchups' / 'regular' / 'final': 'unchanged', 'appended' or 'rewritten'}
+        """
+        matchups = load_from_csv(os.path.join(data_dir, 'matchups.csv'))
+        standings_file = os.path.join(data_dir, 'standings.csv')
+        standings = {s_type: load_standings_from_csv(standings_file, s_type) for s_type in ('regular', 'final')}
+
+        def sync(conn):
+            team_ids = {}
+            for alias in TEAM_NAME_MAPPINGS:
+                self._team_id(conn, alias, team_ids)
+            result = {'matchups': self._sync_matchups(conn, matchups)}
+            for s_type, rows in standings.items():
+                result[s_type] = self._sync_standings(conn, s_type, rows)
+            self._set_meta(conn, 'synced_at', datetime.now().isoformat())
+            return result
+
+        return self._write(sync)
+
+    # ------------------------------------------------------------------
+    # DataManager documents and transactions
+    # ------------------------------------------------------------------
+
+    def save_document(self, name: str, data: Dict):
+        """Store a JSON document (replacing the previous version)"""
+        def save(conn):
+            conn.execute('INSERT INTO documents (name, data, updated_at) VALUES (?, ?, ?) '
+                         'ON CONFLICT(name) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at',
+                         (name, json.dumps(data, separators=(',', ':')), datetime.now().isoformat()))
+        self._write(save)
+
+    def load_document(self, name: str) -> Optional[Dict]:
+        row = self._connection().execute('SELECT data FROM documents WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_transactions(self, transactions: List[Dict]):
+        """Replace the stored transactions (most recent first, as scraped)"""
+        def save(conn):
+            team_ids = {}
+            conn.execute('DELETE FROM transactions')
+            conn.executemany(
+                'INSERT INTO transactions (team_id, occurred_at, data) VALUES (?, ?, ?)',
+                [(self._team_id(conn, t.get('team_name') or t.get('team') or '', team_ids),
+                  t.get('date') or t.get('timestamp'), json.dumps(t)) for t in transactions])
+        self._write(save)
+
+    def get_transactions(self, limit: int = 50, team_name: Optional[str] = None) -> List[Dict]:
+        """Most recent transactions, optionally for one team"""
+        if team_name is None:
+            rows = self._connection().execute('SELECT data FROM transactions ORDER BY id LIMIT ?', (limit,))
+        else:
+            rows = self._connection().execute('SELECT data FROM transactions WHERE team_id = ? ORDER BY id LIMIT ?',
+                                              (self.get_team_id(team_name), limit))
+        return [json.loads(row[0]) for row in rows]
+
+
+_databases: Dict[str, LeagueDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_league_database(data_dir: str) -> LeagueDatabase:
+    """
+    Get the process-wide database for a data directory (data_dir/league.db). It is
+    brought up to date with the CSVs when first opened in the process.
+    """
+    db_file = os.path.abspath(os.path.join(data_dir, DB_FILE))
+    with _databases_lock:
+        database = _databases.get(db_file)
+        if database is None:
+            database = LeagueDatabase(db_file)
+            database.sync_from_csv(data_dir)
+            _databases[db_file] = database
+        return database
+
+
+def sync_league_database(data_dir: str) -> Optional[Dict[str, str]]:
+    """Mirror the CSVs into the database after an import (no-op unless the SQLite backend is on)"""
+    if not sqlite_enabled():
+        return None
+    return get_league_database(data_dir).sync_from_csv(data_dir)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description='Build or refresh the SQLite copy of the league CSVs')
+    parser.add_argument('--data-dir', default=os.path.join(project_root, 'data'),
+                        help='Directory with the CSVs and league.db (default: data/)')
+    args = parser.parse_args()
+
+    database = LeagueDatabase(os.path.join(args.data_dir, DB_FILE))
+    print(f"{database.db_file}: {database.sync_from_csv(args.data_dir)}")
@@ -3,19 +3,34 @@ Historical Standings Scraper
 Scrapes final standings for each year to determine Super Bowl wins, playoff appearances, and spoons
 """
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import csv
+import importlib.util
 import re
 import os
 from datetime import datetime
 from typing import Dict, List, Optional
 import time
 
+from page_cache import PageCache, is_completed_season
+
+# lxml is optional (BeautifulSoup tree builder for the fast path); without it pages are
+# parsed with html.parser only
+FAST_PARSER = 'lxml' if importlib.util.find_spec('lxml') else None
+
+# The fast path only builds the <table> elements of a standings page
+_TABLES = SoupStrainer('table')
+
 
 class StandingsScraper:
-    def __init__(self, league_id: str):
+    def __init__(self, league_id: str, base_url: Optional[str] = None, cache: Optional[PageCache] = None,
+                 fast_parse: bool = True):
         self.league_id = league_id
-        self.base_url = f"https://fantasy.nfl.com/league/{league_id}/history"
+        # Parse only the standings table with lxml when possible (parse_standings_html)
+        self.fast_parse = fast_parse
+        self.base_url = (base_url or f"https://fantasy.nfl.com/league/{league_id}/history").rstrip('/')
+        # Optional raw page cache (completed seasons are then never refetched)
+        self.cache = cache
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
@@ -28,17 +43,40 @@ class StandingsScraper:
             year: The year to fetch
             standings_type: 'final' for final standings (champion), 'regular' for regular season
         """
+        content = self.fetch_standings_content(year, standings_type)
+        return BeautifulSoup(content, 'html.parser') if content is not None else None
+    
+    def standings_url(self, year: int, standings_type: str = 'final') -> str:
+        return f"{self.base_url}/{year}/standings?historyStandingsType={standings_type}"
+    
+    def fetch_standings_content(self, year: int, standings_type: str = 'final') -> Optional[bytes]:
+        """Raw standings page body (through the page cache if there is one), or None on error"""
         # Use final standings to get the actual champion (after playoffs)
-        url = f"{self.base_url}/{year}/standings?historyStandingsType={standings_type}"
+        url = self.standings_url(year, standings_type)
         try:
             print(f"  Fetching {year} standings ({standings_type})...")
+            if self.cache is not None:
+                return self.cache.fetch(self.session, url, is_completed_season(year))
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            return response.content
         except Exception as e:
             print(f"    Error: {e}")
             return None
     
+    def parse_standings_html(self, content: bytes, year: int) -> List[Dict]:
+        """
+        Parse standings from a raw standings page body. The fast path builds only the page's
+        tables with lxml; pages without a table or rows it can read use the full parse.
+        """
+        if self.fast_parse and FAST_PARSER and content:
+            tables = BeautifulSoup(content, FAST_PARSER, parse_only=_TABLES)
+            if tables.find('table'):
+                standings = self.parse_standings(tables, year)
+                if standings:
+                    return standings
+        return self.parse_standings(BeautifulSoup(content, 'html.parser'), year)
+    
     def parse_standings(self, soup: BeautifulSoup, year: int) -> List[Dict]:
         """Parse standings from the standings table"""
         standings = []
@@ -209,11 +247,11 @@ class StandingsScraper:
             standings_type: 'final' for final standings (after playoffs, determines champion)
                           'regular' for regular season standings only
         """
-        soup = self.fetch_standings_page(year, standings_type)
-        if not soup:
+        content = self.fetch_standings_content(year, standings_type)
+        if not content:
             return []
         
-        standings = self.parse_standings(soup, year)
+        standings = self.parse_standings_html(content, year)
         return standings
     
     def scrape_all_standings(self, start_year: int = 2017, end_year: int = 2025) -> List[Dict]:
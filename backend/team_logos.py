@@ -4,7 +4,8 @@ Maps team names to their logo URLs from NFL.com
 """
 import csv
 import os
-from typing import Dict, Optional
+import threading
+from typing import Dict, Iterable, Optional, Tuple
 
 def load_team_logos(data_dir: str = 'data') -> Dict[str, str]:
     """
@@ -40,6 +41,68 @@ def load_team_logos(data_dir: str = 'data') -> Dict[str, str]:
     return logos
 
 
+# Cached logo index per data directory: {abs_data_dir: (standings_generation, logos)}
+_logo_index_cache: Dict[str, Tuple[int, Dict[str, str]]] = {}
+_logo_index_lock = threading.Lock()
+
+
+def _build_logo_index(rows: Iterable[Dict]) -> Dict[str, str]:
+    """Same selection rule as load_team_logos, over already-normalized standings rows"""
+    logo_data = {}
+    for row in rows:
+        team_name = row.get('team_name', '')
+        logo_url = row.get('team_logo', '')
+        year = row.get('year', 0)
+        if team_name and logo_url:
+            if team_name not in logo_data or year > logo_data[team_name]['year']:
+                logo_data[team_name] = {'year': year, 'logo': logo_url}
+    return {team_name: data['logo'] for team_name, data in logo_data.items()}
+
+
+def get_logo_index(data_dir: str = 'data') -> Dict[str, str]:
+    """
+    Get the {normalized team name: logo URL} index for a data directory.
+    
+    The index is built from the shared in-memory StandingsStore and only rebuilt when
+    the standings files change, so repeated lookups do not touch the CSVs.
+    """
+    from data_store import get_standings_store
+    
+    key = os.path.abspath(data_dir)
+    store = get_standings_store(os.path.join(key, 'standings.csv'))
+    generation = store.get_generation()
+    
+    cached = _logo_index_cache.get(key)
+    if cached and cached[0] == generation:
+        return cached[1]
+    
+    with _logo_index_lock:
+        cached = _logo_index_cache.get(key)
+        if cached and cached[0] == generation:
+            return cached[1]
+        
+        logos = _build_logo_index(store.get_standings('regular') + store.get_standings('final'))
+        _logo_index_cache[key] = (generation, logos)
+        return logos
+
+
+def resolve_logos(team_names: Iterable[str], data_dir: str = 'data') -> Dict[str, Optional[str]]:
+    """
+    Resolve logo URLs for many teams at once.
+    
+    Args:
+        team_names: Team names (any historical name; each is normalized)
+        data_dir: Directory containing the standings CSVs
+        
+    Returns:
+        {team_name as given: logo URL or None}
+    """
+    from team_mapper import normalize_team_name
+    
+    logos = get_logo_index(data_dir)
+    return {name: logos.get(normalize_team_name(name)) for name in team_names}
+
+
 def get_team_logo_url(team_name: str, data_dir: str = 'data') -> Optional[str]:
     """
     Get the logo URL for a team.
@@ -54,6 +117,6 @@ def get_team_logo_url(team_name: str, data_dir: str = 'data') -> Optional[str]:
     from team_mapper import normalize_team_name
     
     normalized_name = normalize_team_name(team_name)
-    logos = load_team_logos(data_dir)
+    logos = get_logo_index(data_dir)
     return logos.get(normalized_name)
 
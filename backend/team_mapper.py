@@ -131,6 +131,50 @@ def get_all_canonical_teams() -> list:
     return sorted(list(canonical_teams))
 
 
+class TeamRegistry:
+    """
+    Interns canonical team names to small integer ids (0, 1, 2, ...).
+    Names are normalized once on the way in, so ids can be compared directly
+    instead of normalizing and comparing strings on every row.
+    """
+
+    def __init__(self):
+        self.names = []  # id -> canonical name
+        self._ids = {}   # canonical name -> id
+
+    @classmethod
+    def from_names(cls, names: list) -> 'TeamRegistry':
+        """Registry with the given canonical names as ids 0, 1, 2, ..."""
+        registry = cls()
+        registry.names = list(names)
+        registry._ids = {name: team_id for team_id, name in enumerate(registry.names)}
+        return registry
+
+    def intern(self, team_name: str) -> int:
+        """Get the id for a team name, assigning a new one if needed. Empty names map to -1."""
+        canonical = normalize_team_name(team_name)
+        if not canonical:
+            return -1
+
+        team_id = self._ids.get(canonical)
+        if team_id is None:
+            team_id = len(self.names)
+            self._ids[canonical] = team_id
+            self.names.append(canonical)
+        return team_id
+
+    def get_id(self, team_name: str) -> int:
+        """Get the id for a team name without assigning one (-1 if unknown)"""
+        return self._ids.get(normalize_team_name(team_name), -1)
+
+    def get_name(self, team_id: int) -> str:
+        """Get the canonical name for an id"""
+        return self.names[team_id] if 0 <= team_id < len(self.names) else ''
+
+    def __len__(self):
+        return len(self.names)
+
+
 if __name__ == '__main__':
     # Test the mappings
     print("Team Name Mappings:")
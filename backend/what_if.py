@@ -0,0 +1,443 @@
+"""
+What-If Engine
+Applies hypothetical edits (flip a result, change a score, swap two teams' schedules) to a
+copy-on-write overlay of the MatchupTable and recomputes only what the edited rows touch:
+those seasons' standings and playoff seeds, the head-to-head records of the pairs involved
+and the streaks of the teams involved. The shared table is never modified or copied.
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from analytics_engine import StreakState
+from head_to_head import HeadToHeadMatrix
+from matchup_table import MatchupTable, WINNER_TIE
+from playoff_calculator import PLAYOFF_SPOTS, REGULAR_WEEK_TYPES
+
+# One game's editable fields: (team1, team2, score1, score2, winner) as table ids/values
+GameRow = Tuple[int, int, float, float, int]
+
+# Edit fields and the type each must have when given
+EDIT_INT_FIELDS = ('year', 'week')
+EDIT_NAME_FIELDS = ('type', 'team', 'team1', 'team2', 'winner')
+
+
+def _table_game(table: MatchupTable, row: int) -> GameRow:
+    return (int(table.team1[row]), int(table.team2[row]), float(table.score1[row]),
+            float(table.score2[row]), int(table.winner[row]))
+
+
+def _check_edit(edit) -> Dict:
+    """Reject a malformed edit up front with a ValueError (the API's 400), before it is applied"""
+    if not isinstance(edit, dict):
+        raise ValueError(f"Each edit must be an object, got {edit!r}")
+    for field in EDIT_INT_FIELDS:
+        value = edit.get(field)
+        if field in edit and (value is None or isinstance(value, bool) or not _is_int_like(value)):
+            raise ValueError(f"Edit {field} must be a whole number, got {value!r}")
+    for field in EDIT_NAME_FIELDS:
+        value = edit.get(field)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"Edit {field} must be a string, got {value!r}")
+    if 'score' in edit:
+        score = edit['score']
+        try:
+            valid = not isinstance(score, bool) and math.isfinite(float(score))
+        except (TypeError, ValueError):
+            valid = False
+        if not valid:
+            raise ValueError(f"Edit score must be a number, got {score!r}")
+    return edit
+
+
+def _is_int_like(value) -> bool:
+    try:
+        return float(value) == int(value)
+    except (TypeError, ValueError, OverflowError):
+        return False
+
+
+def _winner_for(team1: int, team2: int, score1: float, score2: float) -> int:
+    if score1 > score2:
+        return team1
+    if score2 > score1:
+        return team2
+    return WINNER_TIE
+
+
+class MatchupOverlay:
+    """
+    Edited rows on top of a shared MatchupTable. Only rows that were edited are stored;
+    every other row reads straight through to the table.
+    """
+
+    def __init__(self, table: MatchupTable):
+        self.table = table
+        self.rows: Dict[int, GameRow] = {}
+
+    def base(self, row: int) -> GameRow:
+        return _table_game(self.table, row)
+
+    def get(self, row: int) -> GameRow:
+        edited = self.rows.get(row)
+        return edited if edited is not None else self.base(row)
+
+    def set(self, row: int, game: GameRow):
+        if game == self.base(row):
+            self.rows.pop(row, None)
+        else:
+            self.rows[row] = game
+
+    def changed_rows(self) -> List[int]:
+        return sorted(self.rows)
+
+
+class WhatIfEngine:
+    """
+    Built once per MatchupTable (see MatchupStore.get_what_if); each scenario gets its own
+    overlay, so concurrent requests never see each other's edits.
+
+    Base per-season standings come from one bincount pass over the regular season rows;
+    a scenario only adds the before/after difference of its edited rows to them.
+    """
+
+    def __init__(self, table: MatchupTable, head_to_head: Optional[HeadToHeadMatrix] = None,
+                 playoff_spots: int = PLAYOFF_SPOTS):
+        self.table = table
+        self.head_to_head = head_to_head if head_to_head is not None else HeadToHeadMatrix(table)
+        self.playoff_spots = playoff_spots
+
+        n_teams = len(table.teams)
+        regular_codes = [code for code, wt in enumerate(table.week_types) if wt in REGULAR_WEEK_TYPES]
+        self.regular = np.isin(table.week_type, regular_codes) & (table.team1 >= 0) & (table.team2 >= 0)
+
+        # (year, week, team id) -> row, for finding the game an edit refers to
+        self._rows_by_team_week: Dict[Tuple[int, int, int], int] = {}
+        years, weeks = table.year.tolist(), table.week.tolist()
+        for row, (t1, t2) in enumerate(zip(table.team1.tolist(), table.team2.tolist())):
+            for team_id in (t1, t2):
+                if team_id >= 0:
+                    self._rows_by_team_week[(years[row], weeks[row], team_id)] = row
+
+        # Each team's rows in (year, week) order; a later row for the same week replaces
+        # an earlier one, as in the streak accumulator
+        self._team_rows: Dict[int, List[int]] = {}
+        for (year, week, team_id), row in sorted(self._rows_by_team_week.items()):
+            self._team_rows.setdefault(team_id, []).append(row)
+
+        # Base regular season records: (n_years x n_teams) arrays
+        self.years = sorted(set(years))
+        self._year_index = {year: i for i, year in enumerate(self.years)}
+        self._season_stats = {
+            name: np.zeros((len(self.years), n_teams), dtype=np.float64)
+            for name in ('wins', 'losses', 'ties', 'points_for', 'games')
+        }
+        for row in np.flatnonzero(self.regular).tolist():
+            self._add_game(self._season_stats, self._year_index[years[row]],
+                           *_table_game(table, row), 1)
+
+    @staticmethod
+    def _add_game(stats: Dict[str, np.ndarray], year_index: int, team1: int, team2: int,
+                  score1: float, score2: float, winner: int, sign: int):
+        """Add (sign=1) or remove (sign=-1) one game's contribution to season stats"""
+        for team_id, score, won in ((team1, score1, winner == team1), (team2, score2, winner == team2)):
+            stats['games'][year_index, team_id] += sign
+            stats['points_for'][year_index, team_id] += sign * score
+            if winner == WINNER_TIE:
+                stats['ties'][year_index, team_id] += sign
+            elif won:
+                stats['wins'][year_index, team_id] += sign
+            else:
+                stats['losses'][year_index, team_id] += sign
+
+    # ------------------------------------------------------------------
+    # Edits
+    # ------------------------------------------------------------------
+
+    def new_overlay(self) -> MatchupOverlay:
+        return MatchupOverlay(self.table)
+
+    def _team_id(self, name: str) -> int:
+        team_id = self.table.teams.get_id(name or '')
+        if team_id < 0:
+            raise ValueError(f"Unknown team: {name}")
+        return team_id
+
+    def _find_row(self, overlay: MatchupOverlay, year: int, week: int, team: str,
+                  opponent: Optional[str] = None) -> int:
+        team_id = self._team_id(team)
+        year, week = int(year), int(week)
+        row = self._rows_by_team_week.get((year, week, team_id))
+        if row is None or team_id not in overlay.get(row)[:2]:
+            # A swapped schedule moves teams into other rows of the same week
+            row = next((r for r, game in overlay.rows.items()
+                        if self.table.year[r] == year and self.table.week[r] == week and team_id in game[:2]), None)
+        if row is None:
+            raise ValueError(f"No game for {team} in {year} week {week}")
+        if opponent:
+            team1, team2 = overlay.get(row)[:2]
+            if self._team_id(opponent) not in (team1, team2):
+                raise ValueError(f"{team} did not play {opponent} in {year} week {week}")
+        return row
+
+    def _flip(self, overlay: MatchupOverlay, edit: Dict):
+        """{'year', 'week', 'team1', 'team2'?, 'winner'?} - make `winner` (default: the loser) win"""
+        row = self._find_row(overlay, edit['year'], edit['week'], edit['team1'], edit.get('team2'))
+        team1, team2, score1, score2, winner = overlay.get(row)
+        new_winner = edit.get('winner')
+        if new_winner is None:
+            target = team2 if winner == team1 else team1
+        elif str(new_winner).lower() == 'tie':
+            average = (score1 + score2) / 2
+            overlay.set(row, (team1, team2, average, average, WINNER_TIE))
+            return
+        else:
+            target = self._team_id(new_winner)
+            if target not in (team1, team2):
+                raise ValueError(f"{new_winner} did not play in that game")
+
+        # Swap the scores if needed so the result stays consistent with them
+        if (target == team1 and score1 < score2) or (target == team2 and score2 < score1):
+            score1, score2 = score2, score1
+        if score1 == score2:
+            overlay.set(row, (team1, team2, score1, score2, target))
+        else:
+            overlay.set(row, (team1, team2, score1, score2, _winner_for(team1, team2, score1, score2)))
+
+    def _score(self, overlay: MatchupOverlay, edit: Dict):
+        """{'year', 'week', 'team', 'score'} - change one team's score"""
+        row = self._find_row(overlay, edit['year'], edit['week'], edit['team'])
+        team1, team2, score1, score2, _ = overlay.get(row)
+        score = float(edit['score'])
+        if self._team_id(edit['team']) == team1:
+            score1 = score
+        else:
+            score2 = score
+        overlay.set(row, (team1, team2, score1, score2, _winner_for(team1, team2, score1, score2)))
+
+    def _swap_schedules(self, overlay: MatchupOverlay, edit: Dict):
+        """
+        {'year', 'team1', 'team2'} - each team plays the other's regular season schedule,
+        keeping its own weekly scores
+        """
+        year = int(edit['year'])
+        id_a, id_b = self._team_id(edit['team1']), self._team_id(edit['team2'])
+        swap = {id_a: id_b, id_b: id_a}
+        weeks = sorted({int(self.table.week[r]) for r in np.flatnonzero(self.regular & (self.table.year == year)).tolist()})
+        for week in weeks:
+            try:
+                row_a = self._find_row(overlay, year, week, edit['team1'])
+                row_b = self._find_row(overlay, year, week, edit['team2'])
+            except ValueError:
+                continue
+            if row_a == row_b or not (self.regular[row_a] and self.regular[row_b]):
+                continue
+            # Swap the two teams between their games; every team keeps its own score
+            games = [overlay.get(row) for row in (row_a, row_b)]
+            scores = {}
+            for team1, team2, score1, score2, _ in games:
+                scores[team1], scores[team2] = score1, score2
+            for row, (team1, team2, _, _, _) in zip((row_a, row_b), games):
+                team1, team2 = swap.get(team1, team1), swap.get(team2, team2)
+                score1, score2 = scores[team1], scores[team2]
+                overlay.set(row, (team1, team2, score1, score2, _winner_for(team1, team2, score1, score2)))
+
+    EDITS = {
+        'flip': _flip,
+        'score': _score,
+        'swap_schedule': _swap_schedules,
+    }
+
+    def apply(self, edits: List[Dict], overlay: Optional[MatchupOverlay] = None) -> MatchupOverlay:
+        """Apply edits in order to a (new) overlay"""
+        overlay = overlay if overlay is not None else self.new_overlay()
+        for edit in edits:
+            _check_edit(edit)
+            handler = self.EDITS.get(edit.get('type', 'flip'))
+            if handler is None:
+                raise ValueError(f"Unknown edit type: {edit.get('type')}")
+            try:
+                handler(self, overlay, edit)
+            except KeyError as e:
+                raise ValueError(f"Edit is missing {e}")
+        return overlay
+
+    # ------------------------------------------------------------------
+    # Recalculation
+    # ------------------------------------------------------------------
+
+    def _season_table(self, stats: Dict[str, np.ndarray], year_index: int) -> List[Dict]:
+        """Seeded standings for one season (wins, then points_for)"""
+        names = self.table.teams.names
+        teams = np.flatnonzero(stats['games'][year_index] > 0).tolist()
+        rows = [{
+            'team': names[t],
+            'wins': int(stats['wins'][year_index, t]),
+            'losses': int(stats['losses'][year_index, t]),
+            'ties': int(stats['ties'][year_index, t]),
+            'points_for': round(float(stats['points_for'][year_index, t]), 2)
+        } for t in teams]
+        rows.sort(key=lambda r: (-(r['wins'] + 0.5 * r['ties']), -r['points_for']))
+        for seed, row in enumerate(rows, 1):
+            row['seed'] = seed
+            row['playoffs'] = seed <= self.playoff_spots
+        return rows
+
+    def _streaks(self, team_id: int, overlay: Optional[MatchupOverlay], season_year: Optional[int]) -> Dict:
+        """A team's longest and season-ending streaks with the overlay applied"""
+        rows = set(self._team_rows.get(team_id, []))
+        if overlay is not None:
+            # Swapped schedules can move a team into other rows
+            rows.update(r for r, game in overlay.rows.items() if team_id in game[:2])
+            rows = {r for r in rows if team_id in overlay.get(r)[:2]}
+
+        # Keyed by (year, week); a later row for the same week replaces an earlier one
+        games = {}
+        for row in sorted(rows):
+            winner = overlay.get(row)[4] if overlay is not None else int(self.table.winner[row])
+            games[(int(self.table.year[row]), int(self.table.week[row]))] = (winner == team_id, winner == WINNER_TIE)
+
+        state = StreakState(season_year)
+        for (year, _), (won, tie) in sorted(games.items()):
+            state.push(year, won, tie)
+        longest, longest_type = state.longest()
+        season, season_type = state.season()
+        return {
+            'longest': longest,
+            'longest_type': longest_type,
+            'season': season,
+            'season_type': season_type,
+            'longest_win': state.longest_win()
+        }
+
+    def _h2h_record(self, id1: int, id2: int, delta: Dict[Tuple[int, int], List[int]]) -> Dict:
+        h2h = self.head_to_head
+        n = h2h.wins.shape[0]
+        wins1 = int(h2h.wins[id1, id2]) if id1 < n and id2 < n else 0
+        wins2 = int(h2h.wins[id2, id1]) if id1 < n and id2 < n else 0
+        ties = int(h2h.ties[id1, id2]) if id1 < n and id2 < n else 0
+        before = (wins1, wins2, ties)
+        d1, d2, dt = delta.get((id1, id2), (0, 0, 0))
+        after = (wins1 + d1, wins2 + d2, ties + dt)
+        return {
+            'team1': self.table.team_name(id1),
+            'team2': self.table.team_name(id2),
+            'before': {'team1_wins': before[0], 'team2_wins': before[1], 'ties': before[2]},
+            'after': {'team1_wins': after[0], 'team2_wins': after[1], 'ties': after[2]}
+        }
+
+    def recalculate(self, overlay: MatchupOverlay, current_year: Optional[int]) -> Dict:
+        """Everything the overlay's edited rows change, before and after (current_year: the live season)"""
+        table = self.table
+        names = table.teams.names
+        changed = overlay.changed_rows()
+
+        seasons: Dict[int, Dict[str, np.ndarray]] = {}
+        affected_teams = set()
+        h2h_delta: Dict[Tuple[int, int], List[int]] = {}
+        edits = []
+        for row in changed:
+            old, new = overlay.base(row), overlay.get(row)
+            year = int(table.year[row])
+            if self.regular[row]:
+                # Copy-on-write: only an edited season's records are copied, then patched
+                year_index = self._year_index[year]
+                season = seasons.get(year_index)
+                if season is None:
+                    season = seasons[year_index] = {name: values[year_index:year_index + 1].copy()
+                                                    for name, values in self._season_stats.items()}
+                self._add_game(season, 0, *old, -1)
+                self._add_game(season, 0, *new, 1)
+            affected_teams.update(old[:2])
+            affected_teams.update(new[:2])
+
+            for sign, (team1, team2, _, _, winner) in ((-1, old), (1, new)):
+                key = (min(team1, team2), max(team1, team2))
+                d = h2h_delta.setdefault(key, [0, 0, 0])
+                if winner == WINNER_TIE:
+                    d[2] += sign
+                elif winner == key[0]:
+                    d[0] += sign
+                elif winner == key[1]:
+                    d[1] += sign
+
+            edits.append({
+                'year': year,
+                'week': int(table.week[row]),
+                'week_type': table.week_types[int(table.week_type[row])],
+                'before': self._game_dict(old),
+                'after': self._game_dict(new)
+            })
+
+        standings = {}
+        for year_index, season in sorted(seasons.items()):
+            year = self.years[year_index]
+            before = self._season_table(self._season_stats, year_index)
+            after = self._season_table(season, 0)
+            base_seeds = {r['team']: r['seed'] for r in before}
+            for r in after:
+                r['base_seed'] = base_seeds.get(r['team'])
+                r['seed_change'] = (r['base_seed'] - r['seed']) if r['base_seed'] else 0
+            standings[str(year)] = {
+                'standings': after,
+                'made_playoffs': sorted({r['team'] for r in after if r['playoffs']} -
+                                        {r['team'] for r in before if r['playoffs']}),
+                'missed_playoffs': sorted({r['team'] for r in before if r['playoffs']} -
+                                          {r['team'] for r in after if r['playoffs']})
+            }
+
+        head_to_head = [self._h2h_record(id1, id2, h2h_delta)
+                        for (id1, id2), d in sorted(h2h_delta.items()) if any(d)]
+
+        streaks = {}
+        for team_id in sorted(t for t in affected_teams if t >= 0):
+            streaks[names[team_id]] = {
+                'before': self._streaks(team_id, None, current_year),
+                'after': self._streaks(team_id, overlay, current_year)
+            }
+
+        return {
+            'edits': edits,
+            'standings': standings,
+            'head_to_head': head_to_head,
+            'streaks': streaks
+        }
+
+    def _game_dict(self, game: GameRow) -> Dict:
+        team1, team2, score1, score2, winner = game
+        return {
+            'team1': self.table.team_name(team1),
+            'team2': self.table.team_name(team2),
+            'team1_score': score1,
+            'team2_score': score2,
+            'winner': self.table.winner_name(winner)
+        }
+
+    def what_if(self, edits: List[Dict], current_year: Optional[int]) -> Dict:
+        """Apply edits to a fresh overlay and return what they change"""
+        return self.recalculate(self.apply(edits), current_year)
+
+
+def edits_from_request(data: Dict) -> List[Dict]:
+    """
+    Edits from a /api/what-if body: {'edits': [...]}, or the WhatIf form's single
+    {'scenario': {'year', 'week', 'team1', 'team2', 'newWinner'}}
+    """
+    edits = data.get('edits')
+    if edits is not None:
+        if not isinstance(edits, list):
+            raise ValueError("edits must be a list")
+        return edits
+
+    scenario = data.get('scenario') or {}
+    if not scenario.get('team1'):
+        raise ValueError("Provide edits or a scenario with year, week, team1 and team2")
+    return [{
+        'type': 'flip',
+        'year': scenario.get('year'),
+        'week': scenario.get('week'),
+        'team1': scenario.get('team1'),
+        'team2': scenario.get('team2'),
+        'winner': scenario.get('newWinner') or None
+    }]
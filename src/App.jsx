@@ -36,10 +36,29 @@ function App() {
     }
   }
 
+  const waitForJob = async (jobId) => {
+    // The refresh runs as a background job; poll it until it finishes
+    while (true) {
+      const response = await axios.get(`${API_BASE}/jobs/${jobId}`)
+      const job = response.data.data
+      if (job.status === 'succeeded' || job.status === 'failed') {
+        if (job.errors.length) {
+          console.error('Refresh errors:', job.errors)
+        }
+        return job
+      }
+      await new Promise(resolve => setTimeout(resolve, 2000))
+    }
+  }
+
   const handleRefresh = async () => {
     setLoading(true)
     try {
-      await axios.post(`${API_BASE}/refresh`)
+      const response = await axios.post(`${API_BASE}/refresh`, null, {
+        // 409: a refresh is already running - follow that one instead
+        validateStatus: status => status === 202 || status === 409
+      })
+      await waitForJob(response.data.job.id)
       await fetchLeagueInfo()
     } catch (error) {
       console.error('Error refreshing data:', error)
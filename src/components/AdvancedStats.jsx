@@ -23,6 +23,12 @@ const VIEW_OPTIONS = [
   { id: 'weekly-recap', label: '📰 Weekly Recap' }
 ]
 
+// Endpoints loaded together through /api/batch on mount
+const BATCH_SECTIONS = [
+  'rivalries', 'streaks', 'points-trends', 'consistency', 'blowouts', 'bad-beats',
+  'weekly-awards', 'lowest-scoring-weeks', 'clutch', 'team-dna', 'trophy-case'
+]
+
 const TEAM_LINE_COLORS = [
   '#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe',
   '#FFD700', '#C0C0C0', '#CD7F32', '#10b981', '#ef4444'
@@ -63,19 +69,31 @@ function AdvancedStats() {
   const fetchAllData = async () => {
     setLoading(true)
     try {
-      await Promise.all([
-        fetchRivalries(),
-        fetchStreaks(),
-        fetchPointsTrends(),
-        fetchConsistency(),
-        fetchBlowouts(),
-        fetchBadBeats(),
-        fetchWeeklyAwards(),
-        fetchLowestScoringWeeks(),
-        fetchClutch(),
-        fetchTeamDNA(),
-        fetchTrophyCase()
-      ])
+      // One request for every section (each entry is that endpoint's own { success, data } body)
+      const response = await axios.get(`${API_BASE}/batch`, {
+        params: { include: BATCH_SECTIONS.join(',') }
+      })
+      const sections = response.data.success ? response.data.data : {}
+      const section = (name, fallback) => {
+        const result = sections[name]
+        if (result && !result.success) {
+          console.error(`${name} API returned success=false:`, result.error)
+        }
+        return (result?.success && result.data) || fallback
+      }
+      setRivalries(section('rivalries', []))
+      const streaks = section('streaks', {})
+      setCurrentStreaks(streaks.current || [])
+      setAllTimeStreaks(streaks.all_time || [])
+      setPointsTrends(section('points-trends', []))
+      setConsistency(section('consistency', []))
+      setBlowouts(section('blowouts', []))
+      setBadBeats(section('bad-beats', { high_score_losses: [], low_score_wins: [] }))
+      setWeeklyAwards(section('weekly-awards', { highest_scores: [], lowest_winning_scores: [], biggest_margins: [] }))
+      setLowestScoringWeeks(section('lowest-scoring-weeks', []))
+      setClutch(section('clutch', []))
+      setTeamDNA(section('team-dna', []))
+      setTrophyCase(section('trophy-case', []))
     } catch (error) {
       console.error('Error fetching data:', error)
     } finally {
@@ -94,162 +112,6 @@ function AdvancedStats() {
     }
   }
 
-  const fetchRivalries = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/rivalries`)
-      if (response.data.success) {
-        setRivalries(response.data.data || [])
-      } else {
-        console.error('Rivalries API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching rivalries:', error)
-      setRivalries([])
-    }
-  }
-
-  const fetchStreaks = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/streaks`)
-      if (response.data.success) {
-        setCurrentStreaks(response.data.data?.current || [])
-        setAllTimeStreaks(response.data.data?.all_time || [])
-      } else {
-        console.error('Streaks API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching streaks:', error)
-      setCurrentStreaks([])
-      setAllTimeStreaks([])
-    }
-  }
-
-  const fetchPointsTrends = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/points-trends`)
-      if (response.data.success) {
-        setPointsTrends(response.data.data || [])
-      } else {
-        console.error('Points trends API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching points trends:', error)
-      setPointsTrends([])
-    }
-  }
-
-  const fetchConsistency = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/consistency`)
-      if (response.data.success) {
-        setConsistency(response.data.data || [])
-      } else {
-        console.error('Consistency API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching consistency:', error)
-      setConsistency([])
-    }
-  }
-
-  const fetchBlowouts = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/blowouts`)
-      if (response.data.success) {
-        setBlowouts(response.data.data || [])
-      } else {
-        console.error('Blowouts API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching blowouts:', error)
-      setBlowouts([])
-    }
-  }
-
-  const fetchBadBeats = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/bad-beats`)
-      if (response.data.success) {
-        setBadBeats(response.data.data || { high_score_losses: [], low_score_wins: [] })
-      } else {
-        console.error('Bad beats API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching bad beats:', error)
-      setBadBeats({ high_score_losses: [], low_score_wins: [] })
-    }
-  }
-
-  const fetchWeeklyAwards = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/weekly-awards`)
-      if (response.data.success) {
-        setWeeklyAwards(response.data.data || { highest_scores: [], lowest_winning_scores: [], biggest_margins: [] })
-      } else {
-        console.error('Weekly awards API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching weekly awards:', error)
-      setWeeklyAwards({ highest_scores: [], lowest_winning_scores: [], biggest_margins: [] })
-    }
-  }
-
-  const fetchClutch = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/clutch`)
-      if (response.data.success) {
-        setClutch(response.data.data || [])
-      } else {
-        console.error('Clutch API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching clutch:', error)
-      setClutch([])
-    }
-  }
-
-  const fetchTeamDNA = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/team-dna`)
-      if (response.data.success) {
-        setTeamDNA(response.data.data || [])
-      } else {
-        console.error('Team DNA API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching team DNA:', error)
-      setTeamDNA([])
-    }
-  }
-
-  const fetchTrophyCase = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/trophy-case`)
-      if (response.data.success) {
-        setTrophyCase(response.data.data || [])
-      } else {
-        console.error('Trophy case API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching trophy case:', error)
-      setTrophyCase([])
-    }
-  }
-
-  const fetchLowestScoringWeeks = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/lowest-scoring-weeks`)
-      if (response.data.success) {
-        setLowestScoringWeeks(response.data.data || [])
-      } else {
-        console.error('Lowest scoring weeks API returned success=false:', response.data.error)
-      }
-    } catch (error) {
-      console.error('Error fetching lowest scoring weeks:', error)
-      setLowestScoringWeeks([])
-    }
-  }
-
   const generateTrashTalk = async () => {
     if (!selectedTeam1 || !selectedTeam2) {
       alert('Please select both teams')
@@ -42,71 +42,32 @@ function Almanac() {
   const [error, setError] = useState(null)
 
   useEffect(() => {
-    fetchAllTimeStats()
-    fetchHistoricalStats()
-    fetchScoringTitles()
-    fetchWinPctByYear()
-    fetchAllTimeWins()
+    fetchAllData()
   }, [])
 
-  const fetchAllTimeStats = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/team-stats-all-time`)
-      if (response.data.success) {
-        setAllTimeStats(response.data.data)
-      }
-    } catch (err) {
-      console.error('Error fetching all-time stats:', err)
-    }
-  }
-
-  const fetchHistoricalStats = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/historical-stats`)
-      if (response.data.success) {
-        setHistoricalStats(response.data.data)
-      }
-    } catch (err) {
-      console.error('Error fetching historical stats:', err)
-    }
-  }
-
-  const fetchScoringTitles = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/scoring-titles`)
-      if (response.data.success) {
-        setScoringTitles(response.data.data)
-      }
-    } catch (err) {
-      console.error('Error fetching scoring titles:', err)
-    }
-  }
-
-  const fetchWinPctByYear = async () => {
+  const fetchAllData = async () => {
     setLoading(true)
     try {
-      const response = await axios.get(`${API_BASE}/win-pct-by-year`)
+      // All five almanac endpoints in one request (each entry is that endpoint's { success, data } body)
+      const response = await axios.get(`${API_BASE}/batch`, {
+        params: { include: 'team-stats-all-time,historical-stats,scoring-titles,win-pct-by-year,all-time-wins' }
+      })
       if (response.data.success) {
-        setWinPctByYear(response.data.data)
+        const sections = response.data.data
+        const section = (name) => (sections[name]?.success ? sections[name].data : null)
+        setAllTimeStats(section('team-stats-all-time'))
+        setHistoricalStats(section('historical-stats'))
+        setScoringTitles(section('scoring-titles'))
+        setWinPctByYear(section('win-pct-by-year'))
+        setAllTimeWins(section('all-time-wins'))
       }
     } catch (err) {
-      console.error('Error fetching win pct by year:', err)
+      console.error('Error fetching almanac stats:', err)
     } finally {
       setLoading(false)
     }
   }
 
-  const fetchAllTimeWins = async () => {
-    try {
-      const response = await axios.get(`${API_BASE}/all-time-wins`)
-      if (response.data.success) {
-        setAllTimeWins(response.data.data)
-      }
-    } catch (err) {
-      console.error('Error fetching all-time wins:', err)
-    }
-  }
-
   if (loading) return <div className="loading">Loading all-time statistics...</div>
   if (error) return <div className="error">Error: {error}</div>
 
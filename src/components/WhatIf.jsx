@@ -24,7 +24,7 @@ function WhatIf() {
       }
     } catch (error) {
       console.error('Error calculating what-if:', error)
-      setResult({ error: 'Failed to calculate scenario' })
+      setResult({ error: error.response?.data?.error || 'Failed to calculate scenario' })
     } finally {
       setLoading(false)
     }
@@ -97,16 +97,37 @@ function WhatIf() {
         {result && (
           <div className="what-if-result">
             <h3>Result</h3>
-            {result.message ? (
+            {result.standings ? (
               <div className="result-message">
-                <p>{result.message}</p>
-                {result.scenario && (
-                  <div className="scenario-summary">
-                    <p><strong>Scenario:</strong> {result.scenario.year} Week {result.scenario.week}</p>
-                    <p>{result.scenario.team1} vs {result.scenario.team2}</p>
-                    <p>New Winner: {result.scenario.newWinner}</p>
+                {result.edits && result.edits.map((edit, index) => (
+                  <div key={index} className="scenario-summary">
+                    <p><strong>Scenario:</strong> {edit.year} Week {edit.week}</p>
+                    <p>{edit.after.team1} {edit.after.team1_score} - {edit.after.team2_score} {edit.after.team2}</p>
+                    <p>New Winner: {edit.after.winner} (was {edit.before.winner})</p>
                   </div>
+                ))}
+                {result.edits && result.edits.length === 0 && (
+                  <p>That result is already the real one - nothing changes.</p>
                 )}
+                {Object.entries(result.standings).map(([year, season]) => (
+                  <div key={year} className="scenario-summary">
+                    <p><strong>{year} Standings</strong></p>
+                    {season.made_playoffs.length > 0 && <p>Now in the playoffs: {season.made_playoffs.join(', ')}</p>}
+                    {season.missed_playoffs.length > 0 && <p>Now out of the playoffs: {season.missed_playoffs.join(', ')}</p>}
+                    {season.standings.map((team) => (
+                      <p key={team.team}>
+                        {team.seed}. {team.team} ({team.wins}-{team.losses}{team.ties ? `-${team.ties}` : ''})
+                        {team.seed_change > 0 && ` ▲${team.seed_change}`}
+                        {team.seed_change < 0 && ` ▼${-team.seed_change}`}
+                      </p>
+                    ))}
+                  </div>
+                ))}
+                {result.head_to_head && result.head_to_head.map((h2h) => (
+                  <p key={`${h2h.team1}-${h2h.team2}`}>
+                    {h2h.team1} vs {h2h.team2}: {h2h.before.team1_wins}-{h2h.before.team2_wins} → {h2h.after.team1_wins}-{h2h.after.team2_wins}
+                  </p>
+                ))}
               </div>
             ) : (
               <div className="result-error">
@@ -119,7 +140,7 @@ function WhatIf() {
         <div className="what-if-info">
           <h3>How It Works</h3>
           <p>This feature allows you to simulate different game outcomes and see how they would affect playoff scenarios.</p>
-          <p><strong>Coming Soon:</strong> Full playoff probability calculations and detailed impact analysis.</p>
+          <p>Pick a game by year, week and team, and who should have won it. The standings, playoff seeds and head-to-head records are recalculated with that result flipped.</p>
         </div>
       </div>
     </div>